@@ -27,9 +27,13 @@ from app.models.product_group_model import ProductGroup
 from app.models.product_tag_model import ProductTag
 from app.models.product_tag_link_model import ProductTagLink
 from app.models.sale_model import Sale
+from app.models.sales_rollup_model import SalesDaily, SalesMonthly, SalesVersion
+from app.models.stock_valuation_model import StockValuation, StockValuationSnapshot
+from app.models.product_tag_facet_model import ProductTagFacet
 from app.models.proposal_model import Proposal
 from app.models.lead_model import Lead
 from app.models.address_model import Address
+from app.models.email_outbox_model import EmailOutbox
 from app.models.base import Message, Token, TokenPayload, NewPassword
 
 target_metadata = SQLModel.metadata
@@ -0,0 +1,25 @@
+"""Add user token_version
+
+Revision ID: 8d2c4f1a9b7e
+Revises: 319e2c274e43
+Create Date: 2026-10-18 10:12:41.503128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2c4f1a9b7e'
+down_revision = '319e2c274e43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'token_version')
@@ -0,0 +1,46 @@
+"""Add foreign key indexes
+
+Revision ID: a9c4e1f7b2d3
+Revises: f3a7d1e95c28
+Create Date: 2026-10-18 19:42:17.560193
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e1f7b2d3'
+down_revision = 'f3a7d1e95c28'
+branch_labels = None
+depends_on = None
+
+
+# Foreign keys the routes filter on, followed by the (created_at, id) key
+# pagination sorts on; producttaglink is served by its primary key and
+# ix_producttaglink_product_tag_id
+INDEXES = [
+    ('ix_item_business_id_product_id', 'item', ['business_id', 'product_id']),
+    ('ix_item_business_id_created_at', 'item', ['business_id', 'created_at', 'id']),
+    ('ix_item_product_id', 'item', ['product_id']),
+    ('ix_product_product_group_id_created_at', 'product', ['product_group_id', 'created_at', 'id']),
+    ('ix_lead_business_id_created_at', 'lead', ['business_id', 'created_at', 'id']),
+    ('ix_sale_lead_id_created_at', 'sale', ['lead_id', 'created_at', 'id']),
+    ('ix_sale_item_id', 'sale', ['item_id']),
+    ('ix_proposal_lead_id_created_at', 'proposal', ['lead_id', 'created_at', 'id']),
+    ('ix_proposal_product_id', 'proposal', ['product_id']),
+    ('ix_address_lead_id_created_at', 'address', ['lead_id', 'created_at', 'id']),
+    ('ix_employee_user_id_business_id', 'employee', ['user_id', 'business_id']),
+    ('ix_employee_business_id_created_at', 'employee', ['business_id', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    # built without locking out writes to the tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
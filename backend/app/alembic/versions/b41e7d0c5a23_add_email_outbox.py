@@ -0,0 +1,40 @@
+"""Add email outbox
+
+Revision ID: b41e7d0c5a23
+Revises: 8d2c4f1a9b7e
+Create Date: 2026-10-18 11:02:17.284519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41e7d0c5a23'
+down_revision = '8d2c4f1a9b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'emailoutbox',
+        sa.Column('id', sa.Uuid(), nullable=False),
+        sa.Column('email_to', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column('html_content', sa.Text(), nullable=False),
+        sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(length=1024), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_emailoutbox_status_next_attempt_at', 'emailoutbox', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_emailoutbox_status_next_attempt_at', table_name='emailoutbox')
+    op.drop_table('emailoutbox')
@@ -0,0 +1,31 @@
+"""Add sales version
+
+Revision ID: b6d2f8a13e47
+Revises: a9c4e1f7b2d3
+Create Date: 2026-10-18 21:05:39.214870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2f8a13e47'
+down_revision = 'a9c4e1f7b2d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # businesses without a row read as version 0 until their next sale write
+    op.create_table(
+        'salesversion',
+        sa.Column('business_id', sa.Uuid(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['business_id'], ['business.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('business_id'),
+    )
+
+
+def downgrade():
+    op.drop_table('salesversion')
@@ -0,0 +1,64 @@
+"""Add sales rollups
+
+Revision ID: c5a9e2d71f40
+Revises: b41e7d0c5a23
+Create Date: 2026-10-18 14:21:46.508213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9e2d71f40'
+down_revision = 'b41e7d0c5a23'
+branch_labels = None
+depends_on = None
+
+
+ROLLUPS = {
+    'salesdaily': "CAST(sale.created_at AS date)",
+    'salesmonthly': "CAST(date_trunc('month', sale.created_at) AS date)",
+}
+
+
+def upgrade():
+    op.add_column('sale', sa.Column('cost_price_per_item', sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE sale SET cost_price_per_item = item.cost_price "
+        "FROM item WHERE item.id = sale.item_id"
+    )
+    for table, period in ROLLUPS.items():
+        op.create_table(
+            table,
+            sa.Column('business_id', sa.Uuid(), nullable=False),
+            sa.Column('period', sa.Date(), nullable=False),
+            sa.Column('item_id', sa.Uuid(), nullable=False),
+            sa.Column('product_id', sa.Uuid(), nullable=False),
+            sa.Column('sales', sa.Integer(), nullable=False),
+            sa.Column('units', sa.Integer(), nullable=False),
+            sa.Column('revenue', sa.Float(), nullable=False),
+            sa.Column('discount', sa.Float(), nullable=False),
+            sa.Column('cost', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['business_id'], ['business.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['item_id'], ['item.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['product_id'], ['product.id'], ),
+            sa.PrimaryKeyConstraint('business_id', 'period', 'item_id'),
+        )
+        op.execute(
+            f"INSERT INTO {table} "
+            "(business_id, period, item_id, product_id, sales, units, revenue, discount, cost) "
+            f"SELECT item.business_id, {period}, item.id, item.product_id, count(*), "
+            "sum(sale.quantity_of_items), "
+            "sum(sale.quantity_of_items * sale.price_per_item * (1 - sale.discount)), "
+            "sum(sale.quantity_of_items * sale.price_per_item * sale.discount), "
+            "sum(sale.quantity_of_items * coalesce(sale.cost_price_per_item, 0)) "
+            "FROM sale JOIN item ON item.id = sale.item_id "
+            "GROUP BY 1, 2, 3, 4"
+        )
+
+
+def downgrade():
+    for table in ROLLUPS:
+        op.drop_table(table)
+    op.drop_column('sale', 'cost_price_per_item')
@@ -0,0 +1,60 @@
+"""Add stock valuation
+
+Revision ID: d7e3b9a04c16
+Revises: c5a9e2d71f40
+Create Date: 2026-10-18 16:02:13.774120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e3b9a04c16'
+down_revision = 'c5a9e2d71f40'
+branch_labels = None
+depends_on = None
+
+
+def _valuation_columns():
+    return [
+        sa.Column('items', sa.Integer(), nullable=False),
+        sa.Column('units', sa.Integer(), nullable=False),
+        sa.Column('cost_value', sa.Float(), nullable=False),
+        sa.Column('retail_value', sa.Float(), nullable=False),
+        sa.Column('business_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['business_id'], ['business.id'], ondelete='CASCADE'),
+        sa.Column('product_group_id', sa.Uuid(), nullable=False),
+        sa.ForeignKeyConstraint(['product_group_id'], ['productgroup.id'], ondelete='CASCADE'),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        'stockvaluation',
+        *_valuation_columns(),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('business_id', 'product_group_id'),
+    )
+    op.create_table(
+        'stockvaluationsnapshot',
+        *_valuation_columns(),
+        sa.Column('taken_on', sa.Date(), nullable=False),
+        sa.PrimaryKeyConstraint('business_id', 'taken_on', 'product_group_id'),
+    )
+    op.execute(
+        "INSERT INTO stockvaluation "
+        "(business_id, product_group_id, items, units, cost_value, retail_value, updated_at) "
+        "SELECT item.business_id, product.product_group_id, count(*), "
+        "sum(coalesce(item.quantity, 0)), "
+        "sum(coalesce(item.quantity, 0) * coalesce(item.cost_price, 0)), "
+        "sum(coalesce(item.quantity, 0) * coalesce(item.price, 0)), "
+        "timezone('utc', now()) "
+        "FROM item JOIN product ON product.id = item.product_id "
+        "GROUP BY 1, 2"
+    )
+
+
+def downgrade():
+    op.drop_table('stockvaluationsnapshot')
+    op.drop_table('stockvaluation')
@@ -0,0 +1,61 @@
+"""Add search indexes
+
+Revision ID: e8b2f6c3d915
+Revises: d7e3b9a04c16
+Create Date: 2026-10-18 17:40:05.118342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b2f6c3d915'
+down_revision = 'd7e3b9a04c16'
+branch_labels = None
+depends_on = None
+
+
+# Expressions matched by the search queries of crud_product and crud_lead
+DOCUMENTS = {
+    'product': "to_tsvector('simple', coalesce(title, '') || ' ' "
+               "|| coalesce(description, '') || ' ' || coalesce(sku, ''))",
+    'lead': "to_tsvector('simple', coalesce(customer_name, '') || ' ' "
+            "|| coalesce(customer_phone, '') || ' ' || coalesce(customer_email, ''))",
+}
+TRIGRAM_COLUMNS = {
+    'product': ['title', 'description', 'sku'],
+    'lead': ['customer_name', 'customer_phone', 'customer_email'],
+}
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # built without locking out writes to the tables
+    with op.get_context().autocommit_block():
+        for table, document in DOCUMENTS.items():
+            op.create_index(
+                f'ix_{table}_search',
+                table,
+                [sa.text(document)],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+        for table, columns in TRIGRAM_COLUMNS.items():
+            for column in columns:
+                op.create_index(
+                    f'ix_{table}_{column}_trgm',
+                    table,
+                    [column],
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=True,
+                )
+
+
+def downgrade():
+    for table, columns in TRIGRAM_COLUMNS.items():
+        for column in columns:
+            op.drop_index(f'ix_{table}_{column}_trgm', table_name=table)
+    for table in DOCUMENTS:
+        op.drop_index(f'ix_{table}_search', table_name=table)
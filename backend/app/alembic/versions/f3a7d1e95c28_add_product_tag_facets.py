@@ -0,0 +1,40 @@
+"""Add product tag facets
+
+Revision ID: f3a7d1e95c28
+Revises: e8b2f6c3d915
+Create Date: 2026-10-18 18:55:31.402716
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7d1e95c28'
+down_revision = 'e8b2f6c3d915'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_producttaglink_product_tag_id', 'producttaglink', ['product_tag_id'])
+    op.create_table(
+        'producttagfacet',
+        sa.Column('product_group_id', sa.Uuid(), nullable=False),
+        sa.Column('product_tag_id', sa.Uuid(), nullable=False),
+        sa.Column('products', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_group_id'], ['productgroup.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['product_tag_id'], ['producttag.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('product_group_id', 'product_tag_id'),
+    )
+    op.execute(
+        "INSERT INTO producttagfacet (product_group_id, product_tag_id, products) "
+        "SELECT product.product_group_id, producttaglink.product_tag_id, count(*) "
+        "FROM producttaglink JOIN product ON product.id = producttaglink.product_id "
+        "GROUP BY 1, 2"
+    )
+
+
+def downgrade():
+    op.drop_table('producttagfacet')
+    op.drop_index('ix_producttaglink_product_tag_id', table_name='producttaglink')
@@ -1,20 +1,28 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator, Iterable
+from dataclasses import dataclass
 from typing import Annotated, Any
+import time
 import uuid
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlmodel import Session, func, select
+from sqlalchemy import event, exists
+from sqlalchemy import orm
+from sqlalchemy.orm import ORMExecuteState, object_session
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.api.pagination import PageParams, apaginate, paginate
 from app.core import security
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import async_engine, engine
 from app.models.base import TokenPayload
 from app.models.user_model import User
 from app.models.employee_model import Employee
 from app.models.business_model import Business, BusinessesPublic
-from app.models.product_model import Product, ProductsPublic
+from app.models.product_model import Product, ProductPublic
 from app.models.item_model import Item
 
 
@@ -28,30 +36,85 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSession(async_engine) as session:
+        yield session
+
+
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _decode_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = session.get(User, token_data.sub)
+
+
+def _check_user(user: User | None, token_data: TokenPayload) -> User:
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+    if user.token_version != token_data.ver:
+        # issued before a password change or deactivation
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate credentials",
+        )
     return user
 
 
+# access token -> detached snapshot of its verified, active user
+token_cache: TTLCache[str, User] = TTLCache(
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS, maxsize=settings.TOKEN_CACHE_MAXSIZE
+)
+
+
+def _cache_token(token: str, token_data: TokenPayload, user: User, generation: int) -> None:
+    ttl = float(settings.TOKEN_CACHE_TTL_SECONDS)
+    if token_data.exp is not None:
+        ttl = min(ttl, token_data.exp - time.time())
+    if ttl > 0:
+        token_cache.set(token, user, ttl=ttl, generation=generation)
+
+
+def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    """
+    Verified tokens are cached, so a repeated token costs neither a JWT
+    decode nor a query; the snapshot is attached to `session` as is.
+    """
+    user = token_cache.get(token)
+    if user is None:
+        token_data = _decode_token(token)
+        generation = token_cache.generation
+        with Session(session.get_bind()) as loader:
+            user = _check_user(loader.get(User, token_data.sub), token_data)
+        _cache_token(token, token_data, user, generation)
+    return session.merge(user, load=False)
+
+
+async def get_current_user_async(session: AsyncSessionDep, token: TokenDep) -> User:
+    user = token_cache.get(token)
+    if user is None:
+        token_data = _decode_token(token)
+        generation = token_cache.generation
+        async with AsyncSession(session.bind) as loader:
+            user = _check_user(await loader.get(User, token_data.sub), token_data)
+        _cache_token(token, token_data, user, generation)
+    return await session.merge(user, load=False)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+AsyncCurrentUser = Annotated[User, Depends(get_current_user_async)]
 
 
 def get_current_active_superuser(current_user: CurrentUser) -> User:
@@ -66,60 +129,232 @@ def check_if_user_is_associetes_with_business(session: SessionDep, user_id: uuid
     employee = session.exec(statement).first()
     return employee is not None, employee
 
-def retrieve_businesses_by_user_id(session: SessionDep, user_id: uuid.UUID) -> Business:
-    statement = (
-        select(Business)
-        .join(Employee)
+@dataclass
+class Tenant:
+    user: User
+    employee: Employee | None
+    business: Business | None
+
+
+# user_id -> detached (employee, business) snapshot, shared by all requests
+tenant_cache: TTLCache[uuid.UUID, tuple[Employee | None, Business | None]] = TTLCache(
+    ttl=settings.TENANT_CACHE_TTL_SECONDS, maxsize=settings.TENANT_CACHE_MAXSIZE
+)
+
+
+def _tenant_statement(user_id: uuid.UUID) -> Any:
+    return (
+        select(Employee, Business)
+        .outerjoin(Business, Employee.business_id == Business.id)
         .where(Employee.user_id == user_id)
     )
-    business = session.exec(statement).first()
-    return business
 
 
-def retrieve_products_by_business_id(session: SessionDep, business_id: uuid.UUID, product_group_id: uuid.UUID|None = None) -> ProductsPublic:
-    if product_group_id:
-        items_statement = (
-            select(Item)
-            .where(Item.business_id == business_id)
-        )
-        items = session.exec(items_statement).all()
-
-        # Get all products of the business which has items
-        if len(items)==0:
-            raise HTTPException(status_code=400, detail="Your business has no items")
-        
-        count_statement = (
-            select(func.count())
-            .select_from(Product)
-            .where(Product.id.in_([item.product_id for item in items]) & Product.product_group_id==product_group_id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Product)
-            .where(Product.id.in_([item.product_id for item in items]) & Product.product_group_id==product_group_id)
-        )
-        products = session.exec(statement).all()
+def resolve_tenant(session: Session, user_id: uuid.UUID) -> tuple[Employee | None, Business | None]:
+    """
+    Return the employee and business of a user, attached to `session`.
+
+    Misses are loaded with a single Employee LEFT JOIN Business query in a
+    short-lived session, so the cached instances are never bound to a request.
+    """
+    cached = tenant_cache.get(user_id)
+    if cached is None:
+        generation = tenant_cache.generation
+        with Session(session.get_bind()) as loader:
+            row = loader.exec(_tenant_statement(user_id)).first()
+        cached = (row[0], row[1]) if row else (None, None)
+        tenant_cache.set(user_id, cached, generation=generation)
+    employee, business = cached
+    return (
+        session.merge(employee, load=False) if employee else None,
+        session.merge(business, load=False) if business else None,
+    )
+
+
+def get_current_tenant(session: SessionDep, current_user: CurrentUser) -> Tenant:
+    employee, business = resolve_tenant(session, current_user.id)
+    return Tenant(user=current_user, employee=employee, business=business)
+
+
+CurrentTenant = Annotated[Tenant, Depends(get_current_tenant)]
+
+
+def get_current_business(tenant: CurrentTenant) -> Business | None:
+    return tenant.business
+
+
+CurrentBusiness = Annotated[Business | None, Depends(get_current_business)]
+
+
+async def aresolve_tenant(session: AsyncSession, user_id: uuid.UUID) -> tuple[Employee | None, Business | None]:
+    """
+    Async counterpart of `resolve_tenant`, sharing the same cache.
+    """
+    cached = tenant_cache.get(user_id)
+    if cached is None:
+        generation = tenant_cache.generation
+        async with AsyncSession(session.bind) as loader:
+            row = (await loader.exec(_tenant_statement(user_id))).first()
+        cached = (row[0], row[1]) if row else (None, None)
+        tenant_cache.set(user_id, cached, generation=generation)
+    employee, business = cached
+    return (
+        await session.merge(employee, load=False) if employee else None,
+        await session.merge(business, load=False) if business else None,
+    )
+
+
+async def get_current_tenant_async(session: AsyncSessionDep, current_user: AsyncCurrentUser) -> Tenant:
+    employee, business = await aresolve_tenant(session, current_user.id)
+    return Tenant(user=current_user, employee=employee, business=business)
+
+
+AsyncCurrentTenant = Annotated[Tenant, Depends(get_current_tenant_async)]
+
+
+async def get_current_business_async(tenant: AsyncCurrentTenant) -> Business | None:
+    return tenant.business
+
+
+AsyncCurrentBusiness = Annotated[Business | None, Depends(get_current_business_async)]
+
+
+# Cached rows are evicted once the change is committed: evicting at flush
+# would let a request reload the old committed row and cache it again
+_INVALIDATIONS = "cache_invalidations"
+
+
+def _invalidate_on_commit(session: orm.Session | None, invalidate: Callable[[], None]) -> None:
+    if session is None:
+        invalidate()
     else:
-        items_statement = (
-            select(Item)
-            .where(Item.business_id == business_id)
-        )
-        items = session.exec(items_statement).all()
-
-        # Get all products of the business which has items
-        if len(items)==0:
-            raise HTTPException(status_code=400, detail="Your business has no items")
-        count_statement = (
-            select(func.count())
-            .select_from(Product)
-            .where(Product.id.in_([item.product_id for item in items]))
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Product)
-            .where(Product.id.in_([item.product_id for item in items]))
-        )
-        products = session.exec(statement).all()
-        
-    
-    return ProductsPublic(data=products, count=count)
\ No newline at end of file
+        session.info.setdefault(_INVALIDATIONS, []).append(invalidate)
+
+
+@event.listens_for(orm.Session, "after_commit")
+def _run_invalidations(session: orm.Session) -> None:
+    for invalidate in session.info.pop(_INVALIDATIONS, []):
+        invalidate()
+
+
+@event.listens_for(orm.Session, "after_rollback")
+def _drop_invalidations(session: orm.Session) -> None:
+    session.info.pop(_INVALIDATIONS, None)
+
+
+@event.listens_for(Employee, "after_insert")
+@event.listens_for(Employee, "after_update")
+@event.listens_for(Employee, "after_delete")
+def _invalidate_employee_tenant(mapper: Any, connection: Any, target: Employee) -> None:
+    user_id, employee_id = target.user_id, target.id
+    _invalidate_on_commit(object_session(target), lambda: tenant_cache.invalidate_where(
+        lambda cached_user_id, cached: cached_user_id == user_id
+        or (cached[0] is not None and cached[0].id == employee_id)
+    ))
+
+
+@event.listens_for(Business, "after_update")
+@event.listens_for(Business, "after_delete")
+def _invalidate_business_tenant(mapper: Any, connection: Any, target: Business) -> None:
+    business_id = target.id
+    _invalidate_on_commit(object_session(target), lambda: tenant_cache.invalidate_where(
+        lambda _, cached: cached[1] is not None and cached[1].id == business_id
+    ))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper: Any, connection: Any, target: User) -> None:
+    user_id = target.id
+
+    def invalidate() -> None:
+        token_cache.invalidate_where(lambda _, user: user.id == user_id)
+        tenant_cache.invalidate(user_id)
+
+    _invalidate_on_commit(object_session(target), invalidate)
+
+
+@event.listens_for(orm.Session, "do_orm_execute")
+def _invalidate_bulk_writes(state: ORMExecuteState) -> None:
+    # bulk UPDATE and DELETE skip the mapper events; drop everything they may touch
+    if not (state.is_update or state.is_delete):
+        return
+    models = {mapper.class_ for mapper in state.all_mappers}
+    if models & {Employee, Business, User}:
+        _invalidate_on_commit(state.session, tenant_cache.clear)
+    if User in models:
+        _invalidate_on_commit(state.session, token_cache.clear)
+
+
+def retrieve_businesses_by_user_id(session: SessionDep, user_id: uuid.UUID) -> Business:
+    return resolve_tenant(session, user_id)[1]
+
+
+def _products_statement(business_id: uuid.UUID, product_group_id: uuid.UUID | None) -> Any:
+    statement = select(Product).where(
+        exists().where(Item.product_id == Product.id, Item.business_id == business_id)
+    )
+    if product_group_id:
+        statement = statement.where(Product.product_group_id == product_group_id)
+    return statement
+
+
+def _check_has_products(products: dict[str, Any], page: PageParams) -> dict[str, Any]:
+    if not products["data"] and not page.skip and not page.cursor:
+        raise HTTPException(status_code=400, detail="Your business has no items")
+    return products
+
+
+def retrieve_products_by_business_id(
+    session: SessionDep,
+    business_id: uuid.UUID,
+    product_group_id: uuid.UUID | None = None,
+    page: PageParams | None = None,
+) -> dict[str, Any]:
+    """
+    Page through the products the business holds items of, returning the
+    keyword arguments of ProductsPublic.
+
+    Ownership is an EXISTS over Item(business_id, product_id), so the items
+    themselves are never loaded.
+    """
+    page = page or PageParams()
+    statement = _products_statement(business_id, product_group_id)
+    return _check_has_products(paginate(session, Product, statement, page, ProductPublic), page)
+
+
+async def aretrieve_products_by_business_id(
+    session: AsyncSession,
+    business_id: uuid.UUID,
+    product_group_id: uuid.UUID | None = None,
+    page: PageParams | None = None,
+) -> dict[str, Any]:
+    page = page or PageParams()
+    statement = _products_statement(business_id, product_group_id)
+    return _check_has_products(await apaginate(session, Product, statement, page, ProductPublic), page)
+
+
+def _has_product_statement(business_id: uuid.UUID, product_id: uuid.UUID) -> Any:
+    return select(
+        exists().where(Item.business_id == business_id, Item.product_id == product_id)
+    )
+
+
+def business_has_product(session: SessionDep, business_id: uuid.UUID, product_id: uuid.UUID) -> bool:
+    return session.exec(_has_product_statement(business_id, product_id)).one()
+
+
+def business_product_ids(
+    session: SessionDep, business_id: uuid.UUID, product_ids: Iterable[uuid.UUID]
+) -> set[uuid.UUID]:
+    """
+    Those of `product_ids` the business holds items of, in one query.
+    """
+    statement = select(Item.product_id).where(
+        Item.business_id == business_id, Item.product_id.in_(list(product_ids))
+    ).distinct()
+    return set(session.exec(statement).all())
+
+
+async def abusiness_has_product(session: AsyncSession, business_id: uuid.UUID, product_id: uuid.UUID) -> bool:
+    return (await session.exec(_has_product_statement(business_id, product_id))).one()
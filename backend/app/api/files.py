@@ -0,0 +1,190 @@
+import hashlib
+import os
+import stat
+from email.utils import parsedate_to_datetime
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+from app.core.cache import TTLCache
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+# Content digests of mutable static files, keyed by (path, mtime, size)
+_etags: TTLCache[tuple[str, int, int], str] = TTLCache(ttl=3600, maxsize=4096)
+
+
+class RangeNotSatisfiableError(Exception):
+    pass
+
+
+def content_etag(path: str | os.PathLike[str], stat_result: os.stat_result) -> str:
+    key = (os.fspath(path), stat_result.st_mtime_ns, stat_result.st_size)
+    etag = _etags.get(key)
+    if etag is None:
+        digest = hashlib.sha256()
+        with open(path, "rb") as file:
+            while chunk := file.read(FileResponse.chunk_size):
+                digest.update(chunk)
+        etag = f'"{digest.hexdigest()[:32]}"'
+        _etags.set(key, etag)
+    return etag
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Parse a single `bytes=` range into inclusive (start, end) offsets.
+
+    Returns None for headers that are ignored and answered with the whole
+    file: other units, several ranges or malformed values.
+    """
+    unit, _, spec = header.partition("=")
+    first, sep, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not sep or not (first + last).isdigit():
+        return None
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        start, end = max(size - int(last), 0), size - 1
+        if int(last) == 0:
+            raise RangeNotSatisfiableError
+    if start >= size:
+        raise RangeNotSatisfiableError
+    return start, min(end, size - 1)
+
+
+def is_not_modified(request_headers: Headers, etag: str, last_modified: float) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+class CachedFileResponse(FileResponse):
+    """
+    FileResponse with a strong ETag, Cache-Control, conditional GET (304)
+    and single byte range (206) support.
+
+    `etag` defaults to a digest of the file's content. `immutable` marks
+    content-addressed files, which never change under the same URL.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        etag: str | None = None,
+        immutable: bool = False,
+        status_code: int = 200,
+        media_type: str | None = None,
+        stat_result: os.stat_result | None = None,
+    ):
+        self.etag = etag
+        super().__init__(
+            path, status_code=status_code, media_type=media_type, stat_result=stat_result
+        )
+        self.headers["cache-control"] = IMMUTABLE if immutable else REVALIDATE
+        self.headers["accept-ranges"] = "bytes"
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        if self.etag is not None:
+            self.headers["etag"] = self.etag
+        super().set_stat_headers(stat_result)
+
+    async def _send_start(self, send: Send, status: int) -> None:
+        await send({"type": "http.response.start", "status": status, "headers": self.raw_headers})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if self.stat_result is None:
+            try:
+                self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            except FileNotFoundError:
+                raise RuntimeError(f"File at path {self.path} does not exist.")
+            if not stat.S_ISREG(self.stat_result.st_mode):
+                raise RuntimeError(f"File at path {self.path} is not a file.")
+            self.set_stat_headers(self.stat_result)
+        size = self.stat_result.st_size
+        if self.etag is None:
+            self.etag = await anyio.to_thread.run_sync(content_etag, self.path, self.stat_result)
+            self.headers["etag"] = self.etag
+
+        status, start, end = self.status_code, 0, size - 1
+        request_headers = Headers(scope=scope)
+        if status == 200 and is_not_modified(request_headers, self.etag, self.stat_result.st_mtime):
+            del self.headers["content-length"]
+            del self.headers["content-type"]
+            await self._send_start(send, 304)
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        # If-Range: only honour the range while the client's copy is current
+        if_range = request_headers.get("if-range")
+        byte_range = request_headers.get("range")
+        if status == 200 and byte_range and if_range in (None, self.etag, self.headers["last-modified"]):
+            try:
+                parsed = parse_range(byte_range, size)
+            except RangeNotSatisfiableError:
+                self.headers["content-range"] = f"bytes */{size}"
+                self.headers["content-length"] = "0"
+                await self._send_start(send, 416)
+                await send({"type": "http.response.body", "body": b""})
+                return
+            if parsed is not None:
+                status, (start, end) = 206, parsed
+                self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+                self.headers["content-length"] = str(end - start + 1)
+
+        await self._send_start(send, status)
+        if scope["method"].upper() != "HEAD":
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+        if self.background is not None:
+            await self.background()
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles answering with `CachedFileResponse`.
+
+    Files directly inside `immutable_dir` are content-addressed and served
+    as immutable.
+    """
+
+    def __init__(self, *, immutable_dir: str | None = None, **kwargs: object):
+        super().__init__(**kwargs)  # type: ignore[arg-type]
+        self.immutable_dir = os.path.realpath(immutable_dir) if immutable_dir else None
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        # `full_path` is already resolved by StaticFiles.lookup_path
+        immutable = os.path.dirname(full_path) == self.immutable_dir
+        return CachedFileResponse(
+            full_path, immutable=immutable, status_code=status_code, stat_result=stat_result
+        )
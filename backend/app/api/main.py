@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import items, login, users, utils, business, business_industry, employee, product_group, product, product_tag, lead, proposal, sale, address
+from app.api.routes import items, login, users, utils, business, business_industry, employee, product_group, product, product_tag, lead, proposal, sale, address, search
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
@@ -17,3 +17,4 @@ api_router.include_router(lead.router, prefix="/lead", tags=["lead"])
 api_router.include_router(proposal.router, prefix="/proposal", tags=["proposal"])
 api_router.include_router(sale.router, prefix="/sale", tags=["sale"])
 api_router.include_router(address.router, prefix="/address", tags=["address"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
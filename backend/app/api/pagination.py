@@ -0,0 +1,159 @@
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Annotated, Any, Literal
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import tuple_
+from sqlmodel import Session, SQLModel, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.sql.expression import SelectOfScalar
+
+from app.core.config import settings
+from app.models.loaders import loader_options
+
+Direction = Literal["next", "prev"]
+
+
+@dataclass
+class Cursor:
+    created_at: datetime
+    id: uuid.UUID
+    direction: Direction = "next"
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = json.dumps(
+        [cursor.created_at.isoformat(), str(cursor.id), cursor.direction],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev"):
+            raise ValueError(direction)
+        return Cursor(
+            created_at=datetime.fromisoformat(created_at),
+            id=uuid.UUID(id),
+            direction=direction,
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@dataclass
+class PageParams:
+    """
+    Query parameters shared by list endpoints.
+
+    `cursor` switches to keyset pagination on (created_at, id) and takes
+    precedence over `skip`; `with_count=false` skips the count(*) query.
+    """
+
+    skip: Annotated[int, Query(ge=0)] = 0
+    limit: Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)] = 100
+    cursor: str | None = None
+    with_count: bool = True
+
+
+PageDep = Annotated[PageParams, Depends()]
+
+
+def _page_statements(
+    model: type[SQLModel],
+    statement: SelectOfScalar[Any],
+    page: PageParams,
+    profile: type[SQLModel] | None,
+) -> tuple[Any, SelectOfScalar[Any], Cursor | None]:
+    created_at, id = model.created_at, model.id  # type: ignore[attr-defined]
+    key = tuple_(created_at, id)
+
+    count_statement = None
+    if page.with_count:
+        count_statement = select(func.count()).select_from(
+            statement.order_by(None).subquery()
+        )
+    if profile is not None:
+        statement = statement.options(*loader_options(profile, model))
+
+    cursor = decode_cursor(page.cursor) if page.cursor else None
+    if cursor and cursor.direction == "prev":
+        statement = statement.where(key < (cursor.created_at, cursor.id)).order_by(
+            created_at.desc(), id.desc()
+        )
+    elif cursor:
+        statement = statement.where(key > (cursor.created_at, cursor.id)).order_by(
+            created_at, id
+        )
+    else:
+        statement = statement.order_by(created_at, id).offset(page.skip)
+    return count_statement, statement.limit(page.limit + 1), cursor
+
+
+def _page_result(
+    rows: list[Any], count: int | None, page: PageParams, cursor: Cursor | None
+) -> dict[str, Any]:
+    has_more = len(rows) > page.limit
+    rows = rows[: page.limit]
+    if cursor and cursor.direction == "prev":
+        rows.reverse()
+        has_next, has_prev = True, has_more
+    else:
+        has_next, has_prev = has_more, cursor is not None or page.skip > 0
+
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        last = rows[-1]
+        next_cursor = encode_cursor(Cursor(last.created_at, last.id, "next"))
+    if rows and has_prev:
+        first = rows[0]
+        prev_cursor = encode_cursor(Cursor(first.created_at, first.id, "prev"))
+    return {
+        "data": rows,
+        "count": count,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+def paginate(
+    session: Session,
+    model: type[SQLModel],
+    statement: SelectOfScalar[Any],
+    page: PageParams,
+    profile: type[SQLModel] | None = None,
+) -> dict[str, Any]:
+    """
+    Run `statement` for one page, ordered by (created_at, id).
+
+    `profile` is the public model of a row; its loader profile is applied so
+    embedded relationships are fetched with the page. Returns the keyword
+    arguments of a `*sPublic` list model: data, count, next_cursor and
+    prev_cursor.
+    """
+    count_statement, statement, cursor = _page_statements(model, statement, page, profile)
+    count = session.exec(count_statement).one() if count_statement is not None else None
+    rows = list(session.exec(statement).all())
+    return _page_result(rows, count, page, cursor)
+
+
+async def apaginate(
+    session: AsyncSession,
+    model: type[SQLModel],
+    statement: SelectOfScalar[Any],
+    page: PageParams,
+    profile: type[SQLModel] | None = None,
+) -> dict[str, Any]:
+    """
+    Async counterpart of `paginate`.
+    """
+    count_statement, statement, cursor = _page_statements(model, statement, page, profile)
+    count = (await session.exec(count_statement)).one() if count_statement is not None else None
+    rows = list((await session.exec(statement)).all())
+    return _page_result(rows, count, page, cursor)
@@ -0,0 +1,126 @@
+"""
+JSON responses built straight from ORM rows.
+
+A route returning a `*sPublic` model has its rows validated into the public
+model, dumped, validated again against `response_model` and dumped once
+more before encoding. Returning `page_response(...)` instead reads each row
+into a dict following the fields of its public model, and FastAPI passes the
+response through untouched. `response_model` still documents the route.
+"""
+
+import functools
+import types
+from collections.abc import Callable
+from operator import attrgetter, itemgetter
+from typing import Any, Union, get_args, get_origin
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+Encoder = Callable[[Any], Any]
+
+
+def _needs_validation(model: type[BaseModel]) -> bool:
+    decorators = model.__pydantic_decorators__
+    return bool(
+        model.model_computed_fields
+        or decorators.validators
+        or decorators.field_validators
+        or decorators.model_validators
+        or decorators.field_serializers
+        or decorators.model_serializers
+        or any(field.alias or field.serialization_alias for field in model.model_fields.values())
+    )
+
+
+def _allows_none(annotation: Any) -> bool:
+    if annotation in (Any, None, type(None)):
+        return True
+    return get_origin(annotation) in (Union, types.UnionType) and type(None) in get_args(annotation)
+
+
+def _value_encoder(annotation: Any) -> Encoder | None:
+    """
+    Encoder for a field of type `annotation`, or None when orjson already
+    writes the value the way Pydantic would.
+    """
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        inner = _value_encoder(args[0])
+        if inner is None:
+            return None
+        return lambda value: None if value is None else inner(value)
+    if origin is list:
+        [arg] = get_args(annotation) or [Any]
+        inner = _value_encoder(arg)
+        if inner is None:
+            return None
+        return lambda values: [inner(value) for value in values]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return row_encoder(annotation)
+    return None
+
+
+def _tuple_getter(getter: Callable[..., Callable[[Any], Any]], names: list[str]) -> Callable[[Any], tuple]:
+    if len(names) > 1:
+        return getter(*names)
+    if names:
+        get = getter(*names)
+        return lambda obj: (get(obj),)
+    return lambda obj: ()
+
+
+@functools.cache
+def row_encoder(public_model: type[BaseModel]) -> Encoder:
+    """
+    Function turning a row into the JSON-ready dict `public_model` dumps it
+    as. Models with computed fields, validators, serializers or aliases
+    validate the row instead, once, and so do rows missing a required value.
+    """
+    def validate(row: Any) -> dict[str, Any]:
+        return public_model.model_validate(row).model_dump(mode="json")
+
+    if _needs_validation(public_model):
+        return validate
+
+    plain: list[str] = []
+    nested: list[tuple[str, Encoder]] = []
+    for name, field in public_model.model_fields.items():
+        encoder = _value_encoder(field.annotation)
+        if encoder is None:
+            plain.append(name)
+        else:
+            nested.append((name, encoder))
+    # Loaded ORM attributes sit in the instance __dict__, read them from
+    # there rather than through the instrumented descriptors; expired
+    # attributes and properties go through getattr
+    get_loaded, get_attributes = _tuple_getter(itemgetter, plain), _tuple_getter(attrgetter, plain)
+    required = [name for name, field in public_model.model_fields.items() if not _allows_none(field.annotation)]
+
+    def encode(row: Any) -> dict[str, Any]:
+        try:
+            values = get_loaded(row.__dict__)
+        except KeyError:
+            values = get_attributes(row)
+        data = dict(zip(plain, values))
+        for name, encoder in nested:
+            value = getattr(row, name)
+            data[name] = None if value is None else encoder(value)
+        if None in map(data.__getitem__, required):
+            # raises the error the response model would
+            return validate(row)
+        return data
+
+    return encode
+
+
+def page_response(public_model: type[BaseModel], page: dict[str, Any]) -> ORJSONResponse:
+    """
+    Response of a `*sPublic` list model from the keyword arguments returned
+    by `paginate`, its rows encoded as `public_model`.
+    """
+    encode = row_encoder(public_model)
+    return ORJSONResponse({**page, "data": [encode(row) for row in page["data"]]})
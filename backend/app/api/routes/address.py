@@ -2,9 +2,11 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.deps import CurrentBusiness, CurrentUser, SessionDep
+from app.api.pagination import PageDep, paginate
+from app.api.responses import page_response
 from app.models.address_model import Address, AddressCreate, AddressPublic, AddressesPublic, AddressUpdate
 from app.models.product_model import Product
 from app.models.base import Message
@@ -17,13 +19,12 @@ router = APIRouter()
 
 @router.get("/{lead_id}", response_model=AddressesPublic)
 def read_addresses_of_lead(
-    session: SessionDep, current_user: CurrentUser, lead_id: uuid.UUID, skip: int = 0, limit: int = 100
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, lead_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve addresses of business.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -37,20 +38,8 @@ def read_addresses_of_lead(
                 status_code=400,
                 detail="Permission denied",
             )
-        count_statement = (
-            select(func.count())
-            .select_from(Address)
-            .where(Address.lead_id == lead.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Address)
-            .where(Address.lead_id == lead.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        addresses = session.exec(statement).all()
-        return AddressesPublic(data=addresses, count=count)
+        statement = select(Address).where(Address.lead_id == lead.id)
+        return page_response(AddressPublic, paginate(session, Address, statement, page))
     else:
         raise HTTPException(
             status_code=404,
@@ -59,14 +48,13 @@ def read_addresses_of_lead(
 
 
 @router.get("/by/{id}", response_model=AddressPublic)
-def read_address(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_address(session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get address by ID.
     """
     address = session.get(Address, id)
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -86,12 +74,11 @@ def read_address(session: SessionDep, current_user: CurrentUser, id: uuid.UUID)
 
 @router.post("/", response_model=AddressPublic)
 def create_address(
-    *, session: SessionDep, current_user: CurrentUser, address_in: AddressCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, address_in: AddressCreate
 ) -> Any:
     """
     Create new address.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -120,6 +107,7 @@ def update_address(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     address_in: AddressUpdate,
 ) -> Any:
@@ -129,7 +117,6 @@ def update_address(
     address = session.get(Address, id)
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -151,7 +138,7 @@ def update_address(
 
 @router.delete("/{id}")
 def delete_address(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an address.
@@ -159,7 +146,6 @@ def delete_address(
     address = session.get(Address, id)
     if not address:
         raise HTTPException(status_code=404, detail="Address not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -4,7 +4,7 @@ import uuid
 from typing import Any
 from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.deps import CurrentBusiness, CurrentUser, SessionDep
 from app.models.business_model import (Business, BusinessCreate, BusinessPublic, BusinessPublic
     , BusinessUpdate, BusinessesPublic, BusinessCreateSolo)
 from app.models.employee_model import EmployeeCreate, Employee
@@ -24,12 +24,11 @@ router = APIRouter()
 
 @router.get("/", response_model=BusinessPublic)
 def read_my_business(
-    session: SessionDep, current_user: CurrentUser
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness
 ) -> Any:
     """
     Retrieve businesses by user.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(status_code=404, detail="User not registered as employee in any Business")
     return business
@@ -61,7 +60,7 @@ def read_all_businesses(
 
 @router.post("/", response_model=BusinessPublic)
 def create_business_with_industry_employee(
-    *, session: SessionDep, current_user: CurrentUser, business_in: BusinessCreate
+    *, session: SessionDep, current_user: CurrentUser, business_existing: CurrentBusiness, business_in: BusinessCreate
 ) -> Any:
     """
     Create new business.
@@ -69,7 +68,6 @@ def create_business_with_industry_employee(
     if current_user.is_superuser:
         business = business_crud.create_business(session, business_in=business_in, business_industry_id=business_in.business_industry_id)
     else:
-        business_existing = retrieve_businesses_by_user_id(session, current_user.id)
         if business_existing:
             raise HTTPException(status_code=400, detail="User is already registered in a business")
         business = business_crud.create_business(session, business_in=business_in, business_industry_id=business_in.business_industry_id)
@@ -96,6 +94,7 @@ def update_business(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business_accessed: CurrentBusiness,
     id: uuid.UUID,
     business_in: BusinessUpdate,
 ) -> Any:
@@ -103,7 +102,6 @@ def update_business(
     Update an business.
     """
     business = session.get(Business, id)
-    business_accessed = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     if not current_user.is_superuser and (business.id != business_accessed.id):
@@ -118,13 +116,12 @@ def update_business(
 
 @router.delete("/{id}")
 def delete_business(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business_accessed: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an business.
     """
     business = session.get(Business, id)
-    business_accessed = retrieve_businesses_by_user_id(session, current_user.id)
     
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
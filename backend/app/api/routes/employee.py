@@ -1,21 +1,25 @@
 from typing_extensions import Optional
 import uuid
 from typing import Any
-from fastapi import APIRouter, HTTPException, UploadFile
-from fastapi.responses import FileResponse
-from pathlib import Path
+from fastapi import APIRouter, HTTPException, Request, UploadFile
 from sqlmodel import func, select
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
-from app.models.employee_model import Employee, EmployeeCreate, EmployeeCreateAdmin, EmployeePublic, EmployeePublic, EmployeeUpdate, EmployeesPublic
+from app.api.deps import AsyncCurrentTenant, AsyncSessionDep, CurrentBusiness, CurrentTenant, CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.files import CachedFileResponse
+from app.api.pagination import PageDep, paginate
+from app.api.responses import page_response
+from app.core.config import settings
+from app.core.images import ImageTooLargeError, InvalidImageError, avatar_path, store_avatar
+from app.models.loaders import loader_options
+from app.models.employee_model import Employee, EmployeeAvatar, EmployeeAvatarsPublic, EmployeeCreate, EmployeeCreateAdmin, EmployeePublic, EmployeePublic, EmployeeUpdate, EmployeesPublic
 from app.models.invite_model import NewInvite, NewRegInvite
 from app.models.business_model import Business, BusinessPublicID
 from app.models.base import Message
 from app.crud.crud_employee import employee_crud
 from app.crud.crud_user import user_crud
 from app.crud.crud_business import business_crud
-from app.utils import generate_invite_token, verify_invite_token, generate_invite_to_business_email, send_email
+from app.utils import generate_invite_token, verify_invite_token, generate_invite_to_business_email, queue_email
 from fastapi.encoders import jsonable_encoder
-import os
+import asyncio
 import logging
 
 
@@ -24,23 +28,19 @@ router = APIRouter()
 
 @router.get("/", response_model=EmployeePublic)
 def read_employee_me(
-    session: SessionDep, current_user: CurrentUser
+    session: SessionDep, tenant: CurrentTenant
 ) -> Any:
     """
     Retrieve employees.
     """
-    statement = (
-        select(Employee)
-        .where(Employee.user_id == current_user.id)
-    )
-    employee = session.exec(statement).first()
+    employee = tenant.employee
     if not employee:
         raise HTTPException(status_code=404, detail="User not registered as employee")
     return employee
 
 @router.get("/business", response_model=EmployeesPublic)
 def read_business_employees(
-    session: SessionDep, current_user: CurrentUser, business_id: uuid.UUID, skip: int = 0, limit: int = 100
+    session: SessionDep, current_user: CurrentUser, accessed_business: CurrentBusiness, business_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve employees.
@@ -51,29 +51,50 @@ def read_business_employees(
         raise HTTPException(status_code=404, detail="Business not found")
     # Get employees of the business
     
-    accessed_business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (business.id != accessed_business.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
 
     # Get all employees of the business
-    count_statement = (
-        select(func.count())
-        .select_from(Employee)
-        .where(Employee.business_id == business.id)
-    )
-    count = session.exec(count_statement).one()
+    statement = select(Employee).where(Employee.business_id == business.id)
+    return page_response(EmployeePublic, paginate(session, Employee, statement, page, EmployeePublic))
+
+
+@router.get("/avatars", response_model=EmployeeAvatarsPublic)
+def read_business_avatars(
+    request: Request, session: SessionDep, current_user: CurrentUser, accessed_business: CurrentBusiness, business_id: uuid.UUID
+) -> Any:
+    """
+    Avatar URLs of every employee of a business, with one URL per variant size.
+    """
+    business = session.get(Business, business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    if not accessed_business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    if not current_user.is_superuser and (business.id != accessed_business.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
     statement = (
-        select(Employee)
+        select(Employee.id, Employee.avatar)
         .where(Employee.business_id == business.id)
-        .offset(skip)
-        .limit(limit)
+        .order_by(Employee.created_at, Employee.id)
     )
-    employees = session.exec(statement).all()
-    return EmployeesPublic(data=employees, count=count)
+    data = []
+    for employee_id, avatar in session.exec(statement).all():
+        url, variants = None, {}
+        if avatar:
+            base = request.url_for("get_avatar", id=str(avatar))
+            url = str(base)
+            variants = {size: str(base.include_query_params(size=size)) for size in settings.AVATAR_SIZES}
+        data.append(EmployeeAvatar(employee_id=employee_id, avatar=avatar, url=url, variants=variants))
+    return EmployeeAvatarsPublic(data=data, count=len(data))
 
 
 @router.get("/{id}&{business_id}", response_model=EmployeePublic)
-def read_employee(session: SessionDep, current_user: CurrentUser, id: uuid.UUID, business_id: uuid.UUID) -> Any:
+def read_employee(session: SessionDep, current_user: CurrentUser, accessed_business: CurrentBusiness, id: uuid.UUID, business_id: uuid.UUID) -> Any:
     """
     Get employee by ID.
     """
@@ -85,8 +106,6 @@ def read_employee(session: SessionDep, current_user: CurrentUser, id: uuid.UUID,
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     
-    accessed_business = retrieve_businesses_by_user_id(session, current_user.id)
-    
     if not current_user.is_superuser and (business.id != accessed_business.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     return employee
@@ -149,7 +168,7 @@ def create_admin_employee_with_business(
     return employee
 
 @router.post("/invite_employee/")
-def invite_employee(email: str, business_id: uuid.UUID, session: SessionDep, current_user: CurrentUser) -> Message:
+def invite_employee(email: str, business_id: uuid.UUID, session: SessionDep, current_user: CurrentUser, accessed_business_current: CurrentBusiness) -> Message:
     """
     Invite employee to Business
     """
@@ -158,7 +177,6 @@ def invite_employee(email: str, business_id: uuid.UUID, session: SessionDep, cur
     if not business:
         raise HTTPException(status_code=404, detail="Business not found")
     # Get registered business
-    accessed_business_current = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (business.id != accessed_business_current.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
@@ -179,11 +197,13 @@ def invite_employee(email: str, business_id: uuid.UUID, session: SessionDep, cur
     email_data = generate_invite_to_business_email(
         email_to=email, email=email, token=invite_token, business_name=business.name
     )
-    send_email(
+    queue_email(
+        session,
         email_to=email,
         subject=email_data.subject,
         html_content=email_data.html_content,
     )
+    session.commit()
     return Message(message=f"Invitation email sent with token {invite_token}")
 
 # invite_register/?token={token}
@@ -259,63 +279,58 @@ def update_employee(
 async def create_upload_file(
     *,
     file: UploadFile,
-    session: SessionDep,
-    current_user: CurrentUser):
-    
-    statement = (
-        select(Employee)
-        .where(Employee.user_id == current_user.id)
-    )
-    
-    employee = session.exec(statement).first()
+    session: AsyncSessionDep,
+    tenant: AsyncCurrentTenant):
+    """
+    Upload an avatar for the current employee.
+
+    Identical images are stored once; see `app.core.images.store_avatar`.
+    """
+    employee = tenant.employee
     if not employee:
         raise HTTPException(status_code=404, detail="User not registered as employee")
     
-    if not file.content_type.startswith("image/"):
+    if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Invalid file type. Only images are allowed.")
-    #  Ensure the directory exists
-    os.makedirs("/app/app/static/avatars", exist_ok=True)
 
-    # Save the avatar to the static files directory
-    id = uuid.uuid4()
-    logger.info(f"Saving avatar with id {id}")
-    avatar_path = f"/app/app/static/avatars/{id}.png"
-    logger.info(f"Saving avatar to {avatar_path}")
-    
-    # Delete the old avatar if it exists
-    if employee.avatar:
-        old_avatar_path = f"/app/app/static/avatars/{employee.avatar}.png"
-        if os.path.exists(old_avatar_path):
-            try:
-                os.remove(old_avatar_path)
-            except Exception as e:
-                logger.error(f"Error deleting old avatar: {e}")
-                raise HTTPException(status_code=400, detail="Error updating old avatar")
-    
     try:
-        with open(avatar_path, "wb") as buffer:
-            buffer.write(file.file.read())
-    except Exception as e:
-        logger.error(f"Error saving avatar: {e}")
-        raise HTTPException(status_code=400, detail="Error saving avatar")
-    try:
-        employee.avatar = id
-    except Exception as e:
-        logger.error(f"Error adding avatar: {e}")
-        raise HTTPException(status_code=400, detail="Error adding avatar")
-    
+        avatar_id = await store_avatar(file)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImageError as e:
+        logger.info(f"Rejected avatar upload: {e}")
+        raise HTTPException(status_code=400, detail="Invalid image")
+    logger.info(f"Saved avatar {avatar_id}")
+
+    # Files are shared by every employee uploading the same image, so the
+    # previous avatar is left in place
+    employee.avatar = avatar_id
+    employee_id = employee.id
     session.add(employee)
-    session.commit()
-    session.refresh(employee)
-    return employee
+    await session.commit()
+    return await session.get(
+        Employee, employee_id, options=loader_options(EmployeePublic, Employee), populate_existing=True
+    )
 
 @router.get("/get_avatar/{id}")
-async def get_avatar(id: uuid.UUID):
-    avatar_path = f"/app/app/static/avatars/{id}.png"
-    image_path = Path(avatar_path)
-    if not image_path.is_file():
+async def get_avatar(id: uuid.UUID, size: Optional[int] = None):
+    """
+    Get an avatar, or its square variant of `size` pixels.
+
+    Avatar ids are derived from the image content, so responses are
+    immutable and revalidated by their id alone.
+    """
+    if size is not None and size not in settings.AVATAR_SIZES:
+        raise HTTPException(status_code=400, detail=f"Size must be one of {settings.AVATAR_SIZES}")
+    image_path = avatar_path(id, size)
+    if size is not None and not await asyncio.to_thread(image_path.is_file):
+        # avatars uploaded before variants were generated
+        image_path = avatar_path(id)
+    if not await asyncio.to_thread(image_path.is_file):
         raise HTTPException(status_code=404, detail="Image not found")
-    return FileResponse(image_path)
+    return CachedFileResponse(
+        image_path, etag=f'"{image_path.stem}"', immutable=True, media_type="image/png"
+    )
 
 @router.delete("/{id}")
 def delete_employee(
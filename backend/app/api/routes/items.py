@@ -1,89 +1,138 @@
+import csv
+import io
+import json
 import uuid
-from typing import Any
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from typing import IO, Any, Literal
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, UploadFile
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
-from app.models.item_model import Item, ItemCreate, ItemPublic, ItemsPublic, ItemUpdate
+from app.api.deps import AsyncCurrentBusiness, AsyncCurrentUser, AsyncSessionDep, CurrentBusiness, CurrentUser, SessionDep
+from app.api.pagination import PageDep, apaginate
+from app.api.responses import page_response
+from app.models.item_model import Item, ItemCreate, ItemImportReport, ItemPublic, ItemsPublic, ItemUpdate
 from app.models.base import Message
+from app.models.stock_valuation_model import StockValuationHistoryPublic, StockValuationPublic
 from app.crud.crude_item import item_crud
+from app.crud.crud_stock_valuation import stock_valuation_crud
 
 router = APIRouter()
 
+ImportFormat = Literal["csv", "ndjson"]
+
+
+def _iter_import_rows(file: IO[bytes], format: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """
+    Yield (row number, row) from an uploaded CSV or NDJSON file, one line at a time.
+    """
+    text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        if format == "csv":
+            for row_number, row in enumerate(csv.DictReader(text_file), start=1):
+                yield row_number, {key: value for key, value in row.items() if key and value}
+            return
+        for row_number, line in enumerate(text_file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = ValueError(f"Invalid JSON: {e}")
+            yield row_number, row
+    finally:
+        text_file.detach()
+
 
 @router.get("/", response_model=ItemsPublic)
-def read_items_of_business(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_items_of_business(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, page: PageDep
 ) -> Any:
     """
     Retrieve items of business.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
             detail="User is not registered in any business.",
         )
 
-
-    count_statement = (
-        select(func.count())
-        .select_from(Item)
-        .where(Item.business_id == business.id)
-    )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(Item)
-        .where(Item.business_id == business.id)
-        .offset(skip)
-        .limit(limit)
-    )
-    items = session.exec(statement).all()
-
-    return ItemsPublic(data=items, count=count)
+    statement = select(Item).where(Item.business_id == business.id)
+    return page_response(ItemPublic, await apaginate(session, Item, statement, page))
 
 
 @router.get("/by_product/", response_model=ItemsPublic)
-def read_products_items(
-    session: SessionDep, current_user: CurrentUser, product_id: uuid.UUID, skip: int = 0, limit: int = 100
+async def read_products_items(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, product_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve items.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
             detail="User is not registered in any business.",
         )
-    count_statement = (
-        select(func.count())
-        .select_from(Item)
-        .where((Item.business_id == business.id) & (Item.product_id == product_id))
-    )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(Item)
-        .where((Item.business_id == business.id) & (Item.product_id == product_id))
-        .offset(skip)
-        .limit(limit)
+    statement = select(Item).where((Item.business_id == business.id) & (Item.product_id == product_id))
+    return page_response(ItemPublic, await apaginate(session, Item, statement, page))
+
+
+@router.get("/valuation/", response_model=StockValuationPublic)
+async def read_stock_valuation(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness
+) -> Any:
+    """
+    Items, units on hand, cost and retail value of the business's stock per
+    product group.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    return await stock_valuation_crud.aread(session, business.id)
+
+
+@router.get("/valuation/history/", response_model=StockValuationHistoryPublic)
+async def read_stock_valuation_history(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    business: AsyncCurrentBusiness,
+    start: date | None = None,
+    end: date | None = None,
+    product_group_id: uuid.UUID | None = None,
+) -> Any:
+    """
+    Daily stock valuation of the business, of one product group if given.
+
+    Defaults to the last 90 days.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    end = end or datetime.utcnow().date()
+    start = start or end - timedelta(days=90)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    data = await stock_valuation_crud.aread_history(
+        session, business_id=business.id, start=start, end=end, product_group_id=product_group_id
     )
-    items = session.exec(statement).all()
-    return ItemsPublic(data=items, count=count)
+    return StockValuationHistoryPublic(start=start, end=end, data=data)
 
 
 @router.get("/{id}", response_model=ItemPublic)
-def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_item(session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get item by ID.
     """
-    item = session.get(Item, id)
+    item = await session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -97,12 +146,11 @@ def read_item(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 @router.post("/", response_model=ItemPublic)
 def create_item(
-    *, session: SessionDep, current_user: CurrentUser, item_in: ItemCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, item_in: ItemCreate
 ) -> Any:
     """
     Create new item.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -112,11 +160,36 @@ def create_item(
     return item
 
 
+@router.post("/import/", response_model=ItemImportReport)
+def import_items(
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, file: UploadFile, format: ImportFormat | None = None
+) -> Any:
+    """
+    Create or update items of business from a CSV or NDJSON file.
+
+    Rows are matched to products by `sku`; an existing item of the same
+    product is updated. Invalid rows are skipped and listed in the report.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    if format is None:
+        filename = (file.filename or "").lower()
+        format = "ndjson" if filename.endswith((".ndjson", ".jsonl")) else "csv"
+    try:
+        return item_crud.import_items(session, business.id, _iter_import_rows(file.file, format))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded")
+
+
 @router.put("/{id}", response_model=ItemPublic)
 def update_item(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     item_in: ItemUpdate,
 ) -> Any:
@@ -126,7 +199,6 @@ def update_item(
     item = session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -134,17 +206,12 @@ def update_item(
         )
     if not current_user.is_superuser and (item.business_id != business.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    update_dict = item_in.model_dump(exclude_unset=True)
-    item.sqlmodel_update(update_dict)
-    session.add(item)
-    session.commit()
-    session.refresh(item)
-    return item
+    return item_crud.update_item(session, item, item_in)
 
 
 @router.delete("/{id}")
 def delete_item(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an item.
@@ -152,7 +219,6 @@ def delete_item(
     item = session.get(Item, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -160,6 +226,5 @@ def delete_item(
         )
     if not current_user.is_superuser and (item.business_id != business.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(item)
-    session.commit()
+    item_crud.delete_item(session, item)
     return Message(message="Item deleted successfully")
@@ -2,9 +2,11 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.deps import AsyncCurrentBusiness, AsyncCurrentUser, AsyncSessionDep, CurrentBusiness, CurrentUser, SessionDep
+from app.api.pagination import PageDep, apaginate
+from app.api.responses import page_response
 from app.models.lead_model import Lead, LeadCreate, LeadPublic, LeadsPublic, LeadUpdate
 from app.models.base import Message
 from app.crud.crud_lead import lead_crud
@@ -13,47 +15,31 @@ router = APIRouter()
 
 
 @router.get("/", response_model=LeadsPublic)
-def read_leads_of_business(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_leads_of_business(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, page: PageDep
 ) -> Any:
     """
     Retrieve leads of business.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
             detail="User is not registered in any business.",
         )
 
-
-    count_statement = (
-        select(func.count())
-        .select_from(Lead)
-        .where(Lead.business_id == business.id)
-    )
-    count = session.exec(count_statement).one()
-    statement = (
-        select(Lead)
-        .where(Lead.business_id == business.id)
-        .offset(skip)
-        .limit(limit)
-    )
-    leads = session.exec(statement).all()
-
-    return LeadsPublic(data=leads, count=count)
+    statement = select(Lead).where(Lead.business_id == business.id)
+    return page_response(LeadPublic, await apaginate(session, Lead, statement, page))
 
 
 @router.get("/{id}", response_model=LeadPublic)
-def read_lead(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_lead(session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get lead by ID.
     """
-    lead = session.get(Lead, id)
+    lead = await session.get(Lead, id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -67,12 +53,11 @@ def read_lead(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 @router.post("/", response_model=LeadPublic)
 def create_lead(
-    *, session: SessionDep, current_user: CurrentUser, lead_in: LeadCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, lead_in: LeadCreate
 ) -> Any:
     """
     Create new lead.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -87,6 +72,7 @@ def update_lead(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     lead_in: LeadUpdate,
 ) -> Any:
@@ -96,7 +82,6 @@ def update_lead(
     lead = session.get(Lead, id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -114,7 +99,7 @@ def update_lead(
 
 @router.delete("/{id}")
 def delete_lead(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an lead.
@@ -122,7 +107,6 @@ def delete_lead(
     lead = session.get(Lead, id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -130,6 +114,5 @@ def delete_lead(
         )
     if not current_user.is_superuser and (lead.business_id != business.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
-    session.delete(lead)
-    session.commit()
+    lead_crud.delete_lead(session, lead)
     return Message(message="Lead deleted successfully")
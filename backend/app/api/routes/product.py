@@ -5,14 +5,20 @@ from app.models.product_group_model import ProductGroup
 from fastapi import APIRouter, HTTPException
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id, retrieve_products_by_business_id
+from app.api.deps import (AsyncCurrentBusiness, AsyncCurrentUser, AsyncSessionDep, CurrentBusiness, CurrentUser, SessionDep,
+    abusiness_has_product, aretrieve_products_by_business_id, business_has_product, business_product_ids)
+from app.api.pagination import PageDep, apaginate
+from app.api.responses import page_response
 from app.models.product_model import Product, ProductCreate, ProductPublic, ProductPublic, ProductUpdate, ProductsPublic
+from app.models.loaders import loader_options
 from app.models.business_model import Business, BusinessPublicID
 from app.models.base import Message
 from app.models.item_model import Item
-from app.models.product_tag_link_model import ProductTagLink
+from app.models.product_tag_link_model import (ProductTagLink, ProductTagLinkOutcome, ProductTagLinksCreate,
+    ProductTagLinksReport)
 from app.models.product_tag_model import ProductTag
 from app.crud.crud_product import product_crud
+from app.crud.crud_product_tag_link import create_product_tag_link, create_product_tag_links
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -21,101 +27,91 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/", response_model=ProductsPublic)
-def read_products_all_public_by_group(
-    session: SessionDep, current_user: CurrentUser, product_group_id: uuid.UUID, skip: int = 0, limit: int = 100
+async def read_products_all_public_by_group(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, product_group_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve products og product_group.
     """
     # Get product_group
-    product_group = session.get(ProductGroup, product_group_id)
+    product_group = await session.get(ProductGroup, product_group_id)
     if not product_group:
         raise HTTPException(status_code=404, detail="Product group not found")
 
     # check if current_user has employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     # TODO add moderation functionality
-    products_all = session.exec(select(Product).where((Product.product_group_id == product_group_id)
-                                                    #   & (Product.moderated == True)
-                                                      )).all()
-    count = len(products_all)
-    products = ProductsPublic(data=products_all, count=count)
-    return products
+    statement = select(Product).where((Product.product_group_id == product_group_id)
+                                    #   & (Product.moderated == True)
+                                      )
+    return page_response(ProductPublic, await apaginate(session, Product, statement, page, ProductPublic))
 
 @router.get("/by_product_group_with_created_items/", response_model=ProductsPublic)
-def read_products_group(
-    session: SessionDep, current_user: CurrentUser, product_group_id: uuid.UUID, skip: int = 0, limit: int = 100
+async def read_products_group(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, product_group_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve products of product_group with created items.
     """
     # Get product_group
-    product_group = session.get(ProductGroup, product_group_id)
+    product_group = await session.get(ProductGroup, product_group_id)
     if not product_group:
         raise HTTPException(status_code=404, detail="Product group not found")
 
     # check if current_user has employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     if not current_user.is_superuser:
-        products = retrieve_products_by_business_id(session=session, business_id=business.id, product_group_id=product_group_id)
+        products = await aretrieve_products_by_business_id(session=session, business_id=business.id, product_group_id=product_group_id, page=page)
     else:
-        products_all = session.exec(select(Product).where(Product.product_group_id == product_group_id)).all()
-        count = len(products_all)
-        products = ProductsPublic(data=products_all, count=count)
+        statement = select(Product).where(Product.product_group_id == product_group_id)
+        products = await apaginate(session, Product, statement, page, ProductPublic)
 
-    return products
+    return page_response(ProductPublic, products)
 
 
 @router.get("/by_business/", response_model=ProductsPublic)
-def read_by_business(
-    session: SessionDep, current_user: CurrentUser
+async def read_by_business(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, page: PageDep
 ) -> Any:
     """
     Retrieve products.
     """
     # check if current_user has employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
     
     # Get products of the business
-    products = retrieve_products_by_business_id(session=session, business_id=business.id, product_group_id=None)
-    return products
+    products = await aretrieve_products_by_business_id(session=session, business_id=business.id, product_group_id=None, page=page)
+    return page_response(ProductPublic, products)
 
 
 @router.get("/{id}", response_model=ProductPublic)
-def read_product(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_product(session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get product by ID.
     """
-    product = session.get(Product, id)
+    product = await session.get(Product, id, options=loader_options(ProductPublic, Product))
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    existing_products = retrieve_products_by_business_id(session=session, business_id=business.id)
-    # check if product is in existing_products
-    filtered_existing_products = [e for e in existing_products.data if e.id == id]
-    if len(filtered_existing_products) == 0:
+    # check if the business has items of the product
+    if not current_user.is_superuser and not await abusiness_has_product(session, business.id, id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     return product
 
 
 @router.post("/", response_model=ProductPublic)
 def create_product_with_group(
-    *, session: SessionDep, current_user: CurrentUser, product_in: ProductCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, product_in: ProductCreate
 ) -> Any:
     """
     Create new product.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     product = product_crud.create_product(session=session, product_in=product_in, product_group_id=product_in.product_group_id)
@@ -123,7 +119,7 @@ def create_product_with_group(
 
 @router.put("/taglink/", response_model=ProductPublic)
 def add_product_tag_link_to_product(
-    *, session: SessionDep, current_user: CurrentUser, product_tag_link: ProductTagLink
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, product_tag_link: ProductTagLink
 ) -> Any:
     """
     Create new product_tag_link.
@@ -134,18 +130,12 @@ def add_product_tag_link_to_product(
         raise HTTPException(status_code=404, detail="Product not found")
     
     # Check if current_user has permission to add tag to product
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions, you not in any")
     
-    existing_products = retrieve_products_by_business_id(session=session, business_id=business.id)
-    # TODO retrieve products by business takes only that products that have items associated to business in which user is employee. There is product is not in that list, then user does not have permission to add tag to that product
-    # NEED to fix that
-    # check if product is in existing_products
-    logger.info(f"existing_products: {existing_products}")
-    filtered_existing_products = [e for e in existing_products.data if e.id == product_tag_link.product_id]
-    # if len(filtered_existing_products) > 0:
-    #     raise HTTPException(status_code=400, detail="Product already has this tag")
+    # Only products the business has items of can be tagged by its employees
+    if not current_user.is_superuser and not business_has_product(session, business.id, product_tag_link.product_id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
     
     product_tag = session.get(ProductTag, product_tag_link.product_tag_id)
     if not product_tag:
@@ -154,27 +144,59 @@ def add_product_tag_link_to_product(
     if product_tag.id in [t.id for t in product.tags]:
         raise HTTPException(status_code=400, detail="Product already has this tag")
     
-    # Saving product_tag_link and updating product
-    logger.info(f"product_tag: {product_tag}")
-    tags = product.tags + [product_tag]
-    logger.info(f"tags: {tags}")
-    product_in = ProductUpdate(
-        tags = product.tags + [product_tag]
-    )
-    logger.info(f"product_in: {product_in}")
-    update_dict = product_in.model_dump(exclude_unset=True)
-    product.sqlmodel_update(update_dict)
-    session.add(product)
-    session.add(product_tag_link)
-    session.commit()
+    # Saving product_tag_link, which also counts it in the tag facets
+    create_product_tag_link(session, product_tag_link)
     session.refresh(product)
     return product
 
+@router.put("/taglinks/", response_model=ProductTagLinksReport)
+def add_product_tag_links(
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, links_in: ProductTagLinksCreate
+) -> Any:
+    """
+    Link every given tag to every given product, reporting the outcome of each pair.
+    """
+    if not current_user.is_superuser and (not business):
+        raise HTTPException(status_code=400, detail="Not enough permissions, you not in any")
+
+    product_ids = list(dict.fromkeys(links_in.product_ids))
+    tag_ids = list(dict.fromkeys(links_in.product_tag_ids))
+    found_products = set(session.exec(select(Product.id).where(Product.id.in_(product_ids))).all())
+    found_tags = set(session.exec(select(ProductTag.id).where(ProductTag.id.in_(tag_ids))).all())
+    # Only products the business has items of can be tagged by its employees
+    allowed = found_products if current_user.is_superuser else business_product_ids(session, business.id, found_products)
+
+    created = create_product_tag_links(
+        session, [id for id in product_ids if id in allowed], [id for id in tag_ids if id in found_tags]
+    )
+    report = ProductTagLinksReport()
+    for product_id in product_ids:
+        for tag_id in tag_ids:
+            if product_id not in found_products:
+                status = "product_not_found"
+            elif tag_id not in found_tags:
+                status = "tag_not_found"
+            elif product_id not in allowed:
+                status = "forbidden"
+            elif (product_id, tag_id) in created:
+                status = "created"
+            else:
+                status = "exists"
+            if status == "created":
+                report.created += 1
+            elif status == "exists":
+                report.existing += 1
+            else:
+                report.failed += 1
+            report.data.append(ProductTagLinkOutcome(product_id=product_id, product_tag_id=tag_id, status=status))
+    return report
+
 @router.put("/{id}", response_model=ProductPublic)
 def update_product(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     product_in: ProductUpdate,
 ) -> Any:
@@ -186,29 +208,20 @@ def update_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    existing_products = retrieve_products_by_business_id(session=session, business_id=business.id)
-    # check if product is in existing_products
-    filtered_existing_products = [e for e in existing_products.data if e.id == id]
-    if len(filtered_existing_products) == 0:
+    # check if the business has items of the product
+    if not current_user.is_superuser and not business_has_product(session, business.id, id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
     #Update
-
-    update_dict = product_in.model_dump(exclude_unset=True)
-    product.sqlmodel_update(update_dict)
-    session.add(product)
-    session.commit()
-    session.refresh(product)
-    return product
+    return product_crud.update_product(session, product, product_in)
 
 
 @router.delete("/{id}")
 def delete_product(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an product.
@@ -217,16 +230,12 @@ def delete_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not current_user.is_superuser and (not business):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    existing_products = retrieve_products_by_business_id(session=session, business_id=business.id)
-    # check if product is in existing_products
-    filtered_existing_products = [e for e in existing_products.data if e.id == id]
-    if len(filtered_existing_products) == 0:
+    # check if the business has items of the product
+    if not current_user.is_superuser and not business_has_product(session, business.id, id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    session.delete(product)
-    session.commit()
+    product_crud.delete_product(session, product)
     return Message(message="Product deleted successfully")
@@ -1,15 +1,17 @@
 import uuid
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from sqlmodel import func, select
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CurrentUser, SessionDep
 from app.models.product_tag_model import ProductTag, ProductTagCreate, ProductTagPublic, ProductTagUpdate, ProductTagsPublic, ProductTagPublicDetail
 from app.models.base import Message
 from app.models.product_model import Product, ProductUpdate
 from app.models.product_tag_link_model import ProductTagLink
+from app.models.product_tag_facet_model import ProductTagFacetsPublic
 from app.crud.crud_product_tag import product_tag_crud
+from app.crud.crud_product_tag_facet import product_tag_facet_crud
 from app.crud.crud_product import product_crud
 
 router = APIRouter()
@@ -53,6 +55,20 @@ def read_product_tags_of_product(
     product_tags = session.exec(statement).all()
     return ProductTagsPublic(data=product_tags, count=count)
 
+@router.get("/facets/", response_model=ProductTagFacetsPublic)
+async def read_product_tag_facets(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    product_group_id: uuid.UUID,
+    tag_id: list[uuid.UUID] = Query(default=[]),
+) -> Any:
+    """
+    Number of products per tag in a product group, narrowed to the products
+    having every selected `tag_id`.
+    """
+    data = await product_tag_facet_crud.aread_facets(session, product_group_id, tag_id)
+    return ProductTagFacetsPublic(product_group_id=product_group_id, selected=tag_id, data=data)
+
 @router.get("/{id}", response_model=ProductTagPublicDetail)
 def read_product_tag(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
     """
@@ -2,9 +2,11 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.deps import CurrentBusiness, CurrentUser, SessionDep
+from app.api.pagination import PageDep, paginate
+from app.api.responses import page_response
 from app.models.proposal_model import Proposal, ProposalCreate, ProposalPublic, ProposalsPublic, ProposalUpdate
 from app.models.product_model import Product
 from app.models.base import Message
@@ -17,13 +19,12 @@ router = APIRouter()
 
 @router.get("/{lead_id}", response_model=ProposalsPublic)
 def read_proposals_of_lead(
-    session: SessionDep, current_user: CurrentUser, lead_id: uuid.UUID, skip: int = 0, limit: int = 100
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, lead_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve proposals of business.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -37,20 +38,8 @@ def read_proposals_of_lead(
                 status_code=400,
                 detail="Permission denied",
             )
-        count_statement = (
-            select(func.count())
-            .select_from(Proposal)
-            .where(Proposal.lead_id == lead.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Proposal)
-            .where(Proposal.lead_id == lead.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        proposals = session.exec(statement).all()
-        return ProposalsPublic(data=proposals, count=count)
+        statement = select(Proposal).where(Proposal.lead_id == lead.id)
+        return page_response(ProposalPublic, paginate(session, Proposal, statement, page, ProposalPublic))
     else:
         raise HTTPException(
             status_code=404,
@@ -59,14 +48,13 @@ def read_proposals_of_lead(
 
 
 @router.get("/by/{id}", response_model=ProposalPublic)
-def read_proposal(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+def read_proposal(session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get proposal by ID.
     """
     proposal = session.get(Proposal, id)
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -86,12 +74,11 @@ def read_proposal(session: SessionDep, current_user: CurrentUser, id: uuid.UUID)
 
 @router.post("/", response_model=ProposalPublic)
 def create_proposal(
-    *, session: SessionDep, current_user: CurrentUser, proposal_in: ProposalCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, proposal_in: ProposalCreate
 ) -> Any:
     """
     Create new proposal.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -126,6 +113,7 @@ def update_proposal(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     proposal_in: ProposalUpdate,
 ) -> Any:
@@ -135,7 +123,6 @@ def update_proposal(
     proposal = session.get(Proposal, id)
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -157,7 +144,7 @@ def update_proposal(
 
 @router.delete("/{id}")
 def delete_proposal(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an proposal.
@@ -165,7 +152,6 @@ def delete_proposal(
     proposal = session.get(Proposal, id)
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -1,36 +1,113 @@
 import uuid
+from datetime import date, datetime, timedelta
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from fastapi import APIRouter, HTTPException, Query
+from sqlmodel import select
 
-from app.api.deps import CurrentUser, SessionDep, retrieve_businesses_by_user_id
+from app.api.deps import AsyncCurrentBusiness, AsyncCurrentUser, AsyncSessionDep, CurrentBusiness, CurrentUser, SessionDep
+from app.api.pagination import PageDep, apaginate
+from app.api.responses import page_response
 from app.models.sale_model import Sale, SaleCreate, SalePublic, SalesPublic, SaleUpdate
+from app.models.sales_forecast_model import ForecastMethod, SalesForecastPublic
+from app.models.sales_rollup_model import Granularity, GroupBy, SalesAnalyticsPublic
 from app.models.product_model import Product
-from app.models.item_model import Item, ItemUpdate
+from app.models.item_model import Item
 from app.models.base import Message
 from app.models.lead_model import Lead
+from app.models.loaders import loader_options
 from app.crud.crud_sale import sale_crud
 
 
 router = APIRouter()
 
 
+@router.get("/analytics/", response_model=SalesAnalyticsPublic)
+async def read_sales_analytics(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    business: AsyncCurrentBusiness,
+    granularity: Granularity = "day",
+    group_by: GroupBy = "total",
+    start: date | None = None,
+    end: date | None = None,
+) -> Any:
+    """
+    Revenue, units, discount, cost and margin of the business's sales per
+    day or month, read from the sales rollups only.
+
+    Defaults to the last 30 days, or the last 12 months by month.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    end = end or datetime.utcnow().date()
+    if granularity == "month":
+        start = (start or date(end.year - 1, end.month, 1)).replace(day=1)
+    else:
+        start = start or end - timedelta(days=30)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    data = await sale_crud.aread_analytics(
+        session,
+        business_id=business.id,
+        granularity=granularity,
+        group_by=group_by,
+        start=start,
+        end=end,
+    )
+    return SalesAnalyticsPublic(
+        granularity=granularity, group_by=group_by, start=start, end=end, data=data
+    )
+
+
+@router.get("/forecast/", response_model=SalesForecastPublic)
+async def read_sales_forecast(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    business: AsyncCurrentBusiness,
+    horizon: int = Query(default=14, ge=1, le=90),
+    history_days: int = Query(default=112, ge=28, le=730),
+    method: ForecastMethod | None = None,
+) -> Any:
+    """
+    Daily units forecast for the next `horizon` days of every item sold in
+    the last `history_days`.
+
+    Without a method, each item uses the one that best predicted its own
+    recent sales.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    return await sale_crud.aread_forecast(
+        session,
+        business_id=business.id,
+        start=datetime.utcnow().date(),
+        horizon=horizon,
+        history_days=history_days,
+        method=method,
+    )
+
+
 @router.get("/{lead_id}", response_model=SalesPublic)
-def read_sales_of_lead(
-    session: SessionDep, current_user: CurrentUser, lead_id: uuid.UUID, skip: int = 0, limit: int = 100
+async def read_sales_of_lead(
+    session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, lead_id: uuid.UUID, page: PageDep
 ) -> Any:
     """
     Retrieve sales of business.
     """
     # get business in which user is registered as employee
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
             detail="User is not registered in any business.",
         )
-    lead = session.get(Lead, lead_id)
+    lead = await session.get(Lead, lead_id)
     # check if lead belongs of users business
     if lead:
         if business.id != lead.business_id:
@@ -38,20 +115,8 @@ def read_sales_of_lead(
                 status_code=400,
                 detail="Permission denied",
             )
-        count_statement = (
-            select(func.count())
-            .select_from(Sale)
-            .where(Sale.lead_id == lead.id)
-        )
-        count = session.exec(count_statement).one()
-        statement = (
-            select(Sale)
-            .where(Sale.lead_id == lead.id)
-            .offset(skip)
-            .limit(limit)
-        )
-        sales = session.exec(statement).all()
-        return SalesPublic(data=sales, count=count)
+        statement = select(Sale).where(Sale.lead_id == lead.id)
+        return page_response(SalePublic, await apaginate(session, Sale, statement, page, SalePublic))
     else:
         raise HTTPException(
             status_code=404,
@@ -60,14 +125,13 @@ def read_sales_of_lead(
 
 
 @router.get("/by/{id}", response_model=SalePublic)
-def read_sale(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) -> Any:
+async def read_sale(session: AsyncSessionDep, current_user: AsyncCurrentUser, business: AsyncCurrentBusiness, id: uuid.UUID) -> Any:
     """
     Get sale by ID.
     """
-    sale = session.get(Sale, id)
+    sale = await session.get(Sale, id, options=loader_options(SalePublic, Sale))
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -77,9 +141,9 @@ def read_sale(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
         statement = (
             select(Sale)
             .join(Lead)
-            .where(Lead.business_id==business.id and Sale.id == sale.id)
+            .where(Lead.business_id == business.id, Sale.id == sale.id)
         )
-        sale_exist = session.exec(statement).first()
+        sale_exist = (await session.exec(statement)).first()
         if not current_user.is_superuser and not sale_exist:
             raise HTTPException(status_code=400, detail="Not enough permissions")
     return sale
@@ -87,12 +151,11 @@ def read_sale(session: SessionDep, current_user: CurrentUser, id: uuid.UUID) ->
 
 @router.post("/", response_model=SalePublic)
 def create_sale(
-    *, session: SessionDep, current_user: CurrentUser, sale_in: SaleCreate
+    *, session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, sale_in: SaleCreate
 ) -> Any:
     """
     Create new sale.
     """
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -113,21 +176,19 @@ def create_sale(
                         status_code=404,
                         detail="Item specified not founded, please select existing one",
                     )
-                
-                # reduce items quantity
-                q = item.quantity - sale_in.quantity_of_items
-                if q < 0:
+                if item.business_id != business.id:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="Premission denied",
+                    )
+
+                # reduce items quantity in the same transaction as the sale
+                sale = sale_crud.sell_item(session, sale_in, item)
+                if not sale:
                     raise HTTPException(
                         status_code=404,
                         detail="Items not enough to sale",
                     )
-                sale = sale_crud.create_sale(session, sale_in)    
-                upd = ItemUpdate(quantity=q)
-                update_dict = upd.model_dump(exclude_unset=True)
-                item.sqlmodel_update(update_dict)
-                session.add(item)
-                session.commit()
-                session.refresh(item)
                 return sale
         else:
             raise HTTPException(
@@ -141,6 +202,7 @@ def update_sale(
     *,
     session: SessionDep,
     current_user: CurrentUser,
+    business: CurrentBusiness,
     id: uuid.UUID,
     sale_in: SaleUpdate,
 ) -> Any:
@@ -150,7 +212,6 @@ def update_sale(
     sale = session.get(Sale, id)
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -162,17 +223,18 @@ def update_sale(
             status_code=400,
             detail="Premission denied",
         )
-    update_dict = sale_in.model_dump(exclude_unset=True)
-    sale.sqlmodel_update(update_dict)
-    session.add(sale)
-    session.commit()
-    session.refresh(sale)
+    sale = sale_crud.update_sale(session, sale, sale_in)
+    if not sale:
+        raise HTTPException(
+            status_code=404,
+            detail="Items not enough to sale",
+        )
     return sale
 
 
 @router.delete("/{id}")
 def delete_sale(
-    session: SessionDep, current_user: CurrentUser, id: uuid.UUID
+    session: SessionDep, current_user: CurrentUser, business: CurrentBusiness, id: uuid.UUID
 ) -> Message:
     """
     Delete an sale.
@@ -180,7 +242,6 @@ def delete_sale(
     sale = session.get(Sale, id)
     if not sale:
         raise HTTPException(status_code=404, detail="Sale not found")
-    business = retrieve_businesses_by_user_id(session, current_user.id)
     if not business:
         raise HTTPException(
             status_code=404,
@@ -192,6 +253,5 @@ def delete_sale(
             status_code=400,
             detail="Premission denied",
         )
-    session.delete(sale)
-    session.commit()
+    sale_crud.delete_sale(session, sale)
     return Message(message="Sale deleted successfully")
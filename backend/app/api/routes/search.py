@@ -0,0 +1,35 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.deps import AsyncCurrentBusiness, AsyncCurrentUser, AsyncSessionDep
+from app.crud.crud_lead import lead_crud
+from app.crud.crud_product import product_crud
+from app.models.search_model import SearchKind, SearchPublic
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SearchPublic)
+async def search(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    business: AsyncCurrentBusiness,
+    q: str = Query(min_length=2, max_length=100),
+    kind: SearchKind | None = None,
+    limit: int = Query(default=20, ge=1, le=100),
+) -> Any:
+    """
+    Products and leads of the business matching `q`, best first.
+
+    Words of `q` match words starting with them; misspelled words match
+    similar ones.
+    """
+    if not business:
+        raise HTTPException(
+            status_code=404,
+            detail="User is not registered in any business.",
+        )
+    products = await product_crud.asearch(session, business.id, q, limit) if kind != "lead" else []
+    leads = await lead_crud.asearch(session, business.id, q, limit) if kind != "product" else []
+    return SearchPublic(products=products, leads=leads)
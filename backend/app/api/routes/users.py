@@ -2,7 +2,7 @@ import uuid
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import col, delete, func, select
+from sqlmodel import col, delete, select
 
 from app.crud.crud_user import user_crud
 from app.api.deps import (
@@ -10,8 +10,10 @@ from app.api.deps import (
     SessionDep,
     get_current_active_superuser,
 )
+from app.api.pagination import PageDep, paginate
+from app.api.responses import page_response
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.security import verify_password
 from app.models.base import (
     Message
 )
@@ -28,7 +30,7 @@ from app.models.user_model import (
     UpdatePassword
 )
 
-from app.utils import generate_new_account_email, send_email
+from app.utils import generate_new_account_email, queue_email
 
 router = APIRouter()
 
@@ -38,18 +40,11 @@ router = APIRouter()
     dependencies=[Depends(get_current_active_superuser)],
     response_model=UsersPublic,
 )
-def read_users(session: SessionDep, skip: int = 0, limit: int = 100) -> Any:
+def read_users(session: SessionDep, page: PageDep) -> Any:
     """
     Retrieve users.
     """
-
-    count_statement = select(func.count()).select_from(User)
-    count = session.exec(count_statement).one()
-
-    statement = select(User).offset(skip).limit(limit)
-    users = session.exec(statement).all()
-
-    return UsersPublic(data=users, count=count)
+    return page_response(UserPublic, paginate(session, User, select(User), page, UserPublic))
 
 
 @router.post(
@@ -66,16 +61,18 @@ def create_user(*, session: SessionDep, user_in: UserCreate) -> Any:
             detail="The user with this email already exists in the system.",
         )
 
-    user = user_crud.create_user(session=session, user_create=user_in)
     if settings.emails_enabled and user_in.email:
         email_data = generate_new_account_email(
             email_to=user_in.email, username=user_in.email, password=user_in.password
         )
-        send_email(
+        # committed together with the user by create_user
+        queue_email(
+            session,
             email_to=user_in.email,
             subject=email_data.subject,
             html_content=email_data.html_content,
         )
+    user = user_crud.create_user(session=session, user_create=user_in)
     return user
 
 
@@ -108,14 +105,15 @@ def update_password_me(
     """
     Update own password.
     """
-    if not verify_password(body.current_password, current_user.hashed_password):
+    verified, _ = verify_password(body.current_password, current_user.hashed_password)
+    # the new password is hashed with the current scheme anyway
+    if not verified:
         raise HTTPException(status_code=400, detail="Incorrect password")
     if body.current_password == body.new_password:
         raise HTTPException(
             status_code=400, detail="New password cannot be the same as the current one"
         )
-    hashed_password = get_password_hash(body.new_password)
-    current_user.hashed_password = hashed_password
+    user_crud.set_password(current_user, body.new_password)
     session.add(current_user)
     session.commit()
     return Message(message="Password updated successfully")
@@ -1,9 +1,16 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from pydantic.networks import EmailStr
 
-from app.api.deps import get_current_active_superuser
+from app.api.deps import SessionDep, get_current_active_superuser
+from app.core.db import async_engine, engine
+from app.core.instrumentation import route_metrics
+from app.core.pool import pool_status
+from app.core.security import hashing_pool
+from app.crud.crud_sale import stock_metrics
 from app.models.base import Message
-from app.utils import generate_test_email, send_email
+from app.models.metrics_model import DBPoolsPublic, PasswordHashingPublic, StockContentionPublic
+from app.utils import generate_test_email, queue_email
 
 router = APIRouter()
 
@@ -13,19 +20,72 @@ router = APIRouter()
     dependencies=[Depends(get_current_active_superuser)],
     status_code=201,
 )
-def test_email(email_to: EmailStr) -> Message:
+def test_email(session: SessionDep, email_to: EmailStr) -> Message:
     """
     Test emails.
     """
     email_data = generate_test_email(email_to=email_to)
-    send_email(
+    queue_email(
+        session,
         email_to=email_to,
         subject=email_data.subject,
         html_content=email_data.html_content,
     )
+    session.commit()
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=DBPoolsPublic,
+)
+def read_db_pool_status() -> DBPoolsPublic:
+    """
+    Connection pool usage of this worker process and connection wait times.
+    """
+    return DBPoolsPublic(
+        sync_pool=pool_status(engine.pool),
+        async_pool=pool_status(async_engine.pool),
+    )
+
+
+@router.get(
+    "/stock-contention/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=StockContentionPublic,
+)
+def read_stock_contention() -> StockContentionPublic:
+    """
+    Outcomes of stock decrements on sale creation in this worker process.
+    """
+    return StockContentionPublic(**stock_metrics.snapshot())
+
+
+@router.get(
+    "/password-hashing/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PasswordHashingPublic,
+)
+def read_password_hashing() -> PasswordHashingPublic:
+    """
+    Queue depth and latency of the password hashing pool of this worker process.
+    """
+    return PasswordHashingPublic(**hashing_pool.snapshot())
+
+
+@router.get(
+    "/metrics/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=PlainTextResponse,
+)
+def read_metrics() -> str:
+    """
+    Per-route request count, query count and DB time, in Prometheus text format.
+    """
+    return route_metrics.render()
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
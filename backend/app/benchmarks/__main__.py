@@ -0,0 +1,114 @@
+"""
+Load-test the API against a seeded local database.
+
+    python -m app.benchmarks --requests 500 --concurrency 16
+    python -m app.benchmarks --save-baseline
+
+Requests go through the app in-process unless --base-url points at a
+running local server. Exits with status 1 when a route regresses against
+the stored baselines.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import httpx
+from sqlmodel import Session
+
+from app.benchmarks.runner import compare, load_baselines, run, save_baselines
+from app.benchmarks.seed import SeedConfig, cleanup, seed
+from app.core.config import settings
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "db"}
+DEFAULT_BASELINES = Path(__file__).parent / "baselines.json"
+
+
+def check_local(base_url: str | None) -> None:
+    # Seeding and cleanup write to the database, never point them at a shared one
+    if settings.ENVIRONMENT != "local" or settings.POSTGRES_SERVER not in LOCAL_HOSTS:
+        sys.exit("Benchmarks only run with ENVIRONMENT=local against a local Postgres")
+    if base_url and httpx.URL(base_url).host not in LOCAL_HOSTS:
+        sys.exit("Benchmarks only run against a local server")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="requests per route")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per route")
+    parser.add_argument("--base-url", help="local server to load instead of the in-process app")
+    parser.add_argument("--baselines", type=Path, default=DEFAULT_BASELINES)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, 0.2 = 20%%")
+    parser.add_argument("--keep-data", action="store_true", help="leave the seeded rows in place")
+    parser.add_argument("--businesses", type=int, default=SeedConfig.businesses)
+    parser.add_argument("--products", type=int, default=SeedConfig.products)
+    parser.add_argument("--items-per-business", type=int, default=SeedConfig.items_per_business)
+    parser.add_argument("--leads-per-business", type=int, default=SeedConfig.leads_per_business)
+    return parser.parse_args()
+
+
+async def load(args: argparse.Namespace, tenants: list) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+    async with client:
+        return await run(
+            client, tenants, requests=args.requests, concurrency=args.concurrency, warmup=args.warmup
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    check_local(args.base_url)
+    config = SeedConfig(
+        businesses=args.businesses,
+        products=args.products,
+        items_per_business=args.items_per_business,
+        leads_per_business=args.leads_per_business,
+    )
+    with Session(engine) as session:
+        cleanup(session)
+        logger.info("Seeding %s", config)
+        tenants = seed(session, config)
+    try:
+        results = asyncio.run(load(args, tenants))
+    finally:
+        if not args.keep_data:
+            with Session(engine) as session:
+                cleanup(session)
+
+    print(f"{'route':<52} {'req':>6} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9}")
+    for route, result in results.items():
+        print(
+            f"{route:<52} {result.requests:>6} {result.errors:>5} {result.p50_ms:>9.2f} "
+            f"{result.p95_ms:>9.2f} {result.p99_ms:>9.2f} {result.throughput:>9.1f}"
+        )
+
+    if args.save_baseline:
+        save_baselines(args.baselines, results)
+        logger.info("Baselines saved to %s", args.baselines)
+        return
+    baselines = load_baselines(args.baselines)
+    if not baselines:
+        logger.info("No baselines at %s, run with --save-baseline to create them", args.baselines)
+        return
+    regressions = compare(results, baselines, args.tolerance)
+    for regression in regressions:
+        logger.error("Regression: %s", regression)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
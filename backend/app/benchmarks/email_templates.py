@@ -0,0 +1,69 @@
+"""
+Time rendering personalised invite emails.
+
+    python -m app.benchmarks.email_templates --count 10000
+
+Compares compiling the template for every email, as render_email_template
+used to, with the shared precompiled environment used one by one and in
+batch.
+"""
+
+import argparse
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+from jinja2 import Template
+
+from app.utils import (
+    _invite_to_business_context,
+    generate_invite_to_business_email,
+    generate_invite_to_business_emails,
+    generate_invite_token,
+)
+
+TEMPLATE_PATH = Path(__file__).parents[1] / "email-templates" / "build" / "business_invite.html"
+
+
+def _compile_each(invites: list[tuple[str, str]]) -> None:
+    for email, token in invites:
+        Template(TEMPLATE_PATH.read_text()).render(_invite_to_business_context(email, email, "Benchmark LLC", token))
+
+
+def _shared_environment(invites: list[tuple[str, str]]) -> None:
+    for email, token in invites:
+        generate_invite_to_business_email(email_to=email, email=email, business_name="Benchmark LLC", token=token)
+
+
+def _batch(invites: list[tuple[str, str]]) -> None:
+    generate_invite_to_business_emails("Benchmark LLC", invites)
+
+
+def _timed(render: Callable[[list[tuple[str, str]]], None], invites: list[tuple[str, str]]) -> float:
+    start = time.perf_counter()
+    render(invites)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=10_000)
+    args = parser.parse_args()
+
+    business_id = uuid.uuid4()
+    invites = [
+        (email, generate_invite_token(email=email, business_id=business_id))
+        for email in (f"invitee-{i}@example.com" for i in range(args.count))
+    ]
+    for name, render in (
+        ("compile per email", _compile_each),
+        ("shared environment", _shared_environment),
+        ("batch render", _batch),
+    ):
+        seconds = _timed(render, invites)
+        print(f"{name:<20} {seconds:8.3f}s {args.count / seconds:10.0f} emails/s")
+
+
+if __name__ == "__main__":
+    main()
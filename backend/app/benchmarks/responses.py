@@ -0,0 +1,92 @@
+"""
+Time encoding list responses.
+
+    python -m app.benchmarks.responses --rows 10000
+
+Compares returning a `*sPublic` model, which FastAPI validates against
+response_model and encodes with json or orjson, with page_response reading
+the rows straight into orjson. Rows are built in memory, so only the
+response path is timed, not the queries.
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+import app.core.db  # noqa: F401 - registers every table model with the mappers
+from app.api.responses import page_response
+from app.models.item_model import Item, ItemPublic, ItemsPublic
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import Product, ProductPublic, ProductsPublic
+from app.models.product_tag_model import ProductTag
+
+
+def _items(rows: int) -> list[Item]:
+    business_id, product_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        Item(title=f"Item {n}", description="Benchmark item", price=9.99, cost_price=4.5, quantity=n % 50,
+             business_id=business_id, product_id=product_id)
+        for n in range(rows)
+    ]
+
+
+def _products(rows: int) -> list[Product]:
+    groups = [ProductGroup(title=f"Group {n}", description=None) for n in range(10)]
+    tags = [ProductTag(title=f"Tag {n}") for n in range(20)]
+    products = []
+    for n in range(rows):
+        group = groups[n % len(groups)]
+        product = Product(title=f"Product {n}", description="Benchmark product", sku=f"BENCH-{n}",
+                          product_group_id=group.id, group=group)
+        product.tags = [tags[n % len(tags)], tags[(n + 1) % len(tags)]]
+        products.append(product)
+    return products
+
+
+def _response_model(list_model: type[BaseModel], response_class: type[JSONResponse]) -> Callable[[dict], bytes]:
+    field = create_response_field(name=f"Response_{list_model.__name__}", type_=list_model, mode="serialization")
+
+    def render(page: dict[str, Any]) -> bytes:
+        # what a route returning list_model(**page) costs once FastAPI has it
+        content = asyncio.run(serialize_response(field=field, response_content=list_model(**page)))
+        return response_class(content).body
+
+    return render
+
+
+def _timed(render: Callable[[dict], bytes], page: dict[str, Any]) -> float:
+    start = time.perf_counter()
+    render(page)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per path, the fastest is reported")
+    args = parser.parse_args()
+
+    for label, rows, public_model, list_model in (
+        ("items", _items(args.rows), ItemPublic, ItemsPublic),
+        ("products", _products(args.rows), ProductPublic, ProductsPublic),
+    ):
+        page = {"data": rows, "count": len(rows), "next_cursor": None, "prev_cursor": None}
+        for name, render in (
+            ("response_model json", _response_model(list_model, JSONResponse)),
+            ("response_model orjson", _response_model(list_model, ORJSONResponse)),
+            ("page_response", lambda page, model=public_model: page_response(model, page).body),
+        ):
+            seconds = min(_timed(render, page) for _ in range(args.repeat))
+            print(f"{label:<9} {name:<22} {seconds:8.3f}s {args.rows / seconds:10.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import math
+import random
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.benchmarks.seed import Tenant
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class Request:
+    method: str
+    url: str
+    params: dict[str, Any] | None = None
+    json: dict[str, Any] | None = None
+
+
+@dataclass
+class Scenario:
+    """
+    One route under load; `build` picks a request for a random tenant.
+    """
+
+    route: str
+    build: Callable[[Tenant, random.Random], Request]
+
+
+SCENARIOS = [
+    Scenario("GET /business/", lambda t, rng: Request("GET", f"{API}/business/")),
+    Scenario("GET /employee/", lambda t, rng: Request("GET", f"{API}/employee/")),
+    Scenario("GET /items/", lambda t, rng: Request("GET", f"{API}/items/", {"limit": 50})),
+    Scenario("GET /items/{id}", lambda t, rng: Request("GET", f"{API}/items/{rng.choice(t.item_ids)}")),
+    Scenario("GET /product/by_business/", lambda t, rng: Request("GET", f"{API}/product/by_business/", {"limit": 50})),
+    Scenario(
+        "GET /product/by_product_group_with_created_items/",
+        lambda t, rng: Request(
+            "GET",
+            f"{API}/product/by_product_group_with_created_items/",
+            {"product_group_id": str(rng.choice(t.product_group_ids)), "limit": 50},
+        ),
+    ),
+    Scenario("GET /lead/", lambda t, rng: Request("GET", f"{API}/lead/", {"limit": 50})),
+    Scenario("GET /sale/{lead_id}", lambda t, rng: Request("GET", f"{API}/sale/{rng.choice(t.lead_ids)}")),
+    Scenario("GET /proposal/{lead_id}", lambda t, rng: Request("GET", f"{API}/proposal/{rng.choice(t.lead_ids)}")),
+    Scenario(
+        "POST /sale/",
+        lambda t, rng: Request(
+            "POST",
+            f"{API}/sale/",
+            json={"lead_id": str(rng.choice(t.lead_ids)), "item_id": str(rng.choice(t.item_ids)), "quantity_of_items": 1},
+        ),
+    ),
+]
+
+
+@dataclass
+class RouteResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput: float
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> RouteResult:
+    values = sorted(latencies)
+    return RouteResult(
+        requests=len(values),
+        errors=errors,
+        p50_ms=round(percentile(values, 50) * 1000, 3),
+        p95_ms=round(percentile(values, 95) * 1000, 3),
+        p99_ms=round(percentile(values, 99) * 1000, 3),
+        throughput=round(len(values) / seconds, 2) if seconds else 0.0,
+    )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    tenants: list[Tenant],
+    *,
+    requests: int,
+    concurrency: int,
+    seed: int = 0,
+) -> RouteResult:
+    rng = random.Random(seed)
+    latencies: list[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            tenant = rng.choice(tenants)
+            request = scenario.build(tenant, rng)
+            start = time.perf_counter()
+            response = await client.request(
+                request.method, request.url, params=request.params, json=request.json, headers=tenant.headers
+            )
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run(
+    client: httpx.AsyncClient,
+    tenants: list[Tenant],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, RouteResult]:
+    results = {}
+    for scenario in SCENARIOS:
+        if warmup:
+            await run_scenario(client, scenario, tenants, requests=warmup, concurrency=concurrency)
+        results[scenario.route] = await run_scenario(
+            client, scenario, tenants, requests=requests, concurrency=concurrency
+        )
+    return results
+
+
+def load_baselines(path: Path) -> dict[str, RouteResult]:
+    if not path.exists():
+        return {}
+    return {route: RouteResult(**values) for route, values in json.loads(path.read_text()).items()}
+
+
+def save_baselines(path: Path, results: dict[str, RouteResult]) -> None:
+    path.write_text(json.dumps({route: asdict(result) for route, result in results.items()}, indent=2) + "\n")
+
+
+def compare(
+    results: dict[str, RouteResult], baselines: dict[str, RouteResult], tolerance: float
+) -> list[str]:
+    """
+    Describe every route slower than its baseline by more than `tolerance`.
+    """
+    regressions = []
+    for route, result in results.items():
+        baseline = baselines.get(route)
+        if baseline is None:
+            continue
+        if result.p95_ms > baseline.p95_ms * (1 + tolerance):
+            regressions.append(f"{route}: p95 {result.p95_ms}ms, baseline {baseline.p95_ms}ms")
+        if result.throughput < baseline.throughput * (1 - tolerance):
+            regressions.append(f"{route}: {result.throughput} req/s, baseline {baseline.throughput} req/s")
+        if result.errors > baseline.errors:
+            regressions.append(f"{route}: {result.errors} errors, baseline {baseline.errors}")
+    return regressions
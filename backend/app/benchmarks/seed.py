@@ -0,0 +1,174 @@
+import random
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlmodel import Session, SQLModel
+
+from app.core import security
+from app.models.business_model import Business
+from app.models.employee_model import Employee
+from app.models.item_model import Item
+from app.models.lead_model import Lead
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import Product
+from app.models.proposal_model import Proposal
+from app.models.sale_model import Sale
+from app.models.user_model import User
+
+# Every seeded row carries this marker so a run can be cleaned up
+PREFIX = "bench-"
+EMAIL_DOMAIN = "bench.example.com"
+
+BATCH_SIZE = 5_000
+
+
+@dataclass
+class SeedConfig:
+    businesses: int = 20
+    product_groups: int = 10
+    products: int = 2_000
+    items_per_business: int = 500
+    leads_per_business: int = 200
+    sales_per_lead: int = 3
+    proposals_per_lead: int = 2
+    seed: int = 42
+
+
+@dataclass
+class Tenant:
+    """
+    One seeded business, with what the scenarios need to address it.
+    """
+
+    business_id: uuid.UUID
+    user_id: uuid.UUID
+    headers: dict[str, str]
+    item_ids: list[uuid.UUID] = field(default_factory=list)
+    product_ids: list[uuid.UUID] = field(default_factory=list)
+    lead_ids: list[uuid.UUID] = field(default_factory=list)
+    product_group_ids: list[uuid.UUID] = field(default_factory=list)
+
+
+def _bulk_insert(session: Session, model: type[SQLModel], rows: Iterable[SQLModel]) -> None:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row.model_dump())
+        if len(batch) >= BATCH_SIZE:
+            session.execute(insert(model), batch)
+            batch = []
+    if batch:
+        session.execute(insert(model), batch)
+
+
+def seed(session: Session, config: SeedConfig) -> list[Tenant]:
+    """
+    Insert a multi-tenant dataset: a shared catalog of products, and per
+    business an owner employee, items, leads, sales and proposals.
+    """
+    rng = random.Random(config.seed)
+    # bcrypt is slow on purpose, every seeded user shares one hash
+    hashed_password = security.get_password_hash(f"{PREFIX}password")
+
+    groups = [ProductGroup(title=f"{PREFIX}group-{i}") for i in range(config.product_groups)]
+    products = [
+        Product(
+            title=f"{PREFIX}product-{i}",
+            description="Benchmark product",
+            sku=f"{PREFIX}{i:08d}",
+            product_group_id=rng.choice(groups).id,
+        )
+        for i in range(config.products)
+    ]
+    _bulk_insert(session, ProductGroup, groups)
+    _bulk_insert(session, Product, products)
+
+    tenants = []
+    for b in range(config.businesses):
+        business = Business(name=f"{PREFIX}business-{b}")
+        user = User(email=f"owner-{b}@{EMAIL_DOMAIN}", hashed_password=hashed_password)
+        employee = Employee(name=f"owner-{b}", user_id=user.id, business_id=business.id)
+        sold = rng.sample(products, min(config.items_per_business, len(products)))
+        items = [
+            Item(
+                title=product.title,
+                price=round(rng.uniform(1, 500), 2),
+                cost_price=round(rng.uniform(1, 300), 2),
+                # enough stock for every sale a benchmark run can make
+                quantity=1_000_000,
+                business_id=business.id,
+                product_id=product.id,
+            )
+            for product in sold
+        ]
+        leads = [
+            Lead(
+                customer_name=f"customer-{b}-{i}",
+                customer_phone=f"+7700{b:03d}{i:04d}",
+                business_id=business.id,
+            )
+            for i in range(config.leads_per_business)
+        ]
+        sales = [
+            Sale(
+                lead_id=lead.id,
+                item_id=rng.choice(items).id,
+                quantity_of_items=rng.randint(1, 5),
+                price_per_item=round(rng.uniform(1, 500), 2),
+                discount=rng.choice((0.0, 0.05, 0.1)),
+            )
+            for lead in leads
+            for _ in range(config.sales_per_lead)
+        ]
+        proposals = [
+            Proposal(
+                lead_id=lead.id,
+                product_id=rng.choice(sold).id,
+                quantity=rng.randint(1, 10),
+                preferable_price_per_item=round(rng.uniform(1, 500), 2),
+            )
+            for lead in leads
+            for _ in range(config.proposals_per_lead)
+        ]
+        _bulk_insert(session, User, [user])
+        _bulk_insert(session, Business, [business])
+        _bulk_insert(session, Employee, [employee])
+        _bulk_insert(session, Item, items)
+        _bulk_insert(session, Lead, leads)
+        _bulk_insert(session, Sale, sales)
+        _bulk_insert(session, Proposal, proposals)
+
+        token = security.create_access_token(user.id, timedelta(hours=1))
+        tenants.append(
+            Tenant(
+                business_id=business.id,
+                user_id=user.id,
+                headers={"Authorization": f"Bearer {token}"},
+                item_ids=[item.id for item in items],
+                product_ids=[product.id for product in sold],
+                lead_ids=[lead.id for lead in leads],
+                product_group_ids=sorted({product.product_group_id for product in sold}),
+            )
+        )
+    session.commit()
+    return tenants
+
+
+def cleanup(session: Session) -> None:
+    """
+    Delete everything a previous run seeded, children first.
+    """
+    businesses = select(Business.id).where(Business.name.startswith(PREFIX))
+    leads = select(Lead.id).where(Lead.business_id.in_(businesses))
+    session.execute(delete(Sale).where(Sale.lead_id.in_(leads)))
+    session.execute(delete(Proposal).where(Proposal.lead_id.in_(leads)))
+    session.execute(delete(Lead).where(Lead.business_id.in_(businesses)))
+    session.execute(delete(Item).where(Item.business_id.in_(businesses)))
+    session.execute(delete(Employee).where(Employee.business_id.in_(businesses)))
+    session.execute(delete(Business).where(Business.name.startswith(PREFIX)))
+    session.execute(delete(User).where(User.email.endswith(f"@{EMAIL_DOMAIN}")))
+    session.execute(delete(Product).where(Product.sku.startswith(PREFIX)))
+    session.execute(delete(ProductGroup).where(ProductGroup.title.startswith(PREFIX)))
+    session.commit()
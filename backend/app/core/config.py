@@ -66,12 +66,52 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Connection pool, sized per worker process: keep
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) below Postgres max_connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Per-connection statement_timeout in milliseconds, 0 disables it
+    DB_STATEMENT_TIMEOUT_MS: int = 30_000
+    # Requests whose slowest statement takes longer log it as a warning
+    SLOW_QUERY_SECONDS: float = 0.5
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def sqlalchemy_engine_options(self) -> dict[str, Any]:
+        return {
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "connect_args": {
+                "options": f"-c statement_timeout={self.DB_STATEMENT_TIMEOUT_MS}"
+            },
+        }
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
     SMTP_HOST: str | None = None
     SMTP_USER: str | None = None
     SMTP_PASSWORD: str | None = None
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    # Connections the email worker keeps open and sends over in parallel
+    SMTP_POOL_SIZE: int = 2
+
+    # Email outbox drained by app/email_worker.py
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_POLL_SECONDS: float = 2.0
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 8
+    # Retries wait BACKOFF * 2 ** (attempts - 1), capped at MAX_BACKOFF
+    EMAIL_OUTBOX_BACKOFF_SECONDS: float = 30.0
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: float = 3_600.0
+    # Claimed emails are due again after this long if their worker died
+    # sending them; keep it above a batch's worst-case send time
+    EMAIL_OUTBOX_LEASE_SECONDS: float = 600.0
     # TODO: update type to EmailStr when sqlmodel supports it
     EMAILS_FROM_EMAIL: str | None = None
     EMAILS_FROM_NAME: str | None = None
@@ -84,6 +124,69 @@ class Settings(BaseSettings):
 
     EMAIL_RESET_TOKEN_EXPIRE_HOURS: int = 48
 
+    # The first scheme hashes new passwords; hashes in the other schemes, or
+    # with other parameters, still verify and are replaced on the next login
+    PASSWORD_HASH_SCHEMES: list[Literal["argon2", "bcrypt"]] = ["bcrypt"]
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_ARGON2_TIME_COST: int = 3
+    PASSWORD_ARGON2_MEMORY_COST: int = 65_536
+    PASSWORD_ARGON2_PARALLELISM: int = 4
+    # Processes hashing passwords; 0 hashes in a thread of the server process
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Process-local cache of verified access tokens; other workers see a
+    # deactivation or password change after at most this many seconds
+    TOKEN_CACHE_TTL_SECONDS: int = 10
+    TOKEN_CACHE_MAXSIZE: int = 10_000
+
+    # Process-local cache of the employee/business resolved for a user
+    TENANT_CACHE_TTL_SECONDS: int = 30
+    TENANT_CACHE_MAXSIZE: int = 10_000
+
+    # Largest `limit` list endpoints accept
+    MAX_PAGE_SIZE: int = 1_000
+
+    # Bulk item import: rows listed in the error report, the rest are counted
+    ITEM_IMPORT_MAX_ERRORS: int = 1_000
+
+    # Marketplace catalog ingestion, run by app/marketplace_ingest.py; one
+    # HTTP connection pool is shared by all marketplaces, requests per
+    # second are limited per marketplace
+    MARKETPLACE_MAX_CONNECTIONS: int = 20
+    MARKETPLACE_TIMEOUT_SECONDS: float = 30.0
+    MARKETPLACE_MAX_RETRIES: int = 5
+    MARKETPLACE_RATE_LIMITS: dict[str, float] = {}
+    MARKETPLACE_DEFAULT_RATE_LIMIT: float = 5.0
+    # Pages fetched at once per marketplace, and listings upserted per transaction
+    MARKETPLACE_FETCH_CONCURRENCY: int = 4
+    MARKETPLACE_BATCH_SIZE: int = 1_000
+
+    # How often app/stock_snapshot.py refreshes today's stock valuation history
+    STOCK_SNAPSHOT_INTERVAL_SECONDS: int = 3_600
+
+    # Demand forecasts are recomputed when a sale of the business changes,
+    # or at the latest after this many seconds
+    FORECAST_CACHE_TTL_SECONDS: int = 3_600
+    FORECAST_CACHE_MAXSIZE: int = 256
+
+    # Word similarity (0-1) a search needs with a product or lead field to
+    # match it despite typos; pg_trgm's own default is 0.6
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+
+    # Avatars are stored once per content hash, with a square PNG variant for
+    # each of AVATAR_SIZES; larger uploads are rejected with 413
+    AVATAR_DIR: str = "/app/app/static/avatars"
+    # Uploads and half-written PNGs stay here, outside the static mount, until
+    # they are moved into AVATAR_DIR; keep both on one filesystem
+    AVATAR_UPLOAD_DIR: str = "/app/app/uploads"
+    AVATAR_MAX_BYTES: int = 5 * 1024 * 1024
+    AVATAR_MAX_PIXELS: int = 25_000_000
+    AVATAR_SIZES: list[int] = [64, 256]
+    # Processes resizing images; 0 resizes in a thread of the server process
+    IMAGE_WORKERS: int = 1
+    IMAGE_MAX_PENDING: int = 16
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def emails_enabled(self) -> bool:
@@ -1,7 +1,10 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app import crud_old as crud
 from app.core.config import settings
+from app.core.instrumentation import instrument_engine
+from app.core.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
 from app.models.user_model import User, UserCreate
 from app.models.base import SQLModel
 from app.models.user_model import User
@@ -14,12 +17,28 @@ from app.models.product_group_model import ProductGroup
 from app.models.product_tag_model import ProductTag
 from app.models.product_tag_link_model import ProductTagLink
 from app.models.sale_model import Sale
+from app.models.sales_rollup_model import SalesDaily, SalesMonthly, SalesVersion
+from app.models.stock_valuation_model import StockValuation, StockValuationSnapshot
+from app.models.product_tag_facet_model import ProductTagFacet
 from app.models.proposal_model import Proposal
 from app.models.lead_model import Lead
 from app.models.address_model import Address
+from app.models.email_outbox_model import EmailOutbox
 from app.models.base import Message, Token, TokenPayload, NewPassword
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedQueuePool,
+    **settings.sqlalchemy_engine_options,
+)
+# psycopg 3 serves both engines, the async one uses its native asyncio driver
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=InstrumentedAsyncQueuePool,
+    **settings.sqlalchemy_engine_options,
+)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
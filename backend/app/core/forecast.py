@@ -0,0 +1,82 @@
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.sales_forecast_model import ForecastMethod
+
+METHODS: tuple[ForecastMethod, ...] = ("moving_average", "exponential_smoothing", "seasonal_naive")
+
+MOVING_AVERAGE_WINDOW = 28
+SMOOTHING_ALPHA = 0.3
+SEASON_DAYS = 7
+
+# (business_id, horizon, history_days, method) -> (sales version, forecast)
+forecast_cache: TTLCache[tuple[Any, ...], tuple[Any, Any]] = TTLCache(
+    ttl=settings.FORECAST_CACHE_TTL_SECONDS, maxsize=settings.FORECAST_CACHE_MAXSIZE
+)
+
+
+class Forecast(NamedTuple):
+    # items x horizon units of the chosen method
+    units: np.ndarray
+    # index into METHODS per item
+    method: np.ndarray
+    # items x METHODS mean absolute error of the backtest
+    errors: np.ndarray
+
+
+def moving_average(history: np.ndarray, horizon: int, window: int = MOVING_AVERAGE_WINDOW) -> np.ndarray:
+    level = history[:, -window:].mean(axis=1)
+    return np.repeat(level[:, None], horizon, axis=1)
+
+
+def exponential_smoothing(history: np.ndarray, horizon: int, alpha: float = SMOOTHING_ALPHA) -> np.ndarray:
+    """
+    Simple exponential smoothing started at the first day, computed for all
+    items at once as a weighted sum of their history.
+    """
+    days = history.shape[1]
+    weights = alpha * (1 - alpha) ** np.arange(days - 1, -1, -1, dtype=np.float64)
+    weights[0] = (1 - alpha) ** (days - 1)
+    level = history @ weights
+    return np.repeat(level[:, None], horizon, axis=1)
+
+
+def seasonal_naive(history: np.ndarray, horizon: int, season: int = SEASON_DAYS) -> np.ndarray:
+    """
+    Repeat the last `season` days, aligned so day `d` of the forecast copies
+    the last day with the same weekday.
+    """
+    last = history[:, -season:]
+    return np.tile(last, (1, -(-horizon // season)))[:, :horizon]
+
+
+_MODELS = {
+    "moving_average": moving_average,
+    "exponential_smoothing": exponential_smoothing,
+    "seasonal_naive": seasonal_naive,
+}
+
+
+def forecast_demand(history: np.ndarray, horizon: int, method: ForecastMethod | None = None) -> Forecast:
+    """
+    Forecast `horizon` days of units for every row of `history` (items x days).
+
+    Each method is backtested on the last `horizon` days of the history;
+    without a `method`, every item gets the one with the lowest error.
+    """
+    history = np.asarray(history, dtype=np.float64)
+    holdout = min(horizon, history.shape[1] - SEASON_DAYS)
+    train, actual = history[:, :-holdout], history[:, -holdout:]
+    errors = np.stack(
+        [np.abs(_MODELS[name](train, holdout) - actual).mean(axis=1) for name in METHODS], axis=1
+    )
+    if method is None:
+        chosen = errors.argmin(axis=1)
+    else:
+        chosen = np.full(history.shape[0], METHODS.index(method))
+    forecasts = np.stack([_MODELS[name](history, horizon) for name in METHODS])
+    units = np.take_along_axis(forecasts, chosen[None, :, None], axis=0)[0]
+    return Forecast(units=units, method=chosen, errors=errors)
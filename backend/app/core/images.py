@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+from app.core.workers import BoundedProcessPool
+
+CHUNK_SIZE = 64 * 1024
+# Room for the boundaries and part headers around an avatar in a multipart body
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+class ImageTooLargeError(Exception):
+    """
+    Raised when an upload exceeds AVATAR_MAX_BYTES or AVATAR_MAX_PIXELS.
+    """
+
+
+class InvalidImageError(Exception):
+    """
+    Raised when an upload is not an image Pillow can decode.
+    """
+
+
+image_pool = BoundedProcessPool(
+    workers=settings.IMAGE_WORKERS,
+    max_pending=settings.IMAGE_MAX_PENDING,
+    busy_detail="Too many images being processed, try again",
+)
+
+
+def avatar_path(id: uuid.UUID, size: int | None = None) -> Path:
+    name = f"{id}.png" if size is None else f"{id}_{size}.png"
+    return Path(settings.AVATAR_DIR) / name
+
+
+def _is_stored(id: uuid.UUID) -> bool:
+    paths = [avatar_path(id), *(avatar_path(id, size) for size in settings.AVATAR_SIZES)]
+    return all(path.is_file() for path in paths)
+
+
+async def spool_upload(file: UploadFile, max_bytes: int) -> tuple[Path, uuid.UUID]:
+    """
+    Copy an upload into AVATAR_UPLOAD_DIR chunk by chunk, hashing it on the way.
+
+    Returns the temporary file and the id derived from the content's sha256.
+    The file is removed again if the upload is larger than `max_bytes`.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise ImageTooLargeError(f"Image is larger than {max_bytes} bytes")
+    directory = Path(settings.AVATAR_UPLOAD_DIR)
+    await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+    fd, name = await asyncio.to_thread(tempfile.mkstemp, dir=directory, suffix=".upload")
+    path = Path(name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ImageTooLargeError(f"Image is larger than {max_bytes} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(out.write, chunk)
+    except BaseException:
+        await asyncio.to_thread(path.unlink, missing_ok=True)
+        raise
+    return path, uuid.UUID(bytes=digest.digest()[:16])
+
+
+def _save(image: Image.Image, path: Path, tmp_dir: Path) -> None:
+    # concurrent uploads of the same image write the same bytes; replace atomically
+    tmp = tmp_dir / f"{path.name}.{uuid.uuid4().hex}.tmp"
+    image.save(tmp, format="PNG")
+    os.replace(tmp, path)
+
+
+# Runs inside the image pool's worker processes
+def _make_avatar(source: str, original: str, variants: dict[int, str], max_pixels: int) -> None:
+    # PNGs are written next to the upload and only moved into place once complete
+    tmp_dir = Path(source).parent
+    try:
+        with Image.open(source) as image:
+            if image.width * image.height > max_pixels:
+                raise ImageTooLargeError(f"Image is larger than {max_pixels} pixels")
+            image = ImageOps.exif_transpose(image)
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImageError(str(e)) from None
+    Path(original).parent.mkdir(parents=True, exist_ok=True)
+    _save(image, Path(original), tmp_dir)
+    for size, path in variants.items():
+        variant = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        _save(variant, Path(path), tmp_dir)
+
+
+async def store_avatar(file: UploadFile) -> uuid.UUID:
+    """
+    Store an uploaded avatar as PNG under an id derived from its content.
+
+    Identical uploads share one set of files and are only decoded once.
+    Decoding and resizing run in `image_pool`.
+    """
+    source, id = await spool_upload(file, settings.AVATAR_MAX_BYTES)
+    try:
+        if not await asyncio.to_thread(_is_stored, id):
+            variants = {size: str(avatar_path(id, size)) for size in settings.AVATAR_SIZES}
+            await image_pool.arun(
+                _make_avatar, str(source), str(avatar_path(id)), variants, settings.AVATAR_MAX_PIXELS
+            )
+    finally:
+        await asyncio.to_thread(source.unlink, missing_ok=True)
+    return id
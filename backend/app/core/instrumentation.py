@@ -0,0 +1,156 @@
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """
+    SQL statements run while handling one request.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}"
+        )
+
+
+# Shared by reference with the threadpool and greenlets that run the queries
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+    seconds = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+
+
+def _handle_error(context: Any) -> None:
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Count statements run on `engine` and their time towards the current request.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class _RouteStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest_query_seconds = 0.0
+        self.request_db_seconds = Histogram()
+
+
+class RouteMetrics:
+    """
+    Per-route request, query and DB time counters of this worker process.
+    """
+
+    def __init__(self) -> None:
+        self._routes: dict[tuple[str, str], _RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, stats: QueryStats) -> None:
+        with self._lock:
+            route_stats = self._routes.setdefault((method, route), _RouteStats())
+            route_stats.requests += 1
+            route_stats.queries += stats.count
+            route_stats.db_seconds += stats.seconds
+            route_stats.slowest_query_seconds = max(
+                route_stats.slowest_query_seconds, stats.slowest_seconds
+            )
+        route_stats.request_db_seconds.observe(stats.seconds)
+        if stats.slowest_seconds >= settings.SLOW_QUERY_SECONDS:
+            logger.warning(
+                "Slow query on %s %s (%.3fs): %s",
+                method,
+                route,
+                stats.slowest_seconds,
+                stats.slowest_statement,
+            )
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format.
+        """
+        with self._lock:
+            routes = sorted(self._routes.items())
+        lines = [
+            "# TYPE http_requests_total counter",
+            "# TYPE db_queries_total counter",
+            "# TYPE db_seconds_total counter",
+            "# TYPE db_slowest_query_seconds gauge",
+            "# TYPE http_request_db_seconds histogram",
+        ]
+        samples: dict[str, list[str]] = {line.split()[2]: [] for line in lines}
+        for (method, route), route_stats in routes:
+            labels = f'method="{method}",route="{route}"'
+            samples["http_requests_total"].append(f"http_requests_total{{{labels}}} {route_stats.requests}")
+            samples["db_queries_total"].append(f"db_queries_total{{{labels}}} {route_stats.queries}")
+            samples["db_seconds_total"].append(f"db_seconds_total{{{labels}}} {route_stats.db_seconds}")
+            samples["db_slowest_query_seconds"].append(
+                f"db_slowest_query_seconds{{{labels}}} {route_stats.slowest_query_seconds}"
+            )
+            histogram = route_stats.request_db_seconds.snapshot()
+            for bound, count in histogram["buckets"].items():
+                samples["http_request_db_seconds"].append(
+                    f'http_request_db_seconds_bucket{{{labels},le="{bound}"}} {count}'
+                )
+            samples["http_request_db_seconds"].append(f"http_request_db_seconds_sum{{{labels}}} {histogram['sum']}")
+            samples["http_request_db_seconds"].append(f"http_request_db_seconds_count{{{labels}}} {histogram['count']}")
+        output = []
+        for line in lines:
+            output.append(line)
+            output.extend(samples[line.split()[2]])
+        return "\n".join(output) + "\n"
+
+
+route_metrics = RouteMetrics()
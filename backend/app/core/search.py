@@ -0,0 +1,30 @@
+import re
+
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+
+_WORD = re.compile(r"\w+")
+
+_SET_SIMILARITY_THRESHOLD = text(
+    "SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"
+)
+
+
+def prefix_tsquery(q: str) -> str:
+    """
+    Text search query matching documents with a word starting with each word
+    of `q`: "ann sm" becomes "ann:* & sm:*".
+    """
+    return " & ".join(f"{word}:*" for word in _WORD.findall(q.lower()))
+
+
+async def set_similarity_threshold(session: AsyncSession) -> None:
+    """
+    Set how similar to a word `q <% column` requires `q` to be, for the
+    rest of the transaction.
+    """
+    await session.execute(
+        _SET_SIMILARITY_THRESHOLD, {"threshold": str(settings.SEARCH_SIMILARITY_THRESHOLD)}
+    )
@@ -5,23 +5,66 @@ import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.workers import BoundedProcessPool
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+def password_context(schemes: list[str]) -> CryptContext:
+    """
+    Context hashing with the first of `schemes` and verifying all of them;
+    hashes in the other schemes, or with other parameters, need an update.
+    """
+    options = {
+        "bcrypt__rounds": settings.PASSWORD_BCRYPT_ROUNDS,
+        "argon2__time_cost": settings.PASSWORD_ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.PASSWORD_ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.PASSWORD_ARGON2_PARALLELISM,
+    }
+    return CryptContext(
+        schemes=schemes,
+        deprecated="auto",
+        **{key: value for key, value in options.items() if key.split("__")[0] in schemes},
+    )
+
+
+pwd_context = password_context(settings.PASSWORD_HASH_SCHEMES)
+hashing_pool = BoundedProcessPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    busy_detail="Too many password checks in progress, try again",
+)
 
 
 ALGORITHM = "HS256"
 
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
+def create_access_token(subject: str | Any, expires_delta: timedelta, version: int = 0) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "sub": str(subject), "ver": version}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# Run inside the hashing pool's worker processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Check a password; also return a new hash when the stored one uses a
+    deprecated scheme or outdated parameters, else None. Callers logging
+    the user in store the new hash.
+    """
+    return hashing_pool.run(_verify_and_update, plain_password, hashed_password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await hashing_pool.arun(_verify_and_update, plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return hashing_pool.run(_hash, password)
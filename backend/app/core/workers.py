@@ -0,0 +1,103 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TypeVar
+
+from app.core.metrics import Counter, Histogram
+
+T = TypeVar("T")
+
+
+class ProcessPoolFullError(Exception):
+    """
+    Raised instead of queueing when `max_pending` calls are already in flight.
+
+    The message is the pool's `busy_detail`, shown to the client.
+    """
+
+
+class BoundedProcessPool:
+    """
+    Bounded process pool for CPU-bound work: password hashing, image resizing.
+
+    Keeps bcrypt/argon2 and Pillow off the request threads and the event
+    loop. At most `max_pending` calls are queued or running; further calls
+    fail fast with `ProcessPoolFullError`. With `workers=0` calls run in a
+    thread instead.
+    """
+
+    def __init__(
+        self, *, workers: int, max_pending: int, busy_detail: str = "Server busy, try again"
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.busy_detail = busy_detail
+        self.pending = 0
+        self.rejected = Counter()
+        self.seconds = Histogram()
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawned workers do not inherit the server's threads and sockets
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _acquire(self) -> float:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected.inc()
+                raise ProcessPoolFullError(self.busy_detail)
+            self.pending += 1
+        return time.perf_counter()
+
+    def _release(self, start: float) -> None:
+        with self._lock:
+            self.pending -= 1
+        self.seconds.observe(time.perf_counter() - start)
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        start = self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._release(start)
+            raise
+        future.add_done_callback(lambda _: self._release(start))
+        return future
+
+    def run(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self.workers:
+            start = self._acquire()
+            try:
+                return fn(*args)
+            finally:
+                self._release(start)
+        return self.submit(fn, *args).result()
+
+    async def arun(self, fn: Callable[..., T], *args: Any) -> T:
+        if not self.workers:
+            return await asyncio.to_thread(self.run, fn, *args)
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected.value,
+            "seconds": self.seconds.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
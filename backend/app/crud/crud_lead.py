@@ -1,10 +1,38 @@
 import uuid
 from typing import Any, Dict, Optional, Union
+from sqlalchemy import text
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.search import prefix_tsquery, set_similarity_threshold
 from app.crud.base import CRUDBase
+from app.crud.crud_sale import sale_crud
 from app.models.lead_model import Lead, LeadCreate, LeadUpdate
+from app.models.sale_model import Sale
+from app.models.search_model import LeadSearchHit
 from app.backend_pre_start import logger
 
+# The same expressions as the GIN indexes of the add_search_indexes migration
+_LEAD_DOCUMENT = (
+    "to_tsvector('simple', coalesce(lead.customer_name, '') || ' ' "
+    "|| coalesce(lead.customer_phone, '') || ' ' || coalesce(lead.customer_email, ''))"
+)
+_SEARCH_LEADS = text(f"""
+    SELECT lead.id, lead.business_id, lead.customer_name, lead.lead_source,
+        lead.customer_phone, lead.customer_email, lead.lead_status,
+        ts_rank({_LEAD_DOCUMENT}, to_tsquery('simple', :tsquery), 32) + greatest(
+            word_similarity(:q, lead.customer_name),
+            word_similarity(:q, lead.customer_phone),
+            word_similarity(:q, lead.customer_email)
+        ) AS rank
+    FROM lead
+    WHERE lead.business_id = :business_id AND (
+        {_LEAD_DOCUMENT} @@ to_tsquery('simple', :tsquery)
+        OR :q <% lead.customer_name OR :q <% lead.customer_phone OR :q <% lead.customer_email
+    )
+    ORDER BY rank DESC, lead.customer_name
+    LIMIT :limit
+""")
+
 
 class CRUDLead(CRUDBase[Lead, LeadCreate, LeadUpdate]):
     def create_lead(self, session: Session, lead_in: LeadCreate) -> Lead:
@@ -13,4 +41,26 @@ class CRUDLead(CRUDBase[Lead, LeadCreate, LeadUpdate]):
         session.commit()
         session.refresh(db_item)
         return db_item
+
+    def delete_lead(self, session: Session, db_lead: Lead) -> None:
+        """
+        Delete a lead and take its sales out of the rollups in one transaction.
+        """
+        sale_crud.delete_sales(session, Sale.lead_id == db_lead.id)
+        session.delete(db_lead)
+        session.commit()
+
+    async def asearch(
+        self, session: AsyncSession, business_id: uuid.UUID, q: str, limit: int
+    ) -> list[LeadSearchHit]:
+        """
+        Leads of the business whose name, phone or email has words starting
+        with those of `q`, or resembling it, best first.
+        """
+        await set_similarity_threshold(session)
+        params = {"business_id": business_id, "q": q, "tsquery": prefix_tsquery(q), "limit": limit}
+        rows = (await session.execute(_SEARCH_LEADS, params)).all()
+        return [LeadSearchHit(**row._mapping) for row in rows]
+
+
 lead_crud = CRUDLead(Lead)
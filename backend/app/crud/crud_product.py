@@ -1,10 +1,98 @@
 import uuid
+from collections.abc import Sequence
 from typing import Any, Dict, Optional, Union
+from sqlalchemy import text
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.search import prefix_tsquery, set_similarity_threshold
 from app.crud.base import CRUDBase
+from app.crud.crud_product_tag_facet import product_tag_facet_crud
+from app.crud.crud_stock_valuation import stock_valuation_crud
+from app.models.marketplace_model import MarketplaceListing
 from app.models.product_model import Product, ProductCreate, ProductUpdate
+from app.models.search_model import ProductSearchHit
 from app.backend_pre_start import logger
 
+# SKUs and group titles are not unique in the schema: writers creating them
+# serialise on a transaction lock per value, taken in a fixed order
+_LOCK_LISTINGS = text("""
+    SELECT pg_advisory_xact_lock(hashtext(kind), hashtext(value))
+    FROM (
+        SELECT DISTINCT 'product.sku' AS kind, sku AS value FROM unnest(CAST(:skus AS varchar[])) sku
+        UNION
+        SELECT DISTINCT 'productgroup.title', title FROM unnest(CAST(:categories AS varchar[])) title
+        ORDER BY 1, 2
+    ) v
+""")
+
+_CREATE_GROUPS = text("""
+    INSERT INTO productgroup (id, title, validated, created_at, updated_at)
+    SELECT gen_random_uuid(), c.title, false, timezone('utc', now()), timezone('utc', now())
+    FROM (SELECT DISTINCT title FROM unnest(CAST(:categories AS varchar[])) title) c
+    WHERE NOT EXISTS (SELECT 1 FROM productgroup g WHERE g.title = c.title)
+""")
+
+# The last listing wins when a SKU repeats. Existing products keep their
+# group, and are only written when their title, description or image change.
+_MERGE_LISTINGS = text("""
+    WITH src AS (
+        SELECT DISTINCT ON (s.sku) s.*, g.id AS product_group_id
+        FROM unnest(
+            CAST(:skus AS varchar[]), CAST(:titles AS varchar[]), CAST(:descriptions AS varchar[]),
+            CAST(:images AS varchar[]), CAST(:categories AS varchar[])
+        ) WITH ORDINALITY AS s (sku, title, description, image, category, n)
+        JOIN LATERAL (
+            SELECT id FROM productgroup WHERE productgroup.title = s.category ORDER BY created_at LIMIT 1
+        ) g ON true
+        ORDER BY s.sku, s.n DESC
+    ), updated AS (
+        UPDATE product p SET
+            title = src.title,
+            description = COALESCE(src.description, p.description),
+            image = COALESCE(src.image, p.image),
+            updated_at = timezone('utc', now())
+        FROM src
+        WHERE p.sku = src.sku AND (p.title, p.description, p.image) IS DISTINCT FROM
+            (src.title, COALESCE(src.description, p.description), COALESCE(src.image, p.image))
+        RETURNING p.sku
+    ), inserted AS (
+        INSERT INTO product (
+            id, title, description, sku, image, moderated, product_group_id, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), src.title, src.description, src.sku, src.image, false,
+            src.product_group_id, timezone('utc', now()), timezone('utc', now())
+        FROM src
+        WHERE NOT EXISTS (SELECT 1 FROM product p WHERE p.sku = src.sku)
+        RETURNING sku
+    )
+    SELECT (SELECT count(*) FROM inserted), (SELECT count(DISTINCT sku) FROM updated)
+""")
+
+# The same expressions as the GIN indexes of the add_search_indexes migration
+_PRODUCT_DOCUMENT = (
+    "to_tsvector('simple', coalesce(product.title, '') || ' ' "
+    "|| coalesce(product.description, '') || ' ' || coalesce(product.sku, ''))"
+)
+_SEARCH_PRODUCTS = text(f"""
+    SELECT product.id, product.product_group_id, product.title, product.description,
+        product.sku, product.image,
+        ts_rank({_PRODUCT_DOCUMENT}, to_tsquery('simple', :tsquery), 32) + greatest(
+            word_similarity(:q, product.title),
+            word_similarity(:q, product.description),
+            word_similarity(:q, product.sku)
+        ) AS rank
+    FROM product
+    WHERE (
+        {_PRODUCT_DOCUMENT} @@ to_tsquery('simple', :tsquery)
+        OR :q <% product.title OR :q <% product.description OR :q <% product.sku
+    ) AND EXISTS (
+        SELECT 1 FROM item WHERE item.business_id = :business_id AND item.product_id = product.id
+    )
+    ORDER BY rank DESC, product.title
+    LIMIT :limit
+""")
+
 
 class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
     def create_product(self, session: Session, product_in: ProductCreate, product_group_id: uuid.UUID) -> Product:
@@ -13,4 +101,57 @@ class CRUDProduct(CRUDBase[Product, ProductCreate, ProductUpdate]):
         session.commit()
         session.refresh(db_item)
         return db_item
+
+    def update_product(self, session: Session, db_product: Product, product_in: ProductUpdate) -> Product:
+        """
+        Update a product; moving it to another group moves its items' stock
+        valuation and its tag counts with it.
+        """
+        group_id = db_product.product_group_id
+        db_product.sqlmodel_update(product_in.model_dump(exclude_unset=True))
+        if db_product.product_group_id != group_id:
+            stock_valuation_crud.move_product(session, db_product.id, group_id, db_product.product_group_id)
+            product_tag_facet_crud.move_product(session, db_product.id, group_id, db_product.product_group_id)
+        session.add(db_product)
+        session.commit()
+        session.refresh(db_product)
+        return db_product
+
+    def delete_product(self, session: Session, db_product: Product) -> None:
+        product_tag_facet_crud.remove_product(session, db_product.id)
+        session.delete(db_product)
+        session.commit()
+
+    def upsert_by_sku(self, session: Session, listings: Sequence[MarketplaceListing]) -> tuple[int, int]:
+        """
+        Create the products of `listings` missing by SKU, in a product group
+        titled after their category, and update the others.
+
+        Runs in the caller's transaction; returns (created, updated).
+        """
+        params = {
+            "skus": [listing.sku for listing in listings],
+            "titles": [listing.title for listing in listings],
+            "descriptions": [listing.description for listing in listings],
+            "images": [listing.img for listing in listings],
+            "categories": [listing.category for listing in listings],
+        }
+        session.execute(_LOCK_LISTINGS, params).all()
+        session.execute(_CREATE_GROUPS, params)
+        created, updated = session.execute(_MERGE_LISTINGS, params).one()
+        return created, updated
+
+    async def asearch(
+        self, session: AsyncSession, business_id: uuid.UUID, q: str, limit: int
+    ) -> list[ProductSearchHit]:
+        """
+        Products the business has items of whose title, description or SKU
+        has words starting with those of `q`, or resembling it, best first.
+        """
+        await set_similarity_threshold(session)
+        params = {"business_id": business_id, "q": q, "tsquery": prefix_tsquery(q), "limit": limit}
+        rows = (await session.execute(_SEARCH_PRODUCTS, params)).all()
+        return [ProductSearchHit(**row._mapping) for row in rows]
+
+
 product_crud = CRUDProduct(Product)
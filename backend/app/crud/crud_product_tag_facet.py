@@ -0,0 +1,133 @@
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.product_tag_facet_model import ProductTagFacet, ProductTagFacetPublic
+from app.models.product_tag_model import ProductTag
+
+_UPSERT = """
+    ON CONFLICT (product_group_id, product_tag_id) DO UPDATE SET
+        products = producttagfacet.products + excluded.products
+"""
+
+# Counts `tag_ids` once more, or once less, in the group of the product
+_APPLY = text("""
+    INSERT INTO producttagfacet (product_group_id, product_tag_id, products)
+    SELECT p.product_group_id, t.id, :sign
+    FROM product p CROSS JOIN unnest(CAST(:tag_ids AS uuid[])) AS t (id)
+    WHERE p.id = :product_id
+""" + _UPSERT)
+
+# Counts newly created links, any number of products and tags at once
+_APPLY_LINKS = text("""
+    INSERT INTO producttagfacet (product_group_id, product_tag_id, products)
+    SELECT p.product_group_id, l.product_tag_id, count(*)
+    FROM unnest(CAST(:product_ids AS uuid[]), CAST(:tag_ids AS uuid[])) AS l (product_id, product_tag_id)
+    JOIN product p ON p.id = l.product_id
+    GROUP BY p.product_group_id, l.product_tag_id
+    ORDER BY p.product_group_id, l.product_tag_id
+""" + _UPSERT)
+
+# Uncounts the product's tags in its group, before it is deleted
+_REMOVE_PRODUCT = text("""
+    INSERT INTO producttagfacet (product_group_id, product_tag_id, products)
+    SELECT p.product_group_id, l.product_tag_id, -1
+    FROM producttaglink l JOIN product p ON p.id = l.product_id
+    WHERE l.product_id = :product_id
+""" + _UPSERT)
+
+_MOVE_PRODUCT = text("""
+    INSERT INTO producttagfacet (product_group_id, product_tag_id, products)
+    SELECT g.product_group_id, l.product_tag_id, g.sign
+    FROM producttaglink l
+    CROSS JOIN (
+        VALUES (CAST(:old_group_id AS uuid), -1), (CAST(:new_group_id AS uuid), 1)
+    ) AS g (product_group_id, sign)
+    WHERE l.product_id = :product_id
+""" + _UPSERT)
+
+# Tags of the products of a group having all selected tags, walking only the
+# products linked to the rarest selected tag
+_NARROWED = text("""
+    SELECT l.product_tag_id, t.title, count(*) AS products
+    FROM producttaglink d
+    JOIN product p ON p.id = d.product_id
+    JOIN producttaglink l ON l.product_id = d.product_id
+    JOIN producttag t ON t.id = l.product_tag_id
+    WHERE d.product_tag_id = :rarest_tag_id
+        AND p.product_group_id = :product_group_id
+        AND (
+            SELECT count(*) FROM producttaglink s
+            WHERE s.product_id = d.product_id AND s.product_tag_id = ANY(CAST(:other_tag_ids AS uuid[]))
+        ) = :others
+    GROUP BY l.product_tag_id, t.title
+    ORDER BY products DESC, t.title
+""")
+
+
+class CRUDProductTagFacet(CRUDBase[ProductTagFacet, ProductTagFacet, ProductTagFacet]):
+    def apply(self, session: Session, product_id: uuid.UUID, tag_ids: Sequence[uuid.UUID], sign: int) -> None:
+        """
+        Count the product under `tag_ids` in its group, or stop counting it
+        with `sign=-1`. Runs in the caller's transaction.
+        """
+        if tag_ids:
+            session.execute(_APPLY, {"product_id": product_id, "tag_ids": list(tag_ids), "sign": sign})
+
+    def apply_links(self, session: Session, links: Sequence[tuple[uuid.UUID, uuid.UUID]]) -> None:
+        """
+        Count each (product_id, product_tag_id) link in the product's group.
+        Runs in the caller's transaction.
+        """
+        if links:
+            product_ids, tag_ids = zip(*links)
+            session.execute(_APPLY_LINKS, {"product_ids": list(product_ids), "tag_ids": list(tag_ids)})
+
+    def remove_product(self, session: Session, product_id: uuid.UUID) -> None:
+        session.execute(_REMOVE_PRODUCT, {"product_id": product_id})
+
+    def move_product(
+        self, session: Session, product_id: uuid.UUID, old_group_id: uuid.UUID, new_group_id: uuid.UUID
+    ) -> None:
+        session.execute(
+            _MOVE_PRODUCT,
+            {"product_id": product_id, "old_group_id": old_group_id, "new_group_id": new_group_id},
+        )
+
+    async def aread_facets(
+        self, session: AsyncSession, product_group_id: uuid.UUID, selected: Sequence[uuid.UUID]
+    ) -> list[ProductTagFacetPublic]:
+        """
+        Products per tag in the group, among those having every `selected` tag.
+        """
+        counts = select(ProductTagFacet.product_tag_id, ProductTag.title, ProductTagFacet.products).join(
+            ProductTag, ProductTag.id == ProductTagFacet.product_tag_id
+        )
+        counts = counts.where(ProductTagFacet.product_group_id == product_group_id, ProductTagFacet.products > 0)
+        if selected:
+            selected_counts = (
+                await session.exec(counts.where(ProductTagFacet.product_tag_id.in_(selected)))
+            ).all()
+            if len(selected_counts) < len(set(selected)):
+                return []
+            rarest = min(selected_counts, key=lambda row: row.products).product_tag_id
+            others = [tag_id for tag_id in set(selected) if tag_id != rarest]
+            params = {
+                "product_group_id": product_group_id,
+                "rarest_tag_id": rarest,
+                "other_tag_ids": others,
+                "others": len(others),
+            }
+            rows = (await session.execute(_NARROWED, params)).all()
+        else:
+            rows = (
+                await session.exec(counts.order_by(ProductTagFacet.products.desc(), ProductTag.title))
+            ).all()
+        return [ProductTagFacetPublic(**row._mapping) for row in rows]
+
+
+product_tag_facet_crud = CRUDProductTagFacet(ProductTagFacet)
@@ -1,9 +1,44 @@
+import uuid
+from collections.abc import Sequence
+
+from sqlalchemy import text
 from sqlmodel import Session, select
+from app.crud.crud_product_tag_facet import product_tag_facet_crud
 from app.models.product_tag_link_model import ProductTagLink
 from fastapi.encoders import jsonable_encoder
 
+# Links every tag to every product; pairs already linked are skipped, and
+# rows are locked in key order so overlapping bulk requests cannot deadlock
+_LINK_ALL = text("""
+    INSERT INTO producttaglink (product_id, product_tag_id)
+    SELECT p.id, t.id
+    FROM unnest(CAST(:product_ids AS uuid[])) AS p (id)
+    CROSS JOIN unnest(CAST(:tag_ids AS uuid[])) AS t (id)
+    ORDER BY p.id, t.id
+    ON CONFLICT DO NOTHING
+    RETURNING product_id, product_tag_id
+""")
+
 def create_product_tag_link(session: Session, product_tag_link_in: ProductTagLink) -> ProductTagLink:
     session.add(product_tag_link_in)
+    product_tag_facet_crud.apply(
+        session, product_tag_link_in.product_id, [product_tag_link_in.product_tag_id], sign=1
+    )
     session.commit()
     session.refresh(product_tag_link_in)
     return product_tag_link_in
+
+def create_product_tag_links(
+    session: Session, product_ids: Sequence[uuid.UUID], product_tag_ids: Sequence[uuid.UUID]
+) -> set[tuple[uuid.UUID, uuid.UUID]]:
+    """
+    Link every tag to every product in one statement, returning the
+    (product_id, product_tag_id) pairs that were not linked before.
+    """
+    if not product_ids or not product_tag_ids:
+        return set()
+    params = {"product_ids": list(product_ids), "tag_ids": list(product_tag_ids)}
+    created = [(row.product_id, row.product_tag_id) for row in session.execute(_LINK_ALL, params)]
+    product_tag_facet_crud.apply_links(session, created)
+    session.commit()
+    return set(created)
@@ -1,16 +1,313 @@
+import asyncio
+import time
 import uuid
+from datetime import date, timedelta
 from typing import Any, Dict, Optional, Union
-from sqlmodel import Session, select
+import numpy as np
+from sqlalchemy import ColumnElement, delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.forecast import METHODS, forecast_cache, forecast_demand
+from app.core.metrics import Counter, Histogram
 from app.crud.base import CRUDBase
+from app.crud.crud_stock_valuation import stock_valuation_crud
+from app.models.item_model import Item
 from app.models.sale_model import Sale, SaleCreate, SaleUpdate
+from app.models.sales_forecast_model import ForecastMethod, ItemForecast, SalesForecastPublic
+from app.models.sales_rollup_model import (
+    Granularity,
+    GroupBy,
+    SalesAnalyticsRow,
+    SalesDaily,
+    SalesMonthly,
+    SalesVersion,
+)
 from app.backend_pre_start import logger
 
 
+class StockMetrics:
+    """
+    How sales compete for stock: a lost race is a sale rejected although
+    the item had enough stock when the request read it.
+    """
+
+    def __init__(self) -> None:
+        self.attempts = Counter()
+        self.sold = Counter()
+        self.out_of_stock = Counter()
+        self.lost_races = Counter()
+        # includes waiting for the row lock held by concurrent sales
+        self.decrement_seconds = Histogram()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "attempts": self.attempts.value,
+            "sold": self.sold.value,
+            "out_of_stock": self.out_of_stock.value,
+            "lost_races": self.lost_races.value,
+            "decrement_seconds": self.decrement_seconds.snapshot(),
+        }
+
+
+stock_metrics = StockMetrics()
+
+ROLLUP_TOTALS = ("sales", "units", "revenue", "discount", "cost")
+
+
+def rollup_totals(sale: Sale, sign: int = 1) -> dict[str, Any]:
+    """
+    What `sale` adds to its rollup rows, or takes away with `sign=-1`.
+    """
+    units = sale.quantity_of_items
+    return {
+        "sales": sign,
+        "units": sign * units,
+        "revenue": sign * sale.sum_of_sale,
+        "discount": sign * units * sale.price_per_item * sale.discount,
+        "cost": sign * units * (sale.cost_price_per_item or 0.0),
+    }
+
+
 class CRUDSale(CRUDBase[Sale, SaleCreate, SaleUpdate]):
-    def create_sale(self, session: Session, sale_in: SaleCreate) -> Sale:
-        db_item = Sale.model_validate(sale_in)
-        session.add(db_item)
+    def _rollup(self, session: Session, day: date, item: Item, totals: dict[str, Any]) -> None:
+        # additive upserts: concurrent sales of one item and day serialise on its row
+        for model, period in ((SalesDaily, day), (SalesMonthly, day.replace(day=1))):
+            statement = insert(model).values(
+                business_id=item.business_id,
+                period=period,
+                item_id=item.id,
+                product_id=item.product_id,
+                **totals,
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=["business_id", "period", "item_id"],
+                set_={key: getattr(model, key) + statement.excluded[key] for key in totals},
+            )
+            session.execute(statement)
+
+    def _bump_version(self, session: Session, business_id: uuid.UUID) -> None:
+        # the row stays locked until commit, issue it last
+        statement = insert(SalesVersion).values(business_id=business_id, version=1)
+        statement = statement.on_conflict_do_update(
+            index_elements=["business_id"], set_={"version": SalesVersion.version + 1}
+        )
+        session.execute(statement)
+
+    def _take_stock(self, session: Session, item: Item, quantity: int) -> Any | None:
+        """
+        Take `quantity` units off `item`, or put them back when negative, and
+        move its stock valuation at the prices the UPDATE saw.
+
+        The conditional UPDATE never takes the stock below zero; returns None,
+        with nothing written, when there is not enough.
+        """
+        statement = (
+            update(Item)
+            .where(Item.id == item.id, Item.quantity >= quantity)
+            .values(quantity=Item.quantity - quantity)
+            .returning(Item.price, Item.cost_price)
+        )
+        start = time.perf_counter()
+        taken = session.execute(statement).one_or_none()
+        stock_metrics.decrement_seconds.observe(time.perf_counter() - start)
+        if taken is not None:
+            stock_valuation_crud.apply(session, item.business_id, item.product_id, {
+                "items": 0,
+                "units": -quantity,
+                "cost_value": -quantity * (taken.cost_price or 0.0),
+                "retail_value": -quantity * (taken.price or 0.0),
+            })
+        return taken
+
+    def update_sale(self, session: Session, db_sale: Sale, sale_in: SaleUpdate) -> Sale | None:
+        """
+        Update a sale and move its contribution to the rollups in one transaction.
+
+        A changed quantity is taken off or put back on the item's stock like a
+        sale; returns None, with nothing written, when there is not enough.
+        """
+        item = session.get(Item, db_sale.item_id)
+        before = rollup_totals(db_sale, sign=-1)
+        sold_before = db_sale.quantity_of_items
+        db_sale.sqlmodel_update(sale_in.model_dump(exclude_unset=True))
+        change = db_sale.quantity_of_items - sold_before
+        if change and self._take_stock(session, item, change) is None:
+            session.rollback()
+            return None
+        totals = {key: value + before[key] for key, value in rollup_totals(db_sale).items()}
+        session.add(db_sale)
+        self._rollup(session, db_sale.created_at.date(), item, totals)
+        self._bump_version(session, item.business_id)
         session.commit()
-        session.refresh(db_item)
-        return db_item
-sale_crud = CRUDSale(Sale)
\ No newline at end of file
+        session.refresh(db_sale)
+        return db_sale
+
+    def delete_sale(self, session: Session, db_sale: Sale) -> None:
+        item = session.get(Item, db_sale.item_id)
+        self._rollup(session, db_sale.created_at.date(), item, rollup_totals(db_sale, sign=-1))
+        session.delete(db_sale)
+        self._bump_version(session, item.business_id)
+        session.commit()
+
+    def delete_sales(self, session: Session, *where: ColumnElement[bool]) -> None:
+        """
+        Delete the sales matching `where` and take them out of the rollups.
+
+        Sales also go by cascade with their lead or item, which would leave
+        them counted in the rollups, so those deletes call this first. Runs
+        in the caller's transaction.
+        """
+        sales = session.scalars(delete(Sale).where(*where).returning(Sale)).all()
+        if not sales:
+            return
+        items = session.exec(select(Item).where(Item.id.in_({sale.item_id for sale in sales}))).all()
+        items_by_id = {item.id: item for item in items}
+        # one upsert per item and day rather than per sale
+        totals: dict[tuple[uuid.UUID, date], dict[str, Any]] = {}
+        for sale in sales:
+            current = totals.setdefault((sale.item_id, sale.created_at.date()), dict.fromkeys(ROLLUP_TOTALS, 0))
+            for key, value in rollup_totals(sale, sign=-1).items():
+                current[key] += value
+        for (item_id, day), item_totals in totals.items():
+            self._rollup(session, day, items_by_id[item_id], item_totals)
+        for business_id in {item.business_id for item in items}:
+            self._bump_version(session, business_id)
+
+    def sell_item(self, session: Session, sale_in: SaleCreate, item: Item) -> Sale | None:
+        """
+        Take the sold quantity off `item` and record the sale in one transaction.
+
+        The decrement is a conditional UPDATE, so concurrent sales of the same
+        item serialise on its row and can never oversell. The sales rollups,
+        the stock valuation and the sales version are updated in the same
+        transaction. Returns None, with nothing written, when there is not
+        enough stock.
+        """
+        quantity = sale_in.quantity_of_items
+        quantity_read = item.quantity
+        stock_metrics.attempts.inc()
+        sold = self._take_stock(session, item, quantity)
+        if sold is None:
+            session.rollback()
+            stock_metrics.out_of_stock.inc()
+            if quantity_read is not None and quantity_read >= quantity:
+                stock_metrics.lost_races.inc()
+            return None
+        try:
+            # costed at the price the decrement saw, not the one read earlier
+            db_sale = Sale.model_validate(sale_in, update={"cost_price_per_item": sold.cost_price})
+            session.add(db_sale)
+            self._rollup(session, db_sale.created_at.date(), item, rollup_totals(db_sale))
+            self._bump_version(session, item.business_id)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        stock_metrics.sold.inc()
+        session.refresh(db_sale)
+        return db_sale
+
+
+    async def aread_analytics(
+        self,
+        session: AsyncSession,
+        *,
+        business_id: uuid.UUID,
+        granularity: Granularity,
+        group_by: GroupBy,
+        start: date,
+        end: date,
+    ) -> list[SalesAnalyticsRow]:
+        """
+        Sales totals per period from the rollups of `granularity`, per
+        product or item when grouped so.
+        """
+        model = SalesDaily if granularity == "day" else SalesMonthly
+        keys = [model.period]
+        if group_by in ("product", "item"):
+            keys.append(model.product_id)
+        if group_by == "item":
+            keys.append(model.item_id)
+        totals = [func.sum(getattr(model, key)).label(key) for key in ROLLUP_TOTALS]
+        statement = (
+            select(*keys, *totals)
+            .where(model.business_id == business_id, model.period.between(start, end))
+            .group_by(*keys)
+            # periods whose sales were all deleted
+            .having(func.sum(model.sales) != 0)
+            .order_by(*keys)
+        )
+        rows = (await session.exec(statement)).all()
+        return [
+            SalesAnalyticsRow(**row._mapping, margin=row.revenue - row.cost) for row in rows
+        ]
+
+    async def aread_sales_version(self, session: AsyncSession, business_id: uuid.UUID) -> int:
+        """
+        Changes whenever a sale of the business is created, updated or deleted.
+        """
+        statement = select(SalesVersion.version).where(SalesVersion.business_id == business_id)
+        return (await session.exec(statement)).first() or 0
+
+    async def aread_forecast(
+        self,
+        session: AsyncSession,
+        *,
+        business_id: uuid.UUID,
+        start: date,
+        horizon: int,
+        history_days: int,
+        method: ForecastMethod | None = None,
+    ) -> SalesForecastPublic:
+        """
+        Forecast the daily units of every item of the business sold in the
+        `history_days` before `start`, from the daily rollups.
+
+        Cached until a sale of the business changes.
+        """
+        key = (business_id, start, horizon, history_days, method)
+        version = await self.aread_sales_version(session, business_id)
+        cached = forecast_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        first_day = start - timedelta(days=history_days)
+        # rows arrive numbered by item and day, ready to scatter into an items x days array
+        statement = (
+            select(
+                SalesDaily.item_id,
+                SalesDaily.product_id,
+                (func.dense_rank().over(order_by=SalesDaily.item_id) - 1).label("row"),
+                (SalesDaily.period - first_day).label("day"),
+                SalesDaily.units,
+            )
+            .where(SalesDaily.business_id == business_id, SalesDaily.period.between(first_day, start - timedelta(days=1)))
+            .order_by(SalesDaily.item_id)
+        )
+        rows = (await session.exec(statement)).all()
+        result = SalesForecastPublic(start=start, horizon=horizon, history_days=history_days, data=[])
+        if rows:
+            item_ids, product_ids, row, day, units = zip(*rows)
+            history = np.zeros((row[-1] + 1, history_days))
+            history[np.array(row), np.array(day)] = units
+            forecast = await asyncio.to_thread(forecast_demand, history, horizon, method)
+            firsts = np.flatnonzero(np.diff(np.array(row), prepend=-1))
+            result.data = [
+                ItemForecast(
+                    item_id=item_ids[first],
+                    product_id=product_ids[first],
+                    method=METHODS[chosen],
+                    error=errors[chosen],
+                    units=sum(daily),
+                    daily=daily,
+                )
+                for first, chosen, errors, daily in zip(
+                    firsts.tolist(), forecast.method.tolist(), forecast.errors.tolist(), forecast.units.tolist()
+                )
+            ]
+        forecast_cache.set(key, (version, result))
+        return result
+
+
+sale_crud = CRUDSale(Sale)
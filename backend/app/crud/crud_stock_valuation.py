@@ -0,0 +1,167 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Uuid, literal, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.models.item_model import Item
+from app.models.product_model import Product
+from app.models.stock_valuation_model import (
+    StockValuation,
+    StockValuationBase,
+    StockValuationGroup,
+    StockValuationPoint,
+    StockValuationPublic,
+    StockValuationSnapshot,
+)
+
+VALUATION_TOTALS = ("items", "units", "cost_value", "retail_value")
+
+# Moves the items of a product from one group's totals to another's, for
+# every business holding them
+_MOVE_PRODUCT = text("""
+    INSERT INTO stockvaluation (
+        business_id, product_group_id, items, units, cost_value, retail_value, updated_at
+    )
+    SELECT
+        i.business_id, g.product_group_id,
+        g.sign * count(*),
+        g.sign * sum(coalesce(i.quantity, 0)),
+        g.sign * sum(coalesce(i.quantity, 0) * coalesce(i.cost_price, 0)),
+        g.sign * sum(coalesce(i.quantity, 0) * coalesce(i.price, 0)),
+        timezone('utc', now())
+    FROM item i
+    CROSS JOIN (
+        VALUES (CAST(:old_group_id AS uuid), -1), (CAST(:new_group_id AS uuid), 1)
+    ) AS g (product_group_id, sign)
+    WHERE i.product_id = :product_id
+    GROUP BY i.business_id, g.product_group_id, g.sign
+    ON CONFLICT (business_id, product_group_id) DO UPDATE SET
+        items = stockvaluation.items + excluded.items,
+        units = stockvaluation.units + excluded.units,
+        cost_value = stockvaluation.cost_value + excluded.cost_value,
+        retail_value = stockvaluation.retail_value + excluded.retail_value,
+        updated_at = excluded.updated_at
+""")
+
+# Idempotent per day, so the job can run more often than daily
+_SNAPSHOT = text("""
+    INSERT INTO stockvaluationsnapshot (
+        business_id, taken_on, product_group_id, items, units, cost_value, retail_value
+    )
+    SELECT business_id, :taken_on, product_group_id, items, units, cost_value, retail_value
+    FROM stockvaluation
+    ON CONFLICT (business_id, taken_on, product_group_id) DO UPDATE SET
+        items = excluded.items,
+        units = excluded.units,
+        cost_value = excluded.cost_value,
+        retail_value = excluded.retail_value
+""")
+
+
+def stock_totals(
+    quantity: int | None, cost_price: float | None, price: float | None, sign: int = 1
+) -> dict[str, Any]:
+    """
+    What an item holding `quantity` units adds to its product group's
+    totals, or takes away with `sign=-1`.
+    """
+    units = quantity or 0
+    return {
+        "items": sign,
+        "units": sign * units,
+        "cost_value": sign * units * (cost_price or 0.0),
+        "retail_value": sign * units * (price or 0.0),
+    }
+
+
+def item_valuation(item: Item, sign: int = 1) -> dict[str, Any]:
+    return stock_totals(item.quantity, item.cost_price, item.price, sign)
+
+
+class CRUDStockValuation(CRUDBase[StockValuation, StockValuationBase, StockValuationBase]):
+    def apply(
+        self, session: Session, business_id: uuid.UUID, product_id: uuid.UUID, totals: dict[str, Any]
+    ) -> None:
+        """
+        Add `totals` to the business's valuation of the group of `product_id`.
+
+        Runs in the caller's transaction, which commits it with the change.
+        """
+        if not any(totals.values()):
+            return
+        source = select(
+            literal(business_id, Uuid),
+            Product.product_group_id,
+            *(literal(totals[key]) for key in VALUATION_TOTALS),
+            func.timezone("utc", func.now()),
+        ).where(Product.id == product_id)
+        statement = insert(StockValuation).from_select(
+            ["business_id", "product_group_id", *VALUATION_TOTALS, "updated_at"], source
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["business_id", "product_group_id"],
+            set_={
+                **{key: getattr(StockValuation, key) + statement.excluded[key] for key in VALUATION_TOTALS},
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        session.execute(statement)
+
+    def move_product(
+        self, session: Session, product_id: uuid.UUID, old_group_id: uuid.UUID, new_group_id: uuid.UUID
+    ) -> None:
+        session.execute(
+            _MOVE_PRODUCT,
+            {"product_id": product_id, "old_group_id": old_group_id, "new_group_id": new_group_id},
+        )
+
+    def take_snapshot(self, session: Session, taken_on: date) -> int:
+        """
+        Copy every business's current valuation into the history of `taken_on`.
+        """
+        rows = session.execute(_SNAPSHOT, {"taken_on": taken_on}).rowcount
+        session.commit()
+        return rows
+
+    async def aread(self, session: AsyncSession, business_id: uuid.UUID) -> StockValuationPublic:
+        statement = (
+            select(StockValuation)
+            .where(StockValuation.business_id == business_id)
+            .order_by(StockValuation.product_group_id)
+        )
+        rows = (await session.exec(statement)).all()
+        groups = [StockValuationGroup.model_validate(row) for row in rows]
+        return StockValuationPublic(
+            business_id=business_id,
+            groups=groups,
+            **{key: sum(getattr(group, key) for group in groups) for key in VALUATION_TOTALS},
+        )
+
+    async def aread_history(
+        self,
+        session: AsyncSession,
+        *,
+        business_id: uuid.UUID,
+        start: date,
+        end: date,
+        product_group_id: uuid.UUID | None = None,
+    ) -> list[StockValuationPoint]:
+        model = StockValuationSnapshot
+        statement = (
+            select(model.taken_on, *(func.sum(getattr(model, key)).label(key) for key in VALUATION_TOTALS))
+            .where(model.business_id == business_id, model.taken_on.between(start, end))
+            .group_by(model.taken_on)
+            .order_by(model.taken_on)
+        )
+        if product_group_id is not None:
+            statement = statement.where(model.product_group_id == product_group_id)
+        rows = (await session.exec(statement)).all()
+        return [StockValuationPoint(**row._mapping) for row in rows]
+
+
+stock_valuation_crud = CRUDStockValuation(StockValuation)
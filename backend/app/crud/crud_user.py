@@ -1,7 +1,8 @@
 import uuid
 from typing import Any, Dict, Optional, Union
 from sqlmodel import Session, select
-from app.core.security import get_password_hash, verify_password
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.security import averify_password, get_password_hash, verify_password
 from app.crud.base import CRUDBase
 from app.models.user_model import User, UserCreate, UserUpdate
 from app.backend_pre_start import logger
@@ -21,6 +22,13 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         session.refresh(db_obj)
         return db_obj
 
+    def set_password(self, db_user: User, password: str) -> None:
+        """
+        Hash a new password and revoke the tokens issued with the old one.
+        """
+        db_user.hashed_password = get_password_hash(password)
+        db_user.token_version += 1
+
     def update_user(self, session: Session, db_user: User, user_in: UserUpdate) -> Any:
         user_data = user_in.model_dump(exclude_unset=True)
         extra_data = {}
@@ -28,6 +36,8 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             password = user_data["password"]
             hashed_password = get_password_hash(password)
             extra_data["hashed_password"] = hashed_password
+        if "password" in user_data or user_data.get("is_active") is False:
+            extra_data["token_version"] = db_user.token_version + 1
         db_user.sqlmodel_update(user_data, update=extra_data)
         session.add(db_user)
         session.commit()
@@ -43,7 +53,28 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db_user = self.get_user_by_email(session=session, email=email)
         if not db_user:
             return None
-        if not verify_password(password, db_user.hashed_password):
+        verified, new_hash = verify_password(password, db_user.hashed_password)
+        if not verified:
+            return None
+        if new_hash:
+            # stored with an outdated scheme or parameters, upgrade it now
+            db_user.hashed_password = new_hash
+            session.add(db_user)
+            session.commit()
+            session.refresh(db_user)
+        return db_user
+
+    async def aauthenticate(self, session: AsyncSession, email: str, password: str) -> User | None:
+        db_user = (await session.exec(select(User).where(User.email == email))).first()
+        if not db_user:
+            return None
+        verified, new_hash = await averify_password(password, db_user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            db_user.hashed_password = new_hash
+            session.add(db_user)
+            await session.commit()
+            await session.refresh(db_user)
         return db_user
 user_crud = CRUDUser(User)
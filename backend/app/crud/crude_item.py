@@ -1,17 +1,232 @@
 import uuid
+from collections.abc import Iterable
 from typing import Any, Dict, Optional, Union
+from pydantic import ValidationError
+from sqlalchemy import delete, text, update
 from sqlmodel import Session, select
+from app.core.config import settings
 from app.core.security import get_password_hash, verify_password
 from app.crud.base import CRUDBase
-from app.models.item_model import Item, ItemCreate, ItemUpdate
+from app.crud.crud_sale import sale_crud
+from app.crud.crud_stock_valuation import item_valuation, stock_totals, stock_valuation_crud
+from app.models.sale_model import Sale
+from app.models.item_model import Item, ItemCreate, ItemImport, ItemImportError, ItemImportReport, ItemUpdate
 from app.backend_pre_start import logger
 
+_IMPORT_COLUMNS = ("sku", "title", "description", "price", "cost_price", "quantity", "supplier", "img")
+
+_CREATE_STAGING = text("""
+    CREATE TEMP TABLE item_import (
+        row_number integer NOT NULL,
+        sku varchar(255) NOT NULL,
+        title varchar(255) NOT NULL,
+        description varchar(255),
+        price double precision,
+        cost_price double precision,
+        quantity integer,
+        supplier varchar(255),
+        img varchar(255)
+    ) ON COMMIT DROP
+""")
+
+_UNKNOWN_SKUS = """
+    FROM item_import s
+    WHERE NOT EXISTS (SELECT 1 FROM product p WHERE p.sku = s.sku)
+"""
+_COUNT_UNKNOWN_SKUS = text("SELECT count(*)" + _UNKNOWN_SKUS)
+_LIST_UNKNOWN_SKUS = text("SELECT s.row_number, s.sku" + _UNKNOWN_SKUS + "ORDER BY s.row_number LIMIT :limit")
+
+# The last row wins when a SKU repeats in the file. Optional columns left
+# empty keep the current value of an existing item. Existing items are
+# locked first so the stock valuation deltas start from their latest values.
+_MERGE_STAGING = text("""
+    WITH src AS (
+        SELECT DISTINCT ON (s.sku) s.*, p.id AS product_id
+        FROM item_import s
+        JOIN LATERAL (
+            SELECT id FROM product WHERE product.sku = s.sku ORDER BY created_at LIMIT 1
+        ) p ON true
+        ORDER BY s.sku, s.row_number DESC
+    ), locked AS (
+        SELECT i.id, i.quantity, i.cost_price, i.price
+        FROM item i
+        WHERE i.business_id = :business_id AND i.product_id IN (SELECT product_id FROM src)
+        FOR UPDATE
+    ), updated AS (
+        UPDATE item i SET
+            title = src.title,
+            description = COALESCE(src.description, i.description),
+            price = COALESCE(src.price, i.price),
+            cost_price = COALESCE(src.cost_price, i.cost_price),
+            quantity = COALESCE(src.quantity, i.quantity),
+            supplier = COALESCE(src.supplier, i.supplier),
+            img = COALESCE(src.img, i.img),
+            updated_at = timezone('utc', now())
+        FROM src, locked old
+        WHERE old.id = i.id AND i.product_id = src.product_id
+        RETURNING
+            i.product_id, i.quantity, i.cost_price, i.price,
+            old.quantity AS old_quantity, old.cost_price AS old_cost_price, old.price AS old_price
+    ), inserted AS (
+        INSERT INTO item (
+            id, title, description, price, cost_price, quantity, supplier, img,
+            business_id, product_id, created_at, updated_at
+        )
+        SELECT
+            gen_random_uuid(), src.title, src.description, src.price, src.cost_price,
+            src.quantity, src.supplier, src.img, :business_id, src.product_id,
+            timezone('utc', now()), timezone('utc', now())
+        FROM src
+        WHERE NOT EXISTS (
+            SELECT 1 FROM item i WHERE i.business_id = :business_id AND i.product_id = src.product_id
+        )
+        RETURNING product_id, quantity, cost_price, price
+    ), valued AS (
+        INSERT INTO stockvaluation (
+            business_id, product_group_id, items, units, cost_value, retail_value, updated_at
+        )
+        SELECT
+            :business_id, p.product_group_id, sum(d.items), sum(d.units),
+            sum(d.cost_value), sum(d.retail_value), timezone('utc', now())
+        FROM (
+            SELECT
+                product_id, 0 AS items,
+                coalesce(quantity, 0) - coalesce(old_quantity, 0) AS units,
+                coalesce(quantity, 0) * coalesce(cost_price, 0)
+                    - coalesce(old_quantity, 0) * coalesce(old_cost_price, 0) AS cost_value,
+                coalesce(quantity, 0) * coalesce(price, 0)
+                    - coalesce(old_quantity, 0) * coalesce(old_price, 0) AS retail_value
+            FROM updated
+            UNION ALL
+            SELECT
+                product_id, 1, coalesce(quantity, 0),
+                coalesce(quantity, 0) * coalesce(cost_price, 0),
+                coalesce(quantity, 0) * coalesce(price, 0)
+            FROM inserted
+        ) d
+        JOIN product p ON p.id = d.product_id
+        GROUP BY p.product_group_id
+        ON CONFLICT (business_id, product_group_id) DO UPDATE SET
+            items = stockvaluation.items + excluded.items,
+            units = stockvaluation.units + excluded.units,
+            cost_value = stockvaluation.cost_value + excluded.cost_value,
+            retail_value = stockvaluation.retail_value + excluded.retail_value,
+            updated_at = excluded.updated_at
+    )
+    SELECT (SELECT count(DISTINCT product_id) FROM updated), (SELECT count(*) FROM inserted)
+""")
+
+
+def _add_error(report: ItemImportReport, row: int, sku: Any, detail: str) -> None:
+    report.failed += 1
+    if len(report.errors) < settings.ITEM_IMPORT_MAX_ERRORS:
+        report.errors.append(ItemImportError(row=row, sku=sku if isinstance(sku, str) else None, detail=detail))
+
 
 class CRUDItem(CRUDBase[Item, ItemCreate, ItemUpdate]):
     def create_item(self, session: Session, item_in: ItemCreate, business_id: uuid.UUID, product_id: uuid.UUID) -> Item:
         db_item = Item.model_validate(item_in, update={"business_id": business_id, "product_id": product_id})
         session.add(db_item)
+        stock_valuation_crud.apply(session, business_id, product_id, item_valuation(db_item))
+        session.commit()
+        session.refresh(db_item)
+        return db_item
+
+    def update_item(self, session: Session, db_item: Item, item_in: ItemUpdate) -> Item:
+        """
+        Update an item and move its stock valuation in the same transaction.
+
+        The row is locked and the delta taken from the values the UPDATE
+        replaced, so sales committed since `db_item` was read are kept.
+        """
+        values = item_in.model_dump(exclude_unset=True)
+        if not values:
+            return db_item
+        old = (
+            select(Item.id, Item.product_id, Item.quantity, Item.cost_price, Item.price)
+            .where(Item.id == db_item.id)
+            .with_for_update()
+            .cte("old")
+        )
+        statement = (
+            update(Item)
+            .where(Item.id == old.c.id)
+            .values(**values)
+            .returning(
+                Item.business_id, Item.product_id, Item.quantity, Item.cost_price, Item.price,
+                old.c.product_id.label("old_product_id"),
+                old.c.quantity.label("old_quantity"),
+                old.c.cost_price.label("old_cost_price"),
+                old.c.price.label("old_price"),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = session.execute(statement).one()
+        before = stock_totals(row.old_quantity, row.old_cost_price, row.old_price, sign=-1)
+        after = stock_totals(row.quantity, row.cost_price, row.price)
+        if row.product_id == row.old_product_id:
+            totals = {key: value + before[key] for key, value in after.items()}
+            stock_valuation_crud.apply(session, row.business_id, row.product_id, totals)
+        else:
+            stock_valuation_crud.apply(session, row.business_id, row.old_product_id, before)
+            stock_valuation_crud.apply(session, row.business_id, row.product_id, after)
         session.commit()
         session.refresh(db_item)
         return db_item
+
+    def delete_item(self, session: Session, db_item: Item) -> None:
+        sale_crud.delete_sales(session, Sale.item_id == db_item.id)
+        # valued as deleted, not as read
+        statement = delete(Item).where(Item.id == db_item.id).returning(
+            Item.business_id, Item.product_id, Item.quantity, Item.cost_price, Item.price
+        )
+        row = session.execute(statement).one()
+        stock_valuation_crud.apply(
+            session, row.business_id, row.product_id,
+            stock_totals(row.quantity, row.cost_price, row.price, sign=-1),
+        )
+        session.commit()
+
+    def import_items(self, session: Session, business_id: uuid.UUID, rows: Iterable[tuple[int, Any]]) -> ItemImportReport:
+        """
+        Create or update items of a business from (row number, row) pairs.
+
+        Rows are validated one at a time and streamed with COPY into a
+        temporary staging table, which is then merged into item by product
+        SKU in one statement that also updates the stock valuation. A row may
+        be an exception raised while parsing it; it is reported like a
+        validation error.
+        """
+        report = ItemImportReport()
+        session.execute(_CREATE_STAGING)
+        dbapi_connection = session.connection().connection.driver_connection
+        with dbapi_connection.cursor() as cursor:
+            columns = ", ".join(("row_number",) + _IMPORT_COLUMNS)
+            with cursor.copy(f"COPY item_import ({columns}) FROM STDIN") as copy:
+                for row_number, raw in rows:
+                    if isinstance(raw, Exception):
+                        _add_error(report, row_number, None, str(raw))
+                        continue
+                    try:
+                        row = ItemImport.model_validate(raw)
+                    except ValidationError as e:
+                        detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                        _add_error(report, row_number, raw.get("sku") if isinstance(raw, dict) else None, detail)
+                        continue
+                    copy.write_row((row_number, *(getattr(row, column) for column in _IMPORT_COLUMNS)))
+
+        unknown_count = session.execute(_COUNT_UNKNOWN_SKUS).scalar_one()
+        if unknown_count:
+            limit = max(settings.ITEM_IMPORT_MAX_ERRORS - len(report.errors), 0)
+            unknown = session.execute(_LIST_UNKNOWN_SKUS, {"limit": limit}).all()
+            for row_number, sku in unknown:
+                _add_error(report, row_number, sku, "Product with this SKU not found")
+            report.failed += unknown_count - len(unknown)
+
+        report.updated, report.created = session.execute(_MERGE_STAGING, {"business_id": business_id}).one()
+        session.commit()
+        report.errors.sort(key=lambda error: error.row)
+        return report
+
+
 item_crud = CRUDItem(Item)
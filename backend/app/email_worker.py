@@ -0,0 +1,198 @@
+import logging
+import queue
+import smtplib
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import formataddr
+from typing import Any
+
+from sqlalchemy import Row, update
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models.email_outbox_model import EmailOutbox
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SMTPConnectionPool:
+    """
+    Keeps up to `size` authenticated SMTP connections open between batches.
+    """
+
+    def __init__(self, size: int = settings.SMTP_POOL_SIZE):
+        self.size = size
+        self._idle: queue.LifoQueue[smtplib.SMTP] = queue.LifoQueue()
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp_class = smtplib.SMTP_SSL if settings.SMTP_SSL else smtplib.SMTP
+        smtp = smtp_class(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        if settings.SMTP_TLS and not settings.SMTP_SSL:
+            smtp.starttls()
+        if settings.SMTP_USER:
+            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD or "")
+        return smtp
+
+    def _take(self) -> smtplib.SMTP:
+        while True:
+            try:
+                smtp = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            try:
+                # the relay may have dropped an idle connection, or answer
+                # 421 when it is about to
+                code, _ = smtp.noop()
+                if code == 250:
+                    return smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            _close(smtp)
+
+    @contextmanager
+    def connection(self) -> Iterator[smtplib.SMTP]:
+        smtp = self._take()
+        try:
+            yield smtp
+        except BaseException:
+            _close(smtp)
+            raise
+        if self._idle.qsize() < self.size:
+            self._idle.put(smtp)
+        else:
+            _close(smtp)
+
+    def close(self) -> None:
+        while not self._idle.empty():
+            _close(self._idle.get_nowait())
+
+
+def _close(smtp: smtplib.SMTP) -> None:
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        smtp.close()
+
+
+def build_message(email_to: str, subject: str, html_content: str) -> EmailMessage:
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = formataddr((settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL))
+    message["To"] = email_to
+    message.set_content(html_content, subtype="html")
+    return message
+
+
+def _send(pool: SMTPConnectionPool, message: EmailMessage) -> str | None:
+    """
+    Send one message, returning the error text instead of raising.
+    """
+    try:
+        with pool.connection() as smtp:
+            smtp.send_message(message)
+    except (smtplib.SMTPException, OSError) as e:
+        return f"{type(e).__name__}: {e}"[:1024]
+    return None
+
+
+def backoff(attempts: int) -> timedelta:
+    seconds = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def claim_batch(session: Session) -> list[Row[Any]]:
+    """
+    Lease the next batch of due emails to this worker and commit.
+
+    The claim counts an attempt and moves the rows' next attempt a lease
+    away, so other workers skip them while this one sends without holding
+    locks, and pick them up again if it dies.
+    """
+    now = datetime.utcnow()
+    due = (
+        select(EmailOutbox.id)
+        .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(settings.EMAIL_OUTBOX_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    statement = (
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due.scalar_subquery()))
+        .values(
+            attempts=EmailOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS),
+        )
+        .returning(
+            EmailOutbox.id,
+            EmailOutbox.email_to,
+            EmailOutbox.subject,
+            EmailOutbox.html_content,
+            EmailOutbox.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    emails = list(session.execute(statement).all())
+    session.commit()
+    return emails
+
+
+def _outcome(email: Row[Any], error: str | None, now: datetime) -> dict[str, Any]:
+    if error is None:
+        # bodies can carry credentials (new_account.html), keep them no longer than needed
+        return {"status": "sent", "sent_at": now, "last_error": None, "html_content": ""}
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        logger.error("Giving up on email %s to %s: %s", email.id, email.email_to, error)
+        return {"status": "failed", "last_error": error, "html_content": ""}
+    logger.warning("Email %s to %s failed, retrying: %s", email.id, email.email_to, error)
+    return {"next_attempt_at": now + backoff(email.attempts), "last_error": error}
+
+
+def deliver_batch(session: Session, pool: SMTPConnectionPool, executor: ThreadPoolExecutor) -> int:
+    """
+    Send the next batch of due emails and record the outcome of each.
+
+    The batch is claimed in its own transaction, see `claim_batch`, so
+    several workers can drain the outbox without sending an email twice
+    and no row stays locked during SMTP I/O. Returns the batch size.
+    """
+    emails = claim_batch(session)
+    messages = [build_message(email.email_to, email.subject, email.html_content) for email in emails]
+    errors = list(executor.map(lambda message: _send(pool, message), messages))
+
+    now = datetime.utcnow()
+    for email, error in zip(emails, errors):
+        # unless the lease ran out and another worker claimed it again
+        statement = (
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email.id, EmailOutbox.attempts == email.attempts)
+            .values(**_outcome(email, error, now))
+        )
+        session.execute(statement)
+    session.commit()
+    return len(emails)
+
+
+def main() -> None:
+    assert settings.emails_enabled, "no provided configuration for email variables"
+    logger.info("Email worker started")
+    pool = SMTPConnectionPool()
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            while True:
+                with Session(engine) as session:
+                    sent = deliver_batch(session, pool, executor)
+                if sent < settings.EMAIL_OUTBOX_BATCH_SIZE:
+                    time.sleep(settings.EMAIL_OUTBOX_POLL_SECONDS)
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,17 @@
+from collections.abc import Awaitable, Callable
+
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
+from app.api.files import CachedStaticFiles
 from app.api.main import api_router
 from app.core.config import settings
-from fastapi.staticfiles import StaticFiles
+from app.core.images import MULTIPART_OVERHEAD
+from app.core.workers import ProcessPoolFullError
+from app.core.instrumentation import route_metrics, track_queries
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -19,6 +25,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=ORJSONResponse,
 )
 
 # Set all CORS enabled origins
@@ -33,5 +40,55 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+
+
+@app.exception_handler(ProcessPoolFullError)
+async def process_pool_full_handler(request: Request, exc: ProcessPoolFullError) -> Response:
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _max_body_bytes(path: str) -> int | None:
+    if path == f"{settings.API_V1_STR}/employee/update_avatar/":
+        return settings.AVATAR_MAX_BYTES + MULTIPART_OVERHEAD
+    return None
+
+
+@app.middleware("http")
+async def limit_upload_size(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    # Starlette spools a multipart body to disk before the route runs, so
+    # reject oversized uploads on their declared length first
+    max_bytes = _max_body_bytes(request.url.path)
+    length = request.headers.get("content-length")
+    if max_bytes is not None and length and length.isdigit() and int(length) > max_bytes:
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Image is larger than {settings.AVATAR_MAX_BYTES} bytes"},
+        )
+    return await call_next(request)
+
+
+@app.middleware("http")
+async def record_query_stats(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    with track_queries() as stats:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = stats.server_timing()
+    route = request.scope.get("route")
+    if route is not None:
+        route_metrics.observe(request.method, route.path, stats)
+    return response
+
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
-app.mount("/app/app/static", StaticFiles(directory="/app/app/static"), name="static")
+app.mount(
+    "/app/app/static",
+    CachedStaticFiles(directory="/app/app/static", immutable_dir=settings.AVATAR_DIR),
+    name="static",
+)
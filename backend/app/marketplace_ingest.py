@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+import logging
+import os
+import uuid
+
+from app.marketplaces.adapters import ADAPTERS
+from app.marketplaces.client import MarketplaceClient
+from app.marketplaces.pipeline import ingest
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run(marketplace: str, base_url: str, business_id: uuid.UUID, api_key: str | None) -> None:
+    adapter = ADAPTERS[marketplace](base_url, api_key)
+    async with MarketplaceClient() as client:
+        report = await ingest(adapter, client, business_id)
+    logger.info(f"Ingested {marketplace} catalog: {report.model_dump_json()}")
+
+
+def main() -> None:
+    """
+    Load a seller's marketplace catalog into products and the items of a
+    business; the API key is read from MARKETPLACE_API_KEY.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("marketplace", choices=sorted(ADAPTERS))
+    parser.add_argument("base_url")
+    parser.add_argument("business_id", type=uuid.UUID)
+    args = parser.parse_args()
+    asyncio.run(run(args.marketplace, args.base_url, args.business_id, os.environ.get("MARKETPLACE_API_KEY")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import Any, ClassVar, TypeVar
+
+from app.core.config import settings
+from app.marketplaces.client import MarketplaceClient
+
+A = TypeVar("A", bound=type["MarketplaceAdapter"])
+
+# Adapters by marketplace name, filled by @register
+ADAPTERS: dict[str, type["MarketplaceAdapter"]] = {}
+
+
+def register(adapter: A) -> A:
+    ADAPTERS[adapter.name] = adapter
+    return adapter
+
+
+class MarketplaceAdapter(ABC):
+    """
+    Reads a seller's catalog from one marketplace.
+
+    `pages` yields the raw records of the catalog a page at a time, in any
+    order; `parse` maps one record to the fields of a MarketplaceListing.
+    """
+
+    name: ClassVar[str]
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None = None,
+        *,
+        concurrency: int = settings.MARKETPLACE_FETCH_CONCURRENCY,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.concurrency = concurrency
+
+    @abstractmethod
+    def pages(self, client: MarketplaceClient) -> AsyncIterator[list[dict[str, Any]]]:
+        ...
+
+    @abstractmethod
+    def parse(self, record: dict[str, Any]) -> dict[str, Any]:
+        ...
+
+
+@register
+class JsonCatalogAdapter(MarketplaceAdapter):
+    """
+    Catalogs served as numbered JSON pages of listings:
+    GET /catalog?page=&page_size= returns {"pages": ..., "items": [...]}.
+
+    The first page gives the page count, the others are fetched
+    `concurrency` at a time and yielded as they arrive.
+    """
+
+    name = "json"
+    page_size = 100
+
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def _page(self, client: MarketplaceClient, page: int) -> dict[str, Any]:
+        response = await client.request(
+            self.name,
+            "GET",
+            f"{self.base_url}/catalog",
+            params={"page": page, "page_size": self.page_size},
+            headers=self._headers(),
+        )
+        return response.json()
+
+    async def pages(self, client: MarketplaceClient) -> AsyncIterator[list[dict[str, Any]]]:
+        first = await self._page(client, 1)
+        yield first["items"]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(page: int) -> dict[str, Any]:
+            async with semaphore:
+                return await self._page(client, page)
+
+        tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, first["pages"] + 1)]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                yield (await next_page)["items"]
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def parse(self, record: dict[str, Any]) -> dict[str, Any]:
+        return record
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+
+class RateLimiter:
+    """
+    Token bucket letting through `rate` requests per second, in bursts of at
+    most `burst`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """
+        Let nothing through for `seconds`, e.g. after the server throttled us.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+    def retry_after(self) -> float:
+        return max(1 - self._tokens, 0.0) / self.rate
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while not self.try_acquire():
+                await asyncio.sleep(self.retry_after())
+
+
+class MarketplaceClient:
+    """
+    HTTP client shared by every marketplace adapter of a process: one
+    connection pool, and one rate limiter per marketplace. Throttled (429)
+    and failed (5xx) requests are retried after Retry-After or a backoff.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_limits: dict[str, float] | None = None,
+        default_rate_limit: float = settings.MARKETPLACE_DEFAULT_RATE_LIMIT,
+        max_retries: int = settings.MARKETPLACE_MAX_RETRIES,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.rate_limits = settings.MARKETPLACE_RATE_LIMITS if rate_limits is None else rate_limits
+        self.default_rate_limit = default_rate_limit
+        self.max_retries = max_retries
+        self.requests = Counter()
+        self.retries = Counter()
+        self._limiters: dict[str, RateLimiter] = {}
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.MARKETPLACE_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.MARKETPLACE_MAX_CONNECTIONS,
+            ),
+            timeout=settings.MARKETPLACE_TIMEOUT_SECONDS,
+            transport=transport,
+        )
+
+    def limiter(self, marketplace: str) -> RateLimiter:
+        if marketplace not in self._limiters:
+            rate = self.rate_limits.get(marketplace, self.default_rate_limit)
+            self._limiters[marketplace] = RateLimiter(rate)
+        return self._limiters[marketplace]
+
+    async def request(self, marketplace: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        limiter = self.limiter(marketplace)
+        for attempt in range(self.max_retries + 1):
+            await limiter.acquire()
+            self.requests.inc()
+            response = await self._http.request(method, url, **kwargs)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or attempt == self.max_retries:
+                response.raise_for_status()
+                return response
+            self.retries.inc()
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else 0.5 * 2**attempt
+            if response.status_code == 429:
+                # every request to the marketplace waits, not just this one
+                limiter.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self) -> "MarketplaceClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
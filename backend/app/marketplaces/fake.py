@@ -0,0 +1,69 @@
+import asyncio
+import math
+from typing import Any
+
+from fastapi import FastAPI, Header, HTTPException, Query
+from fastapi.responses import JSONResponse
+
+from app.marketplaces.client import RateLimiter
+
+
+def fake_catalog(size: int, *, categories: int = 10, prefix: str = "FAKE") -> list[dict[str, Any]]:
+    return [
+        {
+            "sku": f"{prefix}-{n:06d}",
+            "title": f"Product {n}",
+            "description": f"Description of product {n}",
+            "price": round(10 + n % 90 + 0.99, 2),
+            "quantity": n % 50,
+            "img": None,
+            "category": f"{prefix} category {n % categories}",
+        }
+        for n in range(size)
+    ]
+
+
+def create_fake_marketplace(
+    catalog: list[dict[str, Any]],
+    *,
+    api_key: str | None = None,
+    rate_limit: float | None = None,
+    latency: float = 0.0,
+) -> FastAPI:
+    """
+    Marketplace serving `catalog` the way JsonCatalogAdapter reads it, for
+    tests and local load runs. Requests beyond `rate_limit` per second get
+    429 with Retry-After, as real marketplaces answer.
+    """
+    app = FastAPI()
+    limiter = RateLimiter(rate_limit, burst=1) if rate_limit else None
+    app.state.requests = 0
+
+    @app.get("/catalog")
+    async def read_catalog(
+        page: int = Query(default=1, ge=1),
+        page_size: int = Query(default=100, ge=1, le=1_000),
+        authorization: str | None = Header(default=None),
+    ) -> Any:
+        app.state.requests += 1
+        if api_key and authorization != f"Bearer {api_key}":
+            raise HTTPException(status_code=401, detail="Invalid API key")
+        if limiter and not limiter.try_acquire():
+            retry_after = str(math.ceil(limiter.retry_after()))
+            return JSONResponse({"detail": "Too many requests"}, status_code=429, headers={"Retry-After": retry_after})
+        if latency:
+            await asyncio.sleep(latency)
+        start = (page - 1) * page_size
+        return {
+            "page": page,
+            "pages": max(math.ceil(len(catalog) / page_size), 1),
+            "items": catalog[start : start + page_size],
+        }
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(create_fake_marketplace(fake_catalog(100_000), latency=0.05), port=8090)
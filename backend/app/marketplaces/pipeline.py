@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from contextlib import aclosing
+from typing import Any
+
+from pydantic import ValidationError
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.crud.crud_product import product_crud
+from app.crud.crude_item import item_crud
+from app.marketplaces.adapters import MarketplaceAdapter
+from app.marketplaces.client import MarketplaceClient
+from app.models.marketplace_model import IngestStagePublic, MarketplaceIngestReport, MarketplaceListing
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("fetch", "transform", "load")
+# pages or batches waiting between stages; a slow stage holds back the one before it
+QUEUE_SIZE = 4
+
+
+def _load_batch(business_id: uuid.UUID, batch: list[MarketplaceListing]) -> tuple[int, int, int, int]:
+    """
+    Upsert one batch of listings into products by SKU and into the items of
+    the business, in one transaction.
+    """
+    with Session(engine) as session:
+        products_created, products_updated = product_crud.upsert_by_sku(session, batch)
+        rows = ((row, listing.model_dump()) for row, listing in enumerate(batch, start=1))
+        items = item_crud.import_items(session, business_id, rows)
+    return products_created, products_updated, items.created, items.updated
+
+
+async def ingest(
+    adapter: MarketplaceAdapter,
+    client: MarketplaceClient,
+    business_id: uuid.UUID,
+    *,
+    batch_size: int = settings.MARKETPLACE_BATCH_SIZE,
+) -> MarketplaceIngestReport:
+    """
+    Load a marketplace catalog into products and the items of a business.
+
+    Fetching, validating and loading run concurrently, connected by bounded
+    queues. Loading is idempotent: running it again with the same catalog
+    changes nothing.
+    """
+    report = MarketplaceIngestReport(
+        marketplace=adapter.name, stages={stage: IngestStagePublic() for stage in STAGES}
+    )
+    pages: asyncio.Queue[list[dict[str, Any]] | None] = asyncio.Queue(QUEUE_SIZE)
+    batches: asyncio.Queue[list[MarketplaceListing] | None] = asyncio.Queue(QUEUE_SIZE)
+
+    async def timed(stage: str, work: Awaitable[Any], rows: Callable[[Any], int]) -> Any:
+        start = time.perf_counter()
+        result = await work
+        report.stages[stage].seconds += time.perf_counter() - start
+        report.stages[stage].rows += rows(result)
+        return result
+
+    async def fetch() -> None:
+        async with aclosing(adapter.pages(client)) as iterator:
+            while True:
+                try:
+                    page = await timed("fetch", iterator.__anext__(), len)
+                except StopAsyncIteration:
+                    break
+                report.fetched += len(page)
+                await pages.put(page)
+        await pages.put(None)
+
+    def transform_page(page: list[dict[str, Any]]) -> list[MarketplaceListing]:
+        listings = []
+        for record in page:
+            try:
+                listings.append(MarketplaceListing.model_validate(adapter.parse(record)))
+            except (ValidationError, KeyError, TypeError, ValueError) as e:
+                report.invalid += 1
+                logger.debug(f"Invalid {adapter.name} listing {record!r}: {e}")
+        return listings
+
+    async def transform() -> None:
+        batch: list[MarketplaceListing] = []
+        while (page := await pages.get()) is not None:
+            start = time.perf_counter()
+            batch.extend(transform_page(page))
+            report.stages["transform"].seconds += time.perf_counter() - start
+            report.stages["transform"].rows += len(page)
+            while len(batch) >= batch_size:
+                await batches.put(batch[:batch_size])
+                batch = batch[batch_size:]
+        if batch:
+            await batches.put(batch)
+        await batches.put(None)
+
+    async def load() -> None:
+        while (batch := await batches.get()) is not None:
+            counts = await timed(
+                "load", asyncio.to_thread(_load_batch, business_id, batch), lambda _: len(batch)
+            )
+            report.products_created += counts[0]
+            report.products_updated += counts[1]
+            report.items_created += counts[2]
+            report.items_updated += counts[3]
+
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(stage()) for stage in (fetch, transform, load)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    report.seconds = time.perf_counter() - start
+    return report
@@ -1,7 +1,8 @@
 import uuid
 from pydantic import EmailStr
-from app.models.base import Field, Relationship, SQLModel
+from app.models.base import Field, Relationship, SQLModel, PagePublic
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from typing import Any
 from pydantic import computed_field
@@ -37,6 +38,8 @@ class AddressUpdate(AddressBase):
 
 # Database model, database table inferred from class name
 class Address(AddressBase, table=True):
+    # Addresses of a lead, paged by creation
+    __table_args__ = (Index("ix_address_lead_id_created_at", "lead_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow},)
@@ -54,6 +57,5 @@ class AddressPublic(AddressBase):
     
 
 
-class AddressesPublic(SQLModel):
+class AddressesPublic(PagePublic):
     data: list[AddressPublic]
-    count: int
@@ -5,6 +5,13 @@ from sqlmodel import Field, Relationship, SQLModel
 
 
 
+# Envelope shared by paginated list responses, `count` is None when skipped
+class PagePublic(SQLModel):
+    count: int | None = None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
 # Generic message
 class Message(SQLModel):
     message: str
@@ -19,6 +26,8 @@ class Token(SQLModel):
 # Contents of JWT token
 class TokenPayload(SQLModel):
     sub: str | None = None
+    exp: int | None = None
+    ver: int = 0
 
 
 class NewPassword(SQLModel):
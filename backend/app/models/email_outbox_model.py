@@ -0,0 +1,22 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, Index, Text
+
+from app.models.base import Field, SQLModel
+
+# Emails are written here in the transaction of the change that triggers
+# them and delivered by app/email_worker.py
+class EmailOutbox(SQLModel, table=True):
+    __table_args__ = (Index("ix_emailoutbox_status_next_attempt_at", "status", "next_attempt_at"),)
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    email_to: str = Field(max_length=255)
+    subject: str = Field(max_length=255)
+    html_content: str = Field(sa_column=Column(Text, nullable=False))
+    # pending -> sent, or failed once EMAIL_OUTBOX_MAX_ATTEMPTS is reached
+    status: str = Field(default="pending", max_length=16)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow)
+    last_error: str | None = Field(default=None, max_length=1024)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: datetime | None = Field(default=None)
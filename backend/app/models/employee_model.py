@@ -1,8 +1,10 @@
 import uuid
-from typing import Optional, List
-from app.models.base import Field, Relationship, SQLModel
+from typing import Optional, List, ClassVar
+from app.models.base import Field, Relationship, SQLModel, PagePublic
+from app.models.loaders import LoadedPublic, LoaderProfile
 from app.models.business_model import Business
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from pydantic import EmailStr
@@ -37,6 +39,11 @@ class UserShow(SQLModel):
     
 # Database model, database table inferred from class name
 class Employee(EmployeeBase, table=True):
+    # The tenant lookup of a user, and the employees of a business paged by creation
+    __table_args__ = (
+        Index("ix_employee_user_id_business_id", "user_id", "business_id"),
+        Index("ix_employee_business_id_created_at", "business_id", "created_at", "id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     is_active: bool = Field(default=True)
     avatar: Optional[uuid.UUID] = Field(default=None, max_length=255)
@@ -54,7 +61,8 @@ class Employee(EmployeeBase, table=True):
 
 
 # Properties to return via API, id is always required
-class EmployeePublic(EmployeeBase):
+class EmployeePublic(EmployeeBase, LoadedPublic):
+    loader_profile: ClassVar[LoaderProfile] = {"business": "joined"}
     id: uuid.UUID
     user_id: uuid.UUID
     avatar: Optional[uuid.UUID]
@@ -62,6 +70,15 @@ class EmployeePublic(EmployeeBase):
     created_at: datetime
     updated_at: datetime
 
-class EmployeesPublic(SQLModel):
+class EmployeesPublic(PagePublic):
     data: List[EmployeePublic]
+
+class EmployeeAvatar(SQLModel):
+    employee_id: uuid.UUID
+    avatar: Optional[uuid.UUID]
+    url: Optional[str]
+    variants: dict[int, str]
+
+class EmployeeAvatarsPublic(SQLModel):
+    data: List[EmployeeAvatar]
     count: int
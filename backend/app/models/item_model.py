@@ -1,10 +1,11 @@
 from typing_extensions import Optional
 import uuid
 from pydantic import EmailStr
-from app.models.base import Field, Relationship, SQLModel
+from app.models.base import Field, Relationship, SQLModel, PagePublic
 from app.models.product_model import Product
 from app.models.business_model import Business
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 
 # Shared properties
@@ -31,6 +32,13 @@ class ItemUpdate(ItemBase):
 
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
+    # "Does this business own product X", the tenant listing paged by
+    # creation, and lookups and foreign key checks by product
+    __table_args__ = (
+        Index("ix_item_business_id_product_id", "business_id", "product_id"),
+        Index("ix_item_business_id_created_at", "business_id", "created_at", "id"),
+        Index("ix_item_product_id", "product_id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -52,6 +60,23 @@ class ItemPublic(ItemBase):
     product_id: uuid.UUID
 
 
-class ItemsPublic(SQLModel):
+class ItemsPublic(PagePublic):
     data: list[ItemPublic]
-    count: int
+
+
+# One row of a bulk import, matched to a product by SKU
+class ItemImport(ItemBase):
+    sku: str = Field(min_length=1, max_length=255)
+
+
+class ItemImportError(SQLModel):
+    row: int
+    sku: str | None = None
+    detail: str
+
+
+class ItemImportReport(SQLModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: list[ItemImportError] = []
@@ -1,7 +1,8 @@
 import uuid
 from pydantic import EmailStr
-from app.models.base import Field, Relationship, SQLModel
+from app.models.base import Field, Relationship, SQLModel, PagePublic
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from app.models.business_model import Business
 from app.models.proposal_model import Proposal
@@ -29,6 +30,8 @@ class LeadUpdate(LeadBase):
 
 # Database model, database table inferred from class name
 class Lead(LeadBase, table=True):
+    # Leads of a business, paged by creation
+    __table_args__ = (Index("ix_lead_business_id_created_at", "business_id", "created_at", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     customer_name: str = Field(max_length=255)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -48,6 +51,5 @@ class LeadPublic(LeadBase):
     business_id: uuid.UUID
 
 
-class LeadsPublic(SQLModel):
+class LeadsPublic(PagePublic):
     data: list[LeadPublic]
-    count: int
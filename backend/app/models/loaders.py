@@ -0,0 +1,30 @@
+from typing import Any, ClassVar, Literal
+
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.base import SQLModel
+
+# Relationship name on the table model -> loader strategy. Use "joined" for
+# many-to-one (safe next to LIMIT) and "selectin" for collections.
+LoaderProfile = dict[str, Literal["joined", "selectin"]]
+
+_STRATEGIES = {"joined": joinedload, "selectin": selectinload}
+
+
+class LoadedPublic(SQLModel):
+    """
+    Base for public models that embed relationships.
+
+    Subclasses declare `loader_profile` so every route serialising them loads
+    the embedded rows up front instead of once per row during validation.
+    """
+
+    loader_profile: ClassVar[LoaderProfile] = {}
+
+
+def loader_options(public_model: type[SQLModel], model: type[SQLModel]) -> list[Any]:
+    profile: LoaderProfile = getattr(public_model, "loader_profile", {})
+    return [
+        _STRATEGIES[strategy](getattr(model, relationship))
+        for relationship, strategy in profile.items()
+    ]
@@ -0,0 +1,33 @@
+from pydantic import computed_field
+
+from app.models.base import Field, SQLModel
+from app.models.item_model import ItemImport
+
+
+# One product of a seller's marketplace catalog, as parsed by its adapter
+class MarketplaceListing(ItemImport):
+    # title of the product group of products created from it
+    category: str = Field(min_length=1, max_length=255)
+
+
+class IngestStagePublic(SQLModel):
+    rows: int = 0
+    # time spent working, or waiting on the marketplace for fetching
+    seconds: float = 0.0
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class MarketplaceIngestReport(SQLModel):
+    marketplace: str
+    fetched: int = 0
+    invalid: int = 0
+    products_created: int = 0
+    products_updated: int = 0
+    items_created: int = 0
+    items_updated: int = 0
+    seconds: float = 0.0
+    stages: dict[str, IngestStagePublic] = {}
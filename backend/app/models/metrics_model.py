@@ -0,0 +1,39 @@
+from app.models.base import SQLModel
+
+
+# Cumulative bucket counts keyed by upper bound in seconds
+class HistogramPublic(SQLModel):
+    buckets: dict[str, int]
+    count: int
+    sum: float
+
+
+class PoolStatusPublic(SQLModel):
+    pool_size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    timeouts: int
+    wait_seconds: HistogramPublic | None
+
+
+# Outcomes of the conditional stock decrement done for each sale
+class StockContentionPublic(SQLModel):
+    attempts: int
+    sold: int
+    out_of_stock: int
+    lost_races: int
+    decrement_seconds: HistogramPublic
+
+
+class PasswordHashingPublic(SQLModel):
+    workers: int
+    max_pending: int
+    pending: int
+    rejected: int
+    seconds: HistogramPublic
+
+
+class DBPoolsPublic(SQLModel):
+    sync_pool: PoolStatusPublic
+    async_pool: PoolStatusPublic
@@ -1,12 +1,15 @@
 
 import uuid
 from pydantic import EmailStr
-from app.models.base import Field, Relationship, SQLModel
+from app.models.base import Field, Relationship, SQLModel, PagePublic
+from app.models.loaders import LoadedPublic, LoaderProfile
 
 from app.models.product_group_model import ProductGroup
 from app.models.product_tag_model import ProductTag
 # from app.models.item_model import Item
 from datetime import datetime
+from typing import ClassVar
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from app.models.product_tag_link_model import ProductTagLink
 
@@ -32,6 +35,10 @@ class ProductUpdate(ProductBase):
 
 # Database model, database table inferred from class name
 class Product(ProductBase, table=True):
+    # Products of a group, paged by creation
+    __table_args__ = (
+        Index("ix_product_product_group_id_created_at", "product_group_id", "created_at", "id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=255)
     moderated: bool = False
@@ -47,7 +54,8 @@ class Product(ProductBase, table=True):
 
 
 # Properties to return via API, id is always required
-class ProductPublic(ProductBase):
+class ProductPublic(ProductBase, LoadedPublic):
+    loader_profile: ClassVar[LoaderProfile] = {"tags": "selectin", "group": "joined"}
     id: uuid.UUID
     product_group_id: uuid.UUID
     image: str | None
@@ -55,6 +63,5 @@ class ProductPublic(ProductBase):
     group: ProductGroup
 
 
-class ProductsPublic(SQLModel):
+class ProductsPublic(PagePublic):
     data: list[ProductPublic]
-    count: int
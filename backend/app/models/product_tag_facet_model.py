@@ -0,0 +1,26 @@
+import uuid
+
+from app.models.base import Field, SQLModel
+
+
+# Products per tag within a product group, kept up to date by the product
+# and product tag link CRUD whenever links or product groups change
+class ProductTagFacet(SQLModel, table=True):
+    product_group_id: uuid.UUID = Field(
+        foreign_key="productgroup.id", primary_key=True, ondelete="CASCADE"
+    )
+    product_tag_id: uuid.UUID = Field(foreign_key="producttag.id", primary_key=True, ondelete="CASCADE")
+    products: int = Field(default=0)
+
+
+class ProductTagFacetPublic(SQLModel):
+    product_tag_id: uuid.UUID
+    title: str
+    products: int
+
+
+class ProductTagFacetsPublic(SQLModel):
+    product_group_id: uuid.UUID
+    selected: list[uuid.UUID]
+    # counts among the products of the group having every selected tag
+    data: list[ProductTagFacetPublic]
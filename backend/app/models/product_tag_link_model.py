@@ -1,6 +1,34 @@
+from typing import Literal
+
+from sqlalchemy import Index
 from app.models.base import Field, Relationship, SQLModel
 import uuid
 
 class ProductTagLink(SQLModel, table=True):
+    # The primary key serves lookups by product, this one by tag
+    __table_args__ = (Index("ix_producttaglink_product_tag_id", "product_tag_id"),)
     product_id: uuid.UUID = Field(default_factory=uuid.uuid4, foreign_key="product.id", primary_key=True, ondelete="CASCADE")
     product_tag_id: uuid.UUID = Field(default_factory=uuid.uuid4, foreign_key="producttag.id", primary_key=True, ondelete="CASCADE")
+
+
+# Bulk linking: every tag to every product, limits keep one request a single
+# statement of at most 50_000 pairs
+class ProductTagLinksCreate(SQLModel):
+    product_ids: list[uuid.UUID] = Field(min_length=1, max_length=1_000)
+    product_tag_ids: list[uuid.UUID] = Field(min_length=1, max_length=50)
+
+
+ProductTagLinkStatus = Literal["created", "exists", "product_not_found", "tag_not_found", "forbidden"]
+
+
+class ProductTagLinkOutcome(SQLModel):
+    product_id: uuid.UUID
+    product_tag_id: uuid.UUID
+    status: ProductTagLinkStatus
+
+
+class ProductTagLinksReport(SQLModel):
+    created: int = 0
+    existing: int = 0
+    failed: int = 0
+    data: list[ProductTagLinkOutcome] = []
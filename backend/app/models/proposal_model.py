@@ -1,9 +1,12 @@
 import uuid
 from pydantic import EmailStr
-from app.models.base import Field, Relationship, SQLModel
+from app.models.base import Field, Relationship, SQLModel, PagePublic
+from app.models.loaders import LoadedPublic, LoaderProfile
+from app.models.product_model import Product
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
-from typing import Any
+from typing import Any, ClassVar
 from pydantic import computed_field
 
 
@@ -27,6 +30,11 @@ class ProposalUpdate(ProposalBase):
 
 # Database model, database table inferred from class name
 class Proposal(ProposalBase, table=True):
+    # Proposals of a lead, paged by creation
+    __table_args__ = (
+        Index("ix_proposal_lead_id_created_at", "lead_id", "created_at", "id"),
+        Index("ix_proposal_product_id", "product_id"),
+    )
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow},)
@@ -37,13 +45,15 @@ class Proposal(ProposalBase, table=True):
         foreign_key="product.id", nullable=False
     )
     lead: "Lead" = Relationship(back_populates="proposals") # type: ignore
+    product: Product | None = Relationship()
     
 class ProductShow(SQLModel):
     title: str
-    image: str
+    image: str | None
     
 # Properties to return via API, id is always required
-class ProposalPublic(ProposalBase):
+class ProposalPublic(ProposalBase, LoadedPublic):
+    loader_profile: ClassVar[LoaderProfile] = {"product": "joined"}
     id: uuid.UUID
     lead_id: uuid.UUID
     product_id: uuid.UUID
@@ -56,6 +66,5 @@ class ProposalPublic(ProposalBase):
     
 
 
-class ProposalsPublic(SQLModel):
+class ProposalsPublic(PagePublic):
     data: list[ProposalPublic]
-    count: int
@@ -1,7 +1,10 @@
 import uuid
 from typing import Optional, List
-from app.models.base import SQLModel, Field, Relationship
+from typing import ClassVar
+from app.models.base import SQLModel, Field, Relationship, PagePublic
+from app.models.loaders import LoadedPublic, LoaderProfile
 from datetime import datetime
+from sqlalchemy import Index
 from sqlalchemy.sql import func
 from pydantic import computed_field
 from app.models.item_model import Item
@@ -25,6 +28,11 @@ class SaleUpdate(SaleBase):
 
 # Database model, database table inferred from class name
 class Sale(SaleBase, table=True):
+    # Sales of a lead, paged by creation; item_id serves rollups and cascades
+    __table_args__ = (
+        Index("ix_sale_lead_id_created_at", "lead_id", "created_at", "id"),
+        Index("ix_sale_item_id", "item_id"),
+    )
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow},)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -34,6 +42,9 @@ class Sale(SaleBase, table=True):
     item_id: uuid.UUID = Field(
         foreign_key="item.id", nullable=False, ondelete="CASCADE"
     )
+    # Item.cost_price when sold, so sales rollups stay exact when it changes
+    cost_price_per_item: float | None = Field(default=None)
+    item: Item | None = Relationship()
     @computed_field(description="sum of sale")
     @property
     def sum_of_sale(self) -> float:
@@ -42,7 +53,8 @@ class Sale(SaleBase, table=True):
 
 
 # Properties to return via API, id is always required
-class SalePublic(SaleBase):
+class SalePublic(SaleBase, LoadedPublic):
+    loader_profile: ClassVar[LoaderProfile] = {"item": "joined"}
     id: uuid.UUID
     created_at: datetime
     updated_at: datetime
@@ -51,6 +63,5 @@ class SalePublic(SaleBase):
     sum_of_sale: float
 
 
-class SalesPublic(SQLModel):
+class SalesPublic(PagePublic):
     data: list[SalePublic]
-    count: int
@@ -0,0 +1,25 @@
+import uuid
+from datetime import date
+from typing import Literal
+
+from app.models.base import SQLModel
+
+ForecastMethod = Literal["moving_average", "exponential_smoothing", "seasonal_naive"]
+
+
+class ItemForecast(SQLModel):
+    item_id: uuid.UUID
+    product_id: uuid.UUID
+    method: ForecastMethod
+    # mean absolute error per day when backtested on the end of the history
+    error: float
+    units: float
+    daily: list[float]
+
+
+class SalesForecastPublic(SQLModel):
+    # first forecast day
+    start: date
+    horizon: int
+    history_days: int
+    data: list[ItemForecast]
@@ -0,0 +1,58 @@
+import uuid
+from datetime import date
+from typing import Literal, Optional
+
+from app.models.base import Field, SQLModel
+
+Granularity = Literal["day", "month"]
+GroupBy = Literal["total", "product", "item"]
+
+
+# Sales of one item per business and period, kept up to date by CRUDSale in
+# the transaction of every sale write so analytics never scan the sale table
+class SalesRollupBase(SQLModel):
+    business_id: uuid.UUID = Field(foreign_key="business.id", primary_key=True, ondelete="CASCADE")
+    # the day, or the first day of the month
+    period: date = Field(primary_key=True)
+    item_id: uuid.UUID = Field(foreign_key="item.id", primary_key=True, ondelete="CASCADE")
+    product_id: uuid.UUID = Field(foreign_key="product.id")
+    sales: int = Field(default=0)
+    units: int = Field(default=0)
+    revenue: float = Field(default=0.0)
+    discount: float = Field(default=0.0)
+    cost: float = Field(default=0.0)
+
+
+class SalesDaily(SalesRollupBase, table=True):
+    pass
+
+
+class SalesMonthly(SalesRollupBase, table=True):
+    pass
+
+
+# Bumped by every sale write of the business, so cached reports can tell they
+# are current without reading the sales
+class SalesVersion(SQLModel, table=True):
+    business_id: uuid.UUID = Field(foreign_key="business.id", primary_key=True, ondelete="CASCADE")
+    version: int = Field(default=0)
+
+
+class SalesAnalyticsRow(SQLModel):
+    period: date
+    product_id: Optional[uuid.UUID] = None
+    item_id: Optional[uuid.UUID] = None
+    sales: int
+    units: int
+    revenue: float
+    discount: float
+    cost: float
+    margin: float
+
+
+class SalesAnalyticsPublic(SQLModel):
+    granularity: Granularity
+    group_by: GroupBy
+    start: date
+    end: date
+    data: list[SalesAnalyticsRow]
@@ -0,0 +1,25 @@
+import uuid
+from typing import Literal
+
+from app.models.base import SQLModel
+from app.models.lead_model import LeadBase
+from app.models.product_model import ProductBase
+
+SearchKind = Literal["product", "lead"]
+
+
+class ProductSearchHit(ProductBase):
+    id: uuid.UUID
+    product_group_id: uuid.UUID
+    rank: float
+
+
+class LeadSearchHit(LeadBase):
+    id: uuid.UUID
+    business_id: uuid.UUID
+    rank: float
+
+
+class SearchPublic(SQLModel):
+    products: list[ProductSearchHit]
+    leads: list[LeadSearchHit]
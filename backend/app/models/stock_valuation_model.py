@@ -0,0 +1,49 @@
+import uuid
+from datetime import date, datetime
+
+from app.models.base import Field, SQLModel
+
+
+class StockValuationBase(SQLModel):
+    items: int = Field(default=0)
+    units: int = Field(default=0)
+    cost_value: float = Field(default=0.0)
+    retail_value: float = Field(default=0.0)
+
+
+# Running totals of the items of a business per product group, kept up to
+# date by the item and sale CRUD in the transaction of every stock change
+class StockValuation(StockValuationBase, table=True):
+    business_id: uuid.UUID = Field(foreign_key="business.id", primary_key=True, ondelete="CASCADE")
+    product_group_id: uuid.UUID = Field(
+        foreign_key="productgroup.id", primary_key=True, ondelete="CASCADE"
+    )
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Daily copies of StockValuation written by app/stock_snapshot.py
+class StockValuationSnapshot(StockValuationBase, table=True):
+    business_id: uuid.UUID = Field(foreign_key="business.id", primary_key=True, ondelete="CASCADE")
+    taken_on: date = Field(primary_key=True)
+    product_group_id: uuid.UUID = Field(
+        foreign_key="productgroup.id", primary_key=True, ondelete="CASCADE"
+    )
+
+
+class StockValuationGroup(StockValuationBase):
+    product_group_id: uuid.UUID
+
+
+class StockValuationPublic(StockValuationBase):
+    business_id: uuid.UUID
+    groups: list[StockValuationGroup]
+
+
+class StockValuationPoint(StockValuationBase):
+    taken_on: date
+
+
+class StockValuationHistoryPublic(SQLModel):
+    start: date
+    end: date
+    data: list[StockValuationPoint]
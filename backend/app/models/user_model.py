@@ -1,7 +1,8 @@
 import uuid
 from pydantic import EmailStr
-from typing import Optional, List, Any
-from app.models.base import Field, Relationship, SQLModel
+from typing import Optional, List, Any, ClassVar
+from app.models.base import Field, Relationship, SQLModel, PagePublic
+from app.models.loaders import LoadedPublic, LoaderProfile
 from datetime import datetime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -50,6 +51,8 @@ class UpdatePassword(SQLModel):
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    # Bumped to revoke every access token issued before
+    token_version: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow},)
     employee: Employee | None = Relationship(cascade_delete=True)
@@ -57,11 +60,11 @@ class User(UserBase, table=True):
 
 
 # Properties to return via API, id is always required
-class UserPublic(UserBase):
+class UserPublic(UserBase, LoadedPublic):
+    loader_profile: ClassVar[LoaderProfile] = {"employee": "joined"}
     id: uuid.UUID
     employee: Employee | None
 
 
-class UsersPublic(SQLModel):
+class UsersPublic(PagePublic):
     data: list[UserPublic]
-    count: int
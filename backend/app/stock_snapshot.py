@@ -0,0 +1,30 @@
+import logging
+import time
+from datetime import datetime
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.db import engine
+from app.crud.crud_stock_valuation import stock_valuation_crud
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    """
+    Copy the running stock valuations into today's history, then again every
+    STOCK_SNAPSHOT_INTERVAL_SECONDS; the last run of a day is the one kept.
+    """
+    logger.info("Stock snapshot job started")
+    while True:
+        taken_on = datetime.utcnow().date()
+        with Session(engine) as session:
+            rows = stock_valuation_crud.take_snapshot(session, taken_on)
+        logger.info(f"Snapshot of {taken_on}: {rows} business product groups")
+        time.sleep(settings.STOCK_SNAPSHOT_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import io
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.images import MULTIPART_OVERHEAD, avatar_path
+from app.tests.utils.business import create_random_business, employee_authentication_headers
+
+
+def test_update_avatar(client: TestClient, db: Session, tmp_path: Path) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    image = io.BytesIO()
+    Image.new("RGB", (40, 30), "teal").save(image, format="PNG")
+
+    with (
+        patch("app.core.config.settings.AVATAR_DIR", str(tmp_path / "avatars")),
+        patch("app.core.config.settings.AVATAR_UPLOAD_DIR", str(tmp_path / "uploads")),
+    ):
+        r = client.post(
+            f"{settings.API_V1_STR}/employee/update_avatar/",
+            headers=headers,
+            files={"file": ("avatar.png", image.getvalue(), "image/png")},
+        )
+        assert r.status_code == 200
+        content = r.json()
+        assert content["id"] == str(employee.id)
+        assert content["business"]["id"] == str(employee.business_id)
+        assert avatar_path(content["avatar"]).is_file()
+
+    db.refresh(employee)
+    assert str(employee.avatar) == content["avatar"]
+
+
+def test_update_avatar_rejects_declared_length_before_reading(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    with patch("app.core.config.settings.AVATAR_MAX_BYTES", 1024):
+        r = client.post(
+            f"{settings.API_V1_STR}/employee/update_avatar/",
+            headers=normal_user_token_headers,
+            files={"file": ("avatar.png", b"x" * (1024 + MULTIPART_OVERHEAD), "image/png")},
+        )
+    assert r.status_code == 413
+    assert r.json() == {"detail": "Image is larger than 1024 bytes"}
+
+
+def test_read_business_avatars(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    url = f"{settings.API_V1_STR}/employee/avatars"
+
+    r = client.get(url, headers=headers, params={"business_id": str(employee.business_id)})
+    assert r.status_code == 200
+    assert r.json() == {
+        "data": [{"employee_id": str(employee.id), "avatar": None, "url": None, "variants": {}}],
+        "count": 1,
+    }
+
+    _, other_headers = employee_authentication_headers(client, db)
+    r = client.get(url, headers=other_headers, params={"business_id": str(employee.business_id)})
+    assert r.status_code == 400
+
+
+def test_read_business_avatars_without_business(
+    client: TestClient, db: Session, normal_user_token_headers: dict[str, str]
+) -> None:
+    business = create_random_business(db)
+    r = client.get(
+        f"{settings.API_V1_STR}/employee/avatars",
+        headers=normal_user_token_headers,
+        params={"business_id": str(business.id)},
+    )
+    assert r.status_code == 404
+    assert r.json() == {"detail": "User is not registered in any business."}
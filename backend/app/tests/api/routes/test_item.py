@@ -0,0 +1,56 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.tests.utils.business import create_business_item, create_sellable_item, employee_authentication_headers
+from app.tests.utils.product import create_random_product
+
+
+def test_read_items_of_business(
+    client: TestClient, db: Session, normal_user_token_headers: dict[str, str]
+) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    product = create_random_product(db)
+    items = [create_business_item(db, employee.business, product, quantity=n) for n in (1, 2)]
+    other = create_business_item(db, employee.business)
+    create_sellable_item(db)
+
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 3
+    assert {item["id"] for item in content["data"]} == {str(item.id) for item in [*items, other]}
+
+    r = client.get(f"{settings.API_V1_STR}/items/by_product/", headers=headers, params={"product_id": str(product.id)})
+    assert r.status_code == 200
+    assert sorted((item["id"], item["quantity"]) for item in r.json()["data"]) == sorted(
+        (str(item.id), item.quantity) for item in items
+    )
+
+    for url in ("/items/", f"/items/by_product/?product_id={product.id}"):
+        r = client.get(f"{settings.API_V1_STR}{url}", headers=normal_user_token_headers)
+        assert r.status_code == 404
+        assert r.json()["detail"] == "User is not registered in any business."
+
+
+def test_read_item(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    item = create_business_item(db, employee.business, quantity=4)
+    foreign, _ = create_sellable_item(db)
+
+    r = client.get(f"{settings.API_V1_STR}/items/{item.id}", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert (content["id"], content["quantity"], content["business_id"]) == (str(item.id), 4, str(employee.business_id))
+
+    r = client.get(f"{settings.API_V1_STR}/items/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Item not found"
+
+    r = client.get(f"{settings.API_V1_STR}/items/{foreign.id}", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Not enough permissions"
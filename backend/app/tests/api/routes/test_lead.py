@@ -0,0 +1,49 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.tests.utils.business import create_random_business, employee_authentication_headers
+from app.tests.utils.lead import create_random_lead
+
+
+def test_read_leads_of_business(
+    client: TestClient, db: Session, normal_user_token_headers: dict[str, str]
+) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    leads = [create_random_lead(db, employee.business, customer_name=name) for name in ("a", "b")]
+    create_random_lead(db, create_random_business(db))
+
+    r = client.get(f"{settings.API_V1_STR}/lead/", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 2
+    assert sorted((lead["id"], lead["customer_name"]) for lead in content["data"]) == sorted(
+        (str(lead.id), lead.customer_name) for lead in leads
+    )
+
+    r = client.get(f"{settings.API_V1_STR}/lead/", headers=normal_user_token_headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "User is not registered in any business."
+
+
+def test_read_lead(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    lead = create_random_lead(db, employee.business)
+    foreign = create_random_lead(db, create_random_business(db))
+
+    r = client.get(f"{settings.API_V1_STR}/lead/{lead.id}", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert (content["id"], content["business_id"]) == (str(lead.id), str(employee.business_id))
+
+    r = client.get(f"{settings.API_V1_STR}/lead/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Lead not found"
+
+    r = client.get(f"{settings.API_V1_STR}/lead/{foreign.id}", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Not enough permissions"
@@ -0,0 +1,149 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.crud.crud_product_tag_link import create_product_tag_link
+from app.models.product_group_model import ProductGroup
+from app.models.product_tag_facet_model import ProductTagFacet
+from app.models.product_tag_link_model import ProductTagLink
+from app.tests.utils.business import create_business_item, employee_authentication_headers
+from app.tests.utils.product import create_random_product, create_random_product_group, create_random_product_tag
+
+
+def tag_facets(db: Session, group: ProductGroup) -> dict[uuid.UUID, int]:
+    facets = db.exec(
+        select(ProductTagFacet.product_tag_id, ProductTagFacet.products).where(
+            ProductTagFacet.product_group_id == group.id
+        )
+    ).all()
+    return dict(facets)
+
+
+def test_add_product_tag_links(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    group = create_random_product_group(db)
+    tags = [create_random_product_tag(db) for _ in range(2)]
+    products = [create_random_product(db, group) for _ in range(2)]
+    create_product_tag_link(db, ProductTagLink(product_id=products[0].id, product_tag_id=tags[0].id))
+    missing = uuid.uuid4()
+
+    response = client.put(
+        f"{settings.API_V1_STR}/product/taglinks/",
+        headers=superuser_token_headers,
+        json={
+            "product_ids": [str(products[0].id), str(products[1].id), str(missing)],
+            "product_tag_ids": [str(tags[0].id), str(tags[1].id), str(missing)],
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert (content["created"], content["existing"], content["failed"]) == (3, 1, 5)
+    statuses = {(row["product_id"], row["product_tag_id"]): row["status"] for row in content["data"]}
+    assert statuses[(str(products[0].id), str(tags[0].id))] == "exists"
+    assert statuses[(str(products[1].id), str(tags[1].id))] == "created"
+    assert statuses[(str(products[1].id), str(missing))] == "tag_not_found"
+    assert statuses[(str(missing), str(tags[0].id))] == "product_not_found"
+    assert tag_facets(db, group) == {tags[0].id: 2, tags[1].id: 2}
+
+
+def test_add_product_tag_links_only_to_products_of_the_business(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    group = create_random_product_group(db)
+    tags = [create_random_product_tag(db) for _ in range(2)]
+    held, not_held = (create_random_product(db, group) for _ in range(2))
+    assert employee.business
+    create_business_item(db, employee.business, held)
+
+    response = client.put(
+        f"{settings.API_V1_STR}/product/taglinks/",
+        headers=headers,
+        json={
+            "product_ids": [str(held.id), str(not_held.id)],
+            "product_tag_ids": [str(tag.id) for tag in tags],
+        },
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert (content["created"], content["existing"], content["failed"]) == (2, 0, 2)
+    statuses = {(row["product_id"], row["product_tag_id"]): row["status"] for row in content["data"]}
+    for tag in tags:
+        assert statuses[(str(held.id), str(tag.id))] == "created"
+        assert statuses[(str(not_held.id), str(tag.id))] == "forbidden"
+    assert tag_facets(db, group) == {tag.id: 1 for tag in tags}
+
+
+def test_read_products_by_group(
+    client: TestClient, db: Session, normal_user_token_headers: dict[str, str]
+) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    group = create_random_product_group(db)
+    held, not_held = (create_random_product(db, group) for _ in range(2))
+    create_random_product(db)
+    create_business_item(db, employee.business, held)
+    create_business_item(db, employee.business, held)
+
+    r = client.get(f"{settings.API_V1_STR}/product/", headers=headers, params={"product_group_id": str(group.id)})
+    assert r.status_code == 200
+    content = r.json()
+    assert sorted(product["id"] for product in content["data"]) == sorted([str(held.id), str(not_held.id)])
+    assert {product["group"]["id"] for product in content["data"]} == {str(group.id)}
+
+    url = f"{settings.API_V1_STR}/product/by_product_group_with_created_items/"
+    r = client.get(url, headers=headers, params={"product_group_id": str(group.id)})
+    assert r.status_code == 200
+    assert [product["id"] for product in r.json()["data"]] == [str(held.id)]
+
+    for url in ("/product/", "/product/by_product_group_with_created_items/"):
+        r = client.get(f"{settings.API_V1_STR}{url}", headers=headers, params={"product_group_id": str(uuid.uuid4())})
+        assert r.status_code == 404
+        assert r.json()["detail"] == "Product group not found"
+        r = client.get(
+            f"{settings.API_V1_STR}{url}", headers=normal_user_token_headers, params={"product_group_id": str(group.id)}
+        )
+        assert r.status_code == 400
+        assert r.json()["detail"] == "Not enough permissions"
+
+
+def test_read_products_by_business(
+    client: TestClient, db: Session, normal_user_token_headers: dict[str, str]
+) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    held = create_random_product(db)
+    create_business_item(db, employee.business, held)
+    create_random_product(db)
+
+    r = client.get(f"{settings.API_V1_STR}/product/by_business/", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert [product["id"] for product in content["data"]] == [str(held.id)]
+    assert content["count"] == 1
+
+    r = client.get(f"{settings.API_V1_STR}/product/by_business/", headers=normal_user_token_headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Not enough permissions"
+
+
+def test_read_product(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    held, not_held = create_random_product(db), create_random_product(db)
+    create_business_item(db, employee.business, held)
+
+    r = client.get(f"{settings.API_V1_STR}/product/{held.id}", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert (content["id"], content["sku"]) == (str(held.id), held.sku)
+    assert content["group"]["id"] == str(held.product_group_id)
+
+    r = client.get(f"{settings.API_V1_STR}/product/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Product not found"
+
+    r = client.get(f"{settings.API_V1_STR}/product/{not_held.id}", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Not enough permissions"
@@ -0,0 +1,83 @@
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.crud.crud_sale import sale_crud
+from app.models.sale_model import Sale, SaleCreate
+from app.tests.utils.business import create_business_item, create_sellable_item, employee_authentication_headers
+from app.tests.utils.lead import create_random_lead
+
+
+def test_create_sale_of_other_business_item(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    lead = create_random_lead(db, employee.business)
+    item, _ = create_sellable_item(db, quantity=5)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/sale/",
+        headers=headers,
+        json={"lead_id": str(lead.id), "item_id": str(item.id), "quantity_of_items": 2},
+    )
+    assert r.status_code == 400
+    db.refresh(item)
+    assert item.quantity == 5
+    assert db.exec(select(func.count()).select_from(Sale).where(Sale.item_id == item.id)).one() == 0
+
+
+def test_create_sale(client: TestClient, db: Session) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    lead = create_random_lead(db, employee.business)
+    item = create_business_item(db, employee.business, quantity=5)
+
+    r = client.post(
+        f"{settings.API_V1_STR}/sale/",
+        headers=headers,
+        json={"lead_id": str(lead.id), "item_id": str(item.id), "quantity_of_items": 2},
+    )
+    assert r.status_code == 200
+    assert r.json()["item"]["id"] == str(item.id)
+    db.refresh(item)
+    assert item.quantity == 3
+
+
+def test_read_sales(client: TestClient, db: Session, normal_user_token_headers: dict[str, str]) -> None:
+    employee, headers = employee_authentication_headers(client, db)
+    assert employee.business
+    lead = create_random_lead(db, employee.business)
+    item = create_business_item(db, employee.business, quantity=5)
+    sale = sale_crud.sell_item(db, SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=2), item)
+    foreign_item, foreign_lead = create_sellable_item(db, quantity=5)
+    foreign = sale_crud.sell_item(
+        db, SaleCreate(lead_id=foreign_lead.id, item_id=foreign_item.id, quantity_of_items=1), foreign_item
+    )
+    assert sale and foreign
+
+    r = client.get(f"{settings.API_V1_STR}/sale/{lead.id}", headers=headers)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == 1
+    assert [(row["id"], row["item"]["id"]) for row in content["data"]] == [(str(sale.id), str(item.id))]
+
+    r = client.get(f"{settings.API_V1_STR}/sale/by/{sale.id}", headers=headers)
+    assert r.status_code == 200
+    assert (r.json()["id"], r.json()["quantity_of_items"]) == (str(sale.id), 2)
+
+    r = client.get(f"{settings.API_V1_STR}/sale/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    r = client.get(f"{settings.API_V1_STR}/sale/by/{uuid.uuid4()}", headers=headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Sale not found"
+
+    r = client.get(f"{settings.API_V1_STR}/sale/{foreign_lead.id}", headers=headers)
+    assert r.status_code == 400
+    r = client.get(f"{settings.API_V1_STR}/sale/by/{foreign.id}", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Not enough permissions"
+
+    r = client.get(f"{settings.API_V1_STR}/sale/{lead.id}", headers=normal_user_token_headers)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "User is not registered in any business."
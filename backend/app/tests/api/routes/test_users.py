@@ -1,14 +1,18 @@
 import uuid
 from unittest.mock import patch
 
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
 from app.crud.crud_user import user_crud
 from app.core.config import settings
 from app.core.security import verify_password
+from app.models.email_outbox_model import EmailOutbox
 from app.models.user_model import User, UserCreate
-from app.tests.utils.utils import random_email, random_lower_string
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import count_queries, random_email, random_lower_string
 
 
 def test_get_users_superuser_me(
@@ -37,9 +41,8 @@ def test_create_user_new_email(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
 ) -> None:
     with (
-        patch("app.utils.send_email", return_value=None),
         patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
-        patch("app.core.config.settings.SMTP_USER", "admin@example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "admin@example.com"),
     ):
         username = random_email()
         password = random_lower_string()
@@ -55,6 +58,33 @@ def test_create_user_new_email(
         assert user
         assert user.email == created_user["email"]
 
+    [queued] = db.exec(select(EmailOutbox).where(EmailOutbox.email_to == username)).all()
+    assert queued.status == "pending"
+    assert queued.subject == f"{settings.PROJECT_NAME} - New account for user {username}"
+
+
+
+def test_create_user_queues_email_with_the_user(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    username = random_email()
+    user_crud.create_user(
+        session=db, user_create=UserCreate(email=username, password=random_lower_string())
+    )
+    with (
+        patch("app.core.config.settings.SMTP_HOST", "smtp.example.com"),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "admin@example.com"),
+        # another request creates the same user between the check and the insert
+        patch.object(user_crud, "get_user_by_email", return_value=None),
+        pytest.raises(IntegrityError),
+    ):
+        client.post(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            json={"email": username, "password": random_lower_string()},
+        )
+
+    assert not db.exec(select(EmailOutbox).where(EmailOutbox.email_to == username)).all()
 
 def test_get_existing_user(
     client: TestClient, superuser_token_headers: dict[str, str], db: Session
@@ -168,6 +198,87 @@ def test_retrieve_users(
         assert "email" in item
 
 
+def test_retrieve_users_constant_query_count(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(4):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        user_crud.create_user(session=db, user_create=user_in)
+
+    query_counts = []
+    for limit in (1, 4):
+        with count_queries() as statements:
+            r = client.get(
+                f"{settings.API_V1_STR}/users/",
+                headers=superuser_token_headers,
+                params={"limit": limit},
+            )
+        assert r.status_code == 200
+        assert len(r.json()["data"]) == limit
+        query_counts.append(len(statements))
+
+    assert query_counts[0] == query_counts[1]
+
+
+def test_retrieve_users_by_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    for _ in range(3):
+        user_in = UserCreate(email=random_email(), password=random_lower_string())
+        user_crud.create_user(session=db, user_create=user_in)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "with_count": False},
+    )
+    first_page = r.json()
+    assert first_page["count"] is None
+    assert first_page["prev_cursor"] is None
+    assert len(first_page["data"]) == 2
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": first_page["next_cursor"]},
+    )
+    second_page = r.json()
+    assert second_page["count"] > 2
+    first_ids = {u["id"] for u in first_page["data"]}
+    assert not first_ids & {u["id"] for u in second_page["data"]}
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 2, "cursor": second_page["prev_cursor"]},
+    )
+    assert [u["id"] for u in r.json()["data"]] == [u["id"] for u in first_page["data"]]
+
+
+def test_retrieve_users_invalid_cursor(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Invalid cursor"
+
+
+def test_retrieve_users_limit_is_bounded(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    for limit in (-1, 0, settings.MAX_PAGE_SIZE + 1):
+        r = client.get(
+            f"{settings.API_V1_STR}/users/",
+            headers=superuser_token_headers,
+            params={"limit": limit},
+        )
+        assert r.status_code == 422
+
+
 def test_update_user_me(
     client: TestClient, normal_user_token_headers: dict[str, str], db: Session
 ) -> None:
@@ -191,43 +302,37 @@ def test_update_user_me(
     assert user_db.full_name == full_name
 
 
-def test_update_password_me(
-    client: TestClient, superuser_token_headers: dict[str, str], db: Session
-) -> None:
+def test_update_password_me(client: TestClient, db: Session) -> None:
+    # a throwaway user: changing a password revokes the user's other tokens
+    email = random_email()
+    password = random_lower_string()
+    user_crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    headers = user_authentication_headers(client=client, email=email, password=password)
     new_password = random_lower_string()
     data = {
-        "current_password": settings.FIRST_SUPERUSER_PASSWORD,
+        "current_password": password,
         "new_password": new_password,
     }
     r = client.patch(
         f"{settings.API_V1_STR}/users/me/password",
-        headers=superuser_token_headers,
+        headers=headers,
         json=data,
     )
     assert r.status_code == 200
     updated_user = r.json()
     assert updated_user["message"] == "Password updated successfully"
 
-    user_query = select(User).where(User.email == settings.FIRST_SUPERUSER)
+    user_query = select(User).where(User.email == email)
     user_db = db.exec(user_query).first()
     assert user_db
-    assert user_db.email == settings.FIRST_SUPERUSER
-    assert verify_password(new_password, user_db.hashed_password)
-
-    # Revert to the old password to keep consistency in test
-    old_data = {
-        "current_password": new_password,
-        "new_password": settings.FIRST_SUPERUSER_PASSWORD,
-    }
-    r = client.patch(
-        f"{settings.API_V1_STR}/users/me/password",
-        headers=superuser_token_headers,
-        json=old_data,
-    )
-    db.refresh(user_db)
+    assert user_db.email == email
+    assert verify_password(new_password, user_db.hashed_password)[0]
 
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert r.status_code == 403
+    headers = user_authentication_headers(client=client, email=email, password=new_password)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
     assert r.status_code == 200
-    assert verify_password(settings.FIRST_SUPERUSER_PASSWORD, user_db.hashed_password)
 
 
 def test_update_password_me_incorrect_password(
@@ -301,7 +406,7 @@ def test_register_user(client: TestClient, db: Session) -> None:
     assert user_db
     assert user_db.email == username
     assert user_db.full_name == full_name
-    assert verify_password(password, user_db.hashed_password)
+    assert verify_password(password, user_db.hashed_password)[0]
 
 
 def test_register_user_already_exists_error(client: TestClient) -> None:
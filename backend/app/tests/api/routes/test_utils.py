@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+def test_read_db_pool_status(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/db-pool/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    sync_pool = r.json()["sync_pool"]
+    assert sync_pool["pool_size"] == settings.DB_POOL_SIZE
+    # the request itself holds a connection while the status is read
+    assert sync_pool["wait_seconds"]["count"] > 0
+
+
+def test_read_db_pool_status_normal_user(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/db-pool/", headers=normal_user_token_headers)
+    assert r.status_code == 403
+
+
+def test_server_timing_and_route_metrics(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+    assert 'queries"' in r.headers["Server-Timing"]
+
+    r = client.get(f"{settings.API_V1_STR}/utils/metrics/", headers=superuser_token_headers)
+    assert r.status_code == 200
+    assert f'http_requests_total{{method="GET",route="{settings.API_V1_STR}/users/me"}}' in r.text
+    assert "# TYPE http_request_db_seconds histogram" in r.text
@@ -0,0 +1,149 @@
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import Session, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.deps import (
+    abusiness_has_product,
+    aretrieve_products_by_business_id,
+    business_has_product,
+    business_product_ids,
+    get_current_user,
+    resolve_tenant,
+    retrieve_products_by_business_id,
+    tenant_cache,
+    token_cache,
+)
+from app.core.db import async_engine, engine
+from app.core.security import create_access_token
+from app.crud.crud_user import user_crud
+from app.crud.crud_business import business_crud
+from app.crud.crud_employee import employee_crud
+from app.models.business_model import BusinessCreateSolo
+from app.models.employee_model import Employee, EmployeeCreate
+from app.tests.utils.business import create_business_item, create_random_business, create_random_employee
+from app.tests.utils.product import create_random_product, create_random_product_group
+from app.tests.utils.user import create_random_user
+from app.tests.utils.utils import AsyncRunner, random_lower_string
+
+
+def test_resolve_tenant_is_cached_and_invalidated(db: Session) -> None:
+    user = create_random_user(db)
+    employee, business = resolve_tenant(db, user.id)
+    assert employee is None and business is None
+    assert user.id in tenant_cache
+
+    business = business_crud.create_business(
+        db, business_in=BusinessCreateSolo(name=random_lower_string()), business_industry_id=None
+    )
+    employee_in = EmployeeCreate(name=random_lower_string(), business_id=business.id)
+    employee_crud.create_employee(db, employee_in=employee_in, user_id=user.id, business_id=business.id)
+    # inserting the employee drops the cached "no business" entry
+    assert user.id not in tenant_cache
+
+    employee, cached_business = resolve_tenant(db, user.id)
+    assert employee is not None and cached_business is not None
+    assert cached_business.id == business.id
+
+    business.name = random_lower_string()
+    db.add(business)
+    db.commit()
+    assert user.id not in tenant_cache
+
+
+def test_current_user_token_is_cached_and_revoked(db: Session) -> None:
+    user = create_random_user(db)
+    token = create_access_token(user.id, timedelta(minutes=5), version=user.token_version)
+    assert get_current_user(db, token).id == user.id
+    assert token in token_cache
+
+    user_crud.set_password(user, random_lower_string())
+    db.add(user)
+    db.commit()
+    # the update drops the cached token, and its version no longer matches
+    assert token not in token_cache
+    with pytest.raises(HTTPException) as e:
+        get_current_user(db, token)
+    assert e.value.status_code == 403
+
+
+def test_tenant_cache_follows_committed_employee_moves(db: Session) -> None:
+    user = create_random_user(db)
+    employee = create_random_employee(db, user)
+    moved_to = create_random_business(db)
+    assert resolve_tenant(db, user.id)[1].id == employee.business_id
+
+    employee.business_id = moved_to.id
+    db.add(employee)
+    db.flush()
+    db.rollback()
+    assert user.id in tenant_cache
+
+    employee.business_id = moved_to.id
+    db.add(employee)
+    db.flush()
+    # a request between the flush and the commit still reads and caches the
+    # committed business
+    with Session(engine) as other:
+        assert resolve_tenant(other, user.id)[1].id != moved_to.id
+    db.commit()
+    with Session(engine) as other:
+        assert resolve_tenant(other, user.id)[1].id == moved_to.id
+
+
+def test_tenant_cache_drops_values_loaded_before_an_invalidation(db: Session) -> None:
+    user = create_random_user(db)
+    generation = tenant_cache.generation
+    tenant_cache.invalidate(uuid.uuid4())
+    tenant_cache.set(user.id, (None, None), generation=generation)
+    assert user.id not in tenant_cache
+
+
+def test_tenant_cache_follows_bulk_updates(db: Session) -> None:
+    user = create_random_user(db)
+    create_random_employee(db, user)
+    moved_to = create_random_business(db)
+    resolve_tenant(db, user.id)
+
+    db.exec(update(Employee).where(Employee.user_id == user.id).values(business_id=moved_to.id))  # type: ignore
+    assert user.id in tenant_cache
+    db.commit()
+    assert resolve_tenant(db, user.id)[1].id == moved_to.id
+
+
+def test_business_products_follow_its_items(db: Session, run_async: AsyncRunner) -> None:
+    business, other = create_random_business(db), create_random_business(db)
+    group = create_random_product_group(db)
+    stocked, grouped, foreign = create_random_product(db), create_random_product(db, group), create_random_product(db)
+    for product in (stocked, stocked, stocked, grouped):
+        create_business_item(db, business, product)
+    create_business_item(db, other, foreign)
+
+    async def aread(product_group_id: uuid.UUID | None = None) -> tuple[dict, bool, bool]:
+        async with AsyncSession(async_engine) as session:
+            return (
+                await aretrieve_products_by_business_id(session, business.id, product_group_id),
+                await abusiness_has_product(session, business.id, stocked.id),
+                await abusiness_has_product(session, business.id, foreign.id),
+            )
+
+    aproducts, *ahas_products = run_async(aread())
+
+    # one row per product however many items hold it, none of other businesses
+    for products in (retrieve_products_by_business_id(db, business.id), aproducts):
+        assert sorted(product.id for product in products["data"]) == sorted([stocked.id, grouped.id])
+        assert products["count"] == 2
+    for products in (retrieve_products_by_business_id(db, business.id, group.id), run_async(aread(group.id))[0]):
+        assert [product.id for product in products["data"]] == [grouped.id]
+        assert products["count"] == 1
+    with pytest.raises(HTTPException):
+        retrieve_products_by_business_id(db, business.id, create_random_product_group(db).id)
+
+    assert business_has_product(db, business.id, stocked.id)
+    assert not business_has_product(db, business.id, foreign.id)
+    assert ahas_products == [True, False]
+    assert business_product_ids(db, business.id, [stocked.id, grouped.id, foreign.id]) == {stocked.id, grouped.id}
+    assert business_product_ids(db, business.id, []) == set()
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.files import IMMUTABLE, CachedFileResponse, RangeNotSatisfiableError, parse_range
+
+
+def test_parse_range() -> None:
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    assert parse_range("bytes=9-0", 100) is None
+    assert parse_range("items=0-9", 100) is None
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=100-", 100)
+    with pytest.raises(RangeNotSatisfiableError):
+        parse_range("bytes=-0", 100)
+
+
+def test_cached_file_response(tmp_path: Path) -> None:
+    path = tmp_path / "data.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+    app = FastAPI()
+
+    @app.get("/file")
+    def read_file(immutable: bool = False) -> CachedFileResponse:
+        return CachedFileResponse(path, immutable=immutable)
+
+    with TestClient(app) as client:
+        r = client.get("/file")
+        assert r.status_code == 200 and r.content == path.read_bytes()
+        etag = r.headers["etag"]
+        assert not etag.startswith("W/")
+        assert r.headers["cache-control"] == "public, no-cache"
+        assert client.get("/file?immutable=true").headers["cache-control"] == IMMUTABLE
+
+        r = client.get("/file", headers={"If-None-Match": etag})
+        assert r.status_code == 304 and r.content == b""
+        r = client.get("/file", headers={"If-Modified-Since": r.headers["last-modified"]})
+        assert r.status_code == 304
+
+        r = client.get("/file", headers={"Range": "bytes=10-19"})
+        assert r.status_code == 206 and r.content == bytes(range(10, 20))
+        assert r.headers["content-range"] == "bytes 10-19/1024"
+        r = client.get("/file", headers={"Range": "bytes=2000-"})
+        assert r.status_code == 416 and r.headers["content-range"] == "bytes */1024"
+        # a stale If-Range gets the whole file
+        r = client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+        assert r.status_code == 200 and len(r.content) == 1024
+
+        path.write_bytes(b"changed")
+        r = client.get("/file", headers={"If-None-Match": etag})
+        assert r.status_code == 200 and r.headers["etag"] != etag
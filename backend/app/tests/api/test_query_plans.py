@@ -0,0 +1,140 @@
+import hashlib
+import uuid
+from collections.abc import Generator, Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from app.api.deps import _has_product_statement, _products_statement, _tenant_statement
+from app.api.pagination import PageParams, _page_statements
+from app.core.db import engine
+from app.models.address_model import Address
+from app.models.employee_model import Employee
+from app.models.item_model import Item
+from app.models.lead_model import Lead
+from app.models.product_model import Product
+from app.models.product_tag_link_model import ProductTagLink
+from app.models.product_tag_model import ProductTag
+from app.models.proposal_model import Proposal
+from app.models.sale_model import Sale
+
+BUSINESSES = 1_000
+ROWS = 40_000
+
+# Tables large enough after seeding that a route reading them sequentially
+# would not scale; the small lookup tables may be scanned
+LARGE_TABLES = {"user", "employee", "product", "producttaglink", "item", "lead", "sale", "proposal", "address"}
+
+SEED = f"""
+    INSERT INTO "user" (id, email, hashed_password, is_active, is_superuser, token_version, created_at, updated_at)
+    SELECT md5('user' || n)::uuid, 'plan-' || n || '@example.com', 'x', true, false, 0, now(), now()
+    FROM generate_series(0, {ROWS // 20 - 1}) AS n;
+    INSERT INTO business (id, name, is_active)
+    SELECT md5('business' || n)::uuid, 'plan-' || n, true FROM generate_series(0, {BUSINESSES - 1}) AS n;
+    INSERT INTO employee (id, name, is_active, user_id, business_id, created_at, updated_at)
+    SELECT md5('employee' || n)::uuid, 'plan-' || n, true, md5('user' || n)::uuid,
+        md5('business' || n % {BUSINESSES})::uuid, now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS // 20 - 1}) AS n;
+    INSERT INTO productgroup (id, title, created_at, updated_at)
+    SELECT md5('group' || n)::uuid, 'plan-' || n, now(), now() FROM generate_series(0, 49) AS n;
+    INSERT INTO product (id, title, sku, moderated, product_group_id, created_at, updated_at)
+    SELECT md5('product' || n)::uuid, 'plan-' || n, 'PLAN-' || n, true, md5('group' || n % 50)::uuid,
+        now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS // 2 - 1}) AS n;
+    INSERT INTO producttag (id, title, created_at, updated_at)
+    SELECT md5('tag' || n)::uuid, 'plan-' || n, now(), now() FROM generate_series(0, 199) AS n;
+    INSERT INTO producttaglink (product_id, product_tag_id)
+    SELECT md5('product' || n % {ROWS // 2})::uuid, md5('tag' || (n + n / {ROWS // 2}) % 200)::uuid FROM generate_series(0, {ROWS - 1}) AS n;
+    INSERT INTO item (id, title, quantity, price, business_id, product_id, created_at, updated_at)
+    SELECT md5('item' || n)::uuid, 'plan-' || n, 10, 1.0, md5('business' || n % {BUSINESSES})::uuid,
+        md5('product' || n % {ROWS // 2})::uuid, now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS - 1}) AS n;
+    INSERT INTO lead (id, customer_name, business_id, created_at, updated_at)
+    SELECT md5('lead' || n)::uuid, 'plan-' || n, md5('business' || n % {BUSINESSES})::uuid,
+        now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS - 1}) AS n;
+    INSERT INTO sale (id, quantity_of_items, discount, price_per_item, lead_id, item_id, created_at, updated_at)
+    SELECT md5('sale' || n)::uuid, 1, 0, 1.0, md5('lead' || n % {ROWS // 4})::uuid, md5('item' || n)::uuid,
+        now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS - 1}) AS n;
+    INSERT INTO proposal (id, quantity, lead_id, product_id, created_at, updated_at)
+    SELECT md5('proposal' || n)::uuid, 1, md5('lead' || n % {ROWS // 4})::uuid,
+        md5('product' || n % {ROWS // 2})::uuid, now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS - 1}) AS n;
+    INSERT INTO address (id, address_type, billing_address, billing_city, billing_country, shipping_address,
+        shipping_city, shipping_country, lead_id, created_at, updated_at)
+    SELECT md5('address' || n)::uuid, 'home', 'a', 'c', 'x', 'a', 'c', 'x', md5('lead' || n % {ROWS // 4})::uuid,
+        now() - n * interval '1 second', now()
+    FROM generate_series(0, {ROWS - 1}) AS n;
+    ANALYZE;
+"""
+
+
+def seeded(kind: str, n: int = 1) -> uuid.UUID:
+    # the ids SEED derives from md5(kind || n)
+    return uuid.UUID(hashlib.md5(f"{kind}{n}".encode()).hexdigest())
+
+
+def paged(model: Any, statement: Any) -> list[Any]:
+    count_statement, page_statement, _ = _page_statements(model, statement, PageParams(), None)
+    return [count_statement, page_statement]
+
+
+def route_statements() -> dict[str, list[Any]]:
+    business, group, product = seeded("business"), seeded("group"), seeded("product")
+    lead, user, tag = seeded("lead"), seeded("user"), seeded("tag")
+    return {
+        "items of business": paged(Item, select(Item).where(Item.business_id == business)),
+        "items of business product": [
+            select(Item).where((Item.business_id == business) & (Item.product_id == product))
+        ],
+        "products of business": paged(Product, _products_statement(business, None)),
+        "products of business group": paged(Product, _products_statement(business, group)),
+        "business has product": [_has_product_statement(business, product)],
+        "products of group": paged(Product, select(Product).where(Product.product_group_id == group)),
+        "leads of business": paged(Lead, select(Lead).where(Lead.business_id == business)),
+        "sales of lead": paged(Sale, select(Sale).where(Sale.lead_id == lead)),
+        "proposals of lead": paged(Proposal, select(Proposal).where(Proposal.lead_id == lead)),
+        "addresses of lead": paged(Address, select(Address).where(Address.lead_id == lead)),
+        "employees of business": [
+            select(Employee.id, Employee.avatar)
+            .where(Employee.business_id == business)
+            .order_by(Employee.created_at, Employee.id)
+        ],
+        "tenant of user": [_tenant_statement(user)],
+        "tags of product": [select(ProductTag).join(ProductTagLink).where(ProductTagLink.product_id == product)],
+        "products of tag": [select(ProductTagLink).where(ProductTagLink.product_tag_id == tag)],
+        "sales of item": [select(Sale.id).where(Sale.item_id == seeded("item"))],
+        "items of product": [select(Item.id).where(Item.product_id == product)],
+    }
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@pytest.fixture(scope="module")
+def seeded_session() -> Generator[Session, None, None]:
+    # everything, including the statistics, is rolled back afterwards
+    with Session(engine) as session:
+        session.execute(text(SEED))
+        yield session
+        session.rollback()
+
+
+@pytest.mark.parametrize("route", list(route_statements()))
+def test_route_statements_use_indexes(seeded_session: Session, route: str) -> None:
+    connection = seeded_session.connection()
+    for statement in route_statements()[route]:
+        compiled = statement.compile(connection, compile_kwargs={"render_postcompile": True})
+        [[explained]] = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).all()
+        scans = {
+            node["Relation Name"]
+            for node in plan_nodes(explained[0]["Plan"])
+            if node["Node Type"] == "Seq Scan"
+        }
+        assert not scans & LARGE_TABLES, f"{route} scans {scans & LARGE_TABLES}:\n{compiled}"
@@ -0,0 +1,76 @@
+import json
+import uuid
+
+import pytest
+from pydantic import ValidationError
+from sqlmodel import Session, select
+
+from app.api.responses import page_response
+from app.models.item_model import Item
+from app.models.loaders import loader_options
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import Product, ProductPublic, ProductsPublic
+from app.models.product_tag_model import ProductTag
+from app.models.proposal_model import Proposal, ProposalPublic
+from app.models.sale_model import Sale, SalePublic
+from app.tests.utils.product import create_random_product, create_random_product_group
+
+
+def make_product(n: int) -> Product:
+    group = ProductGroup(title=f"group {n}", description=None)
+    product = Product(
+        title=f"product {n}", description=None, sku=f"SKU-{n}", product_group_id=group.id, group=group
+    )
+    product.tags = [ProductTag(title=f"tag {n}"), ProductTag(title=f"tag {n + 1}")]
+    return product
+
+
+def test_row_encoder_matches_validated_dump() -> None:
+    product = make_product(1)
+    item = Item(title="item", price=2.5, quantity=3, business_id=uuid.uuid4(), product_id=product.id)
+    sale = Sale(quantity_of_items=2, discount=0.1, price_per_item=10.0, lead_id=uuid.uuid4(), item_id=item.id, item=item)
+    proposal = Proposal(quantity=2, preferable_price_per_item=3.0, lead_id=uuid.uuid4(), product_id=product.id, product=product)
+
+    for public_model, row in ((ProductPublic, product), (SalePublic, sale), (ProposalPublic, proposal)):
+        fast = json.loads(page_response(public_model, {"data": [row]}).body)["data"][0]
+        assert fast == public_model.model_validate(row).model_dump(mode="json")
+
+
+def test_page_response_matches_response_model() -> None:
+    page = {"data": [make_product(n) for n in range(3)], "count": 3, "next_cursor": "abc", "prev_cursor": None}
+
+    body = json.loads(page_response(ProductPublic, page).body)
+
+    assert body == ProductsPublic(**page).model_dump(mode="json")
+
+
+def test_row_encoder_matches_validated_dump_of_loaded_rows(db: Session) -> None:
+    product = create_random_product(db, group=create_random_product_group(db))
+    db.expire_all()
+    statement = select(Product).where(Product.id == product.id)
+
+    def assert_same_json(row: Product) -> None:
+        fast = json.loads(page_response(ProductPublic, {"data": [row]}).body)["data"][0]
+        assert fast == ProductPublic.model_validate(row).model_dump(mode="json")
+        assert fast["group"]["id"] == str(product.product_group_id)
+
+    # relationships loaded with the row
+    row = db.exec(statement.options(*loader_options(ProductPublic, Product))).one()
+    assert_same_json(row)
+    # loaded lazily
+    db.expire(row)
+    assert_same_json(db.exec(statement).one())
+    # nothing loaded at all
+    db.expire(row)
+    assert_same_json(row)
+
+def test_row_encoder_validates_rows_missing_required_values() -> None:
+    without_group, without_group_id = make_product(1), make_product(2)
+    without_group.group = None
+    without_group_id.product_group_id = None
+
+    for product in (without_group, without_group_id):
+        with pytest.raises(ValidationError):
+            ProductPublic.model_validate(product)
+        with pytest.raises(ValidationError):
+            page_response(ProductPublic, {"data": [product]})
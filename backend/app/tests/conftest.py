@@ -1,16 +1,18 @@
-from collections.abc import Generator
+import asyncio
+from collections.abc import Coroutine, Generator
+from typing import Any
 
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, delete
 
 from app.core.config import settings
-from app.core.db import engine, init_db
+from app.core.db import async_engine, engine, init_db
 from app.main import app
 from app.models.user_model import User
 from app.models.item_model import Item
 from app.tests.utils.user import authentication_token_from_email
-from app.tests.utils.utils import get_superuser_token_headers
+from app.tests.utils.utils import AsyncRunner, get_superuser_token_headers
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -41,3 +43,23 @@ def normal_user_token_headers(client: TestClient, db: Session) -> dict[str, str]
     return authentication_token_from_email(
         client=client, email=settings.EMAIL_TEST_USER, db=db
     )
+
+
+@pytest.fixture
+def run_async() -> AsyncRunner:
+    """
+    Run a coroutine to completion on a new event loop. Pooled async
+    connections belong to the loop that opened them, so they are closed
+    before the loop goes.
+    """
+
+    def run(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        async def main() -> Any:
+            try:
+                return await coroutine
+            finally:
+                await async_engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from app.core.forecast import METHODS, exponential_smoothing, forecast_demand, seasonal_naive
+
+
+def test_exponential_smoothing_matches_recursion() -> None:
+    history = np.random.default_rng(0).poisson(3, size=(5, 40)).astype(float)
+    level = history[:, 0].copy()
+    for day in range(1, history.shape[1]):
+        level = 0.3 * history[:, day] + 0.7 * level
+    assert exponential_smoothing(history, 2) == pytest.approx(np.stack([level, level], axis=1))
+
+
+def test_forecast_demand_picks_best_method_per_item() -> None:
+    days = 56
+    weekly = np.tile([0, 0, 0, 0, 0, 10, 20], days // 7)
+    steady = np.full(days, 4)
+    forecast = forecast_demand(np.stack([weekly, steady]), horizon=10)
+
+    assert forecast.units.shape == (2, 10)
+    assert METHODS[forecast.method[0]] == "seasonal_naive"
+    assert forecast.units[0] == pytest.approx(seasonal_naive(weekly[None, :], 10)[0])
+    assert forecast.units[1] == pytest.approx(np.full(10, 4.0))
+    assert forecast.errors[1] == pytest.approx(np.zeros(len(METHODS)))
+
+    fixed = forecast_demand(np.stack([weekly, steady]), horizon=10, method="moving_average")
+    assert forecast.method.tolist() != fixed.method.tolist()
+    assert fixed.units[0] == pytest.approx(np.full(10, 30 / 7))
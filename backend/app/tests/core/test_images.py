@@ -0,0 +1,72 @@
+import asyncio
+import io
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+
+from app.core.images import ImageTooLargeError, InvalidImageError, avatar_path, spool_upload, store_avatar
+
+
+def _upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=len(data), filename="avatar.jpg")
+
+
+def _jpeg(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "teal").save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_store_avatar_deduplicates_and_resizes(tmp_path: Path) -> None:
+    data = _jpeg(300, 200)
+    avatars, uploads = tmp_path / "avatars", tmp_path / "uploads"
+    with (
+        patch("app.core.config.settings.AVATAR_DIR", str(avatars)),
+        patch("app.core.config.settings.AVATAR_UPLOAD_DIR", str(uploads)),
+        patch("app.core.config.settings.AVATAR_SIZES", [32, 128]),
+    ):
+        first = asyncio.run(store_avatar(_upload(data)))
+        second = asyncio.run(store_avatar(_upload(data)))
+        other = asyncio.run(store_avatar(_upload(_jpeg(10, 10))))
+
+        assert first == second != other
+        with Image.open(avatar_path(first)) as original:
+            assert original.format == "PNG" and original.size == (300, 200)
+        with Image.open(avatar_path(first, 32)) as variant:
+            assert variant.size == (32, 32)
+        with Image.open(avatar_path(first, 128)) as variant:
+            assert variant.size == (128, 128)
+    # two images with one original and two variants each, no leftover uploads
+    assert len(list(avatars.iterdir())) == 6
+    assert list(uploads.iterdir()) == []
+
+
+def test_spool_upload_stays_out_of_avatar_dir(tmp_path: Path) -> None:
+    avatars, uploads = tmp_path / "avatars", tmp_path / "uploads"
+    with (
+        patch("app.core.config.settings.AVATAR_DIR", str(avatars)),
+        patch("app.core.config.settings.AVATAR_UPLOAD_DIR", str(uploads)),
+    ):
+        path, _ = asyncio.run(spool_upload(_upload(b"data"), 1024))
+
+    # AVATAR_DIR is served as static files
+    assert path.parent == uploads
+    assert not avatars.exists()
+
+
+def test_store_avatar_rejects_large_and_invalid_uploads(tmp_path: Path) -> None:
+    with (
+        patch("app.core.config.settings.AVATAR_DIR", str(tmp_path)),
+        patch("app.core.config.settings.AVATAR_UPLOAD_DIR", str(tmp_path)),
+        patch("app.core.config.settings.AVATAR_MAX_BYTES", 1024),
+    ):
+        with pytest.raises(ImageTooLargeError):
+            asyncio.run(store_avatar(_upload(b"x" * 2048)))
+        with pytest.raises(InvalidImageError):
+            asyncio.run(store_avatar(_upload(b"not an image")))
+    assert list(tmp_path.iterdir()) == []
+    assert not avatar_path(uuid.uuid4()).is_file()
@@ -0,0 +1,42 @@
+from sqlmodel import Session, select
+
+from app.crud.crude_item import item_crud
+from app.models.business_model import Business
+from app.models.item_model import Item
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import Product
+from app.tests.utils.utils import random_lower_string
+
+
+def test_import_items(db: Session) -> None:
+    business = Business(name=random_lower_string())
+    group = ProductGroup(title=random_lower_string())
+    db.add_all([business, group])
+    db.commit()
+    products = [
+        Product(title="p", description="d", sku=random_lower_string(), product_group_id=group.id)
+        for _ in range(2)
+    ]
+    db.add_all(products)
+    db.commit()
+    existing = Item(title="old", price=1.0, quantity=3, business_id=business.id, product_id=products[0].id)
+    db.add(existing)
+    db.commit()
+
+    rows = [
+        (1, {"sku": products[0].sku, "title": "updated", "price": "2.5"}),
+        (2, {"sku": products[1].sku, "title": "new", "quantity": "7"}),
+        (3, {"sku": random_lower_string(), "title": "unknown"}),
+        (4, {"sku": products[1].sku}),
+        (5, ValueError("Invalid JSON")),
+    ]
+    report = item_crud.import_items(db, business.id, rows)
+
+    assert (report.created, report.updated, report.failed) == (1, 1, 3)
+    assert [error.row for error in report.errors] == [3, 4, 5]
+    db.refresh(existing)
+    assert (existing.title, existing.price, existing.quantity) == ("updated", 2.5, 3)
+    created = db.exec(
+        select(Item).where(Item.business_id == business.id, Item.product_id == products[1].id)
+    ).one()
+    assert (created.title, created.quantity) == ("new", 7)
@@ -0,0 +1,47 @@
+import uuid
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.crud.crud_product import product_crud
+from app.crud.crud_product_tag_facet import product_tag_facet_crud
+from app.crud.crud_product_tag_link import create_product_tag_link
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import ProductUpdate
+from app.models.product_tag_link_model import ProductTagLink
+from app.models.product_tag_model import ProductTag
+from app.tests.utils.product import create_random_product, create_random_product_group, create_random_product_tag
+from app.tests.utils.utils import AsyncRunner
+
+
+async def facets(group: ProductGroup, *selected: ProductTag) -> dict[str, int]:
+    async with AsyncSession(async_engine) as session:
+        rows = await product_tag_facet_crud.aread_facets(session, group.id, [tag.id for tag in selected])
+    return {row.title: row.products for row in rows}
+
+
+def test_tag_facets_follow_links_and_products(db: Session, run_async: AsyncRunner) -> None:
+    groups = [create_random_product_group(db) for _ in range(2)]
+    tags = [create_random_product_tag(db) for _ in range(3)]
+    products = [create_random_product(db, groups[0]) for _ in range(3)]
+    links = {0: [0, 1], 1: [0], 2: [0, 1, 2]}
+    for product, tag_indexes in links.items():
+        for tag in tag_indexes:
+            create_product_tag_link(
+                db, ProductTagLink(product_id=products[product].id, product_tag_id=tags[tag].id)
+            )
+    t0, t1, t2 = (tag.title for tag in tags)
+
+    assert run_async(facets(groups[0])) == {t0: 3, t1: 2, t2: 1}
+    assert run_async(facets(groups[0], tags[1])) == {t0: 2, t1: 2, t2: 1}
+    assert run_async(facets(groups[0], tags[1], tags[2])) == {t0: 1, t1: 1, t2: 1}
+    assert run_async(facets(groups[1], tags[0])) == {}
+
+    product_crud.update_product(db, products[0], ProductUpdate(product_group_id=groups[1].id))
+    assert run_async(facets(groups[0])) == {t0: 2, t1: 1, t2: 1}
+    assert run_async(facets(groups[1])) == {t0: 1, t1: 1}
+
+    product_crud.delete_product(db, products[2])
+    assert run_async(facets(groups[0])) == {t0: 1}
+    assert run_async(facets(groups[0], ProductTag(id=uuid.uuid4(), title="unknown"))) == {}
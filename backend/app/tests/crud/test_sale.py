@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine, engine
+from app.crud.crud_lead import lead_crud
+from app.crud.crud_sale import sale_crud
+from app.crud.crude_item import item_crud
+from app.models.item_model import Item
+from app.models.sale_model import Sale, SaleCreate, SaleUpdate
+from app.models.sales_forecast_model import SalesForecastPublic
+from app.models.sales_rollup_model import SalesDaily, SalesMonthly
+from app.models.stock_valuation_model import StockValuation
+from app.tests.utils.business import create_sellable_item
+from app.tests.utils.lead import create_random_lead
+from app.tests.utils.utils import AsyncRunner
+
+
+def test_sell_item_out_of_stock(db: Session) -> None:
+    item, lead = create_sellable_item(db, quantity=3)
+    sale_in = SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=2)
+    assert sale_crud.sell_item(db, sale_in, item)
+    assert sale_crud.sell_item(db, sale_in, item) is None
+    db.refresh(item)
+    assert item.quantity == 1
+
+
+def test_sell_item_concurrently_never_oversells(db: Session) -> None:
+    item, lead = create_sellable_item(db, quantity=5)
+    item_id = item.id
+    sale_in = SaleCreate(lead_id=lead.id, item_id=item_id, quantity_of_items=1)
+
+    def sell() -> bool:
+        with Session(engine) as session:
+            return sale_crud.sell_item(session, sale_in, session.get(Item, item_id)) is not None
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: sell(), range(20)))
+
+    assert results.count(True) == 5
+    db.refresh(item)
+    assert item.quantity == 0
+    sales = db.exec(select(func.count()).select_from(Sale).where(Sale.item_id == item.id)).one()
+    assert sales == 5
+
+
+def test_sell_item_costs_sale_at_decremented_row(db: Session) -> None:
+    item, lead = create_sellable_item(db, quantity=5, cost_price=4.0)
+    # the cost changes after the caller read the item
+    with Session(engine) as other:
+        other.exec(update(Item).where(Item.id == item.id).values(cost_price=6.0))
+        other.commit()
+    assert item.cost_price == 4.0
+
+    sale = sale_crud.sell_item(db, SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=2), item)
+    assert sale
+    assert sale.cost_price_per_item == 6.0
+    daily = db.get(SalesDaily, (item.business_id, sale.created_at.date(), item.id))
+    assert daily
+    assert daily.cost == pytest.approx(12.0)
+
+
+def test_sales_rollups_follow_sale_writes(db: Session) -> None:
+    item, lead = create_sellable_item(db, quantity=10, cost_price=4.0)
+    sale_in = SaleCreate(
+        lead_id=lead.id, item_id=item.id, quantity_of_items=2, price_per_item=10.0, discount=0.1
+    )
+    first = sale_crud.sell_item(db, sale_in, item)
+    second = sale_crud.sell_item(db, sale_in, item)
+    assert first and second
+    # the item's cost changes after the first sales were recorded
+    item.cost_price = 5.0
+    db.add(item)
+    db.commit()
+
+    sale_crud.update_sale(db, second, SaleUpdate(quantity_of_items=3, price_per_item=10.0, discount=0.0))
+    sale_crud.delete_sale(db, first)
+
+    day = second.created_at.date()
+    daily = db.get(SalesDaily, (item.business_id, day, item.id))
+    monthly = db.get(SalesMonthly, (item.business_id, day.replace(day=1), item.id))
+    for rollup in (daily, monthly):
+        assert rollup
+        db.refresh(rollup)
+        assert (rollup.sales, rollup.units) == (1, 3)
+        assert rollup.revenue == pytest.approx(30.0)
+        assert rollup.discount == pytest.approx(0.0)
+        assert rollup.cost == pytest.approx(12.0)
+        assert rollup.product_id == item.product_id
+
+
+def test_update_sale_quantity_moves_stock(db: Session) -> None:
+    item, lead = create_sellable_item(db, quantity=10, cost_price=2.0, price=5.0)
+    sale_in = SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=4, price_per_item=5.0)
+    sale = sale_crud.sell_item(db, sale_in, item)
+    assert sale
+
+    def stock() -> tuple:
+        db.refresh(item)
+        assert item.product
+        valuation = db.get(StockValuation, (item.business_id, item.product.product_group_id))
+        assert valuation
+        db.refresh(valuation)
+        return item.quantity, valuation.units, pytest.approx(valuation.cost_value)
+
+    assert stock() == (6, 6, 12.0)
+    assert sale_crud.update_sale(db, sale, SaleUpdate(quantity_of_items=1, price_per_item=5.0))
+    assert stock() == (9, 9, 18.0)
+    assert sale_crud.update_sale(db, sale, SaleUpdate(quantity_of_items=11, price_per_item=5.0)) is None
+    db.refresh(sale)
+    assert sale.quantity_of_items == 1
+    assert stock() == (9, 9, 18.0)
+
+
+def test_forecast_follows_sales(db: Session, run_async: AsyncRunner) -> None:
+    item, lead = create_sellable_item(db, quantity=1_000)
+    today = datetime.utcnow().date()
+    for days_ago in range(1, 29):
+        sale_in = SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=2)
+        sale = sale_crud.sell_item(db, sale_in, item)
+        assert sale
+        # move the sale and its rollup to an earlier day
+        db.exec(
+            update(SalesDaily)
+            .where(SalesDaily.item_id == item.id, SalesDaily.period == today)
+            .values(period=today - timedelta(days=days_ago))
+        )
+        db.commit()
+
+    async def forecast() -> SalesForecastPublic:
+        async with AsyncSession(async_engine) as session:
+            return await sale_crud.aread_forecast(
+                session, business_id=item.business_id, start=today, horizon=7, history_days=28
+            )
+
+    other_item, other_lead = create_sellable_item(db, quantity=1)
+
+    async def run() -> tuple[SalesForecastPublic, ...]:
+        first = await forecast()
+        sale_crud.sell_item(db, SaleCreate(lead_id=other_lead.id, item_id=other_item.id, quantity_of_items=1), other_item)
+        cached = await forecast()
+        sale_crud.sell_item(db, SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=1), item)
+        after_sale = await forecast()
+        return first, cached, after_sale
+
+    first, cached, after_sale = run_async(run())
+    # sales of other businesses leave the cached forecast in place
+    assert cached is first
+    assert after_sale is not first
+    [row] = first.data
+    assert row.item_id == item.id
+    assert row.daily == pytest.approx([2.0] * 7)
+    assert row.units == pytest.approx(14.0)
+
+
+def test_sales_leave_rollups_with_their_lead_or_item(db: Session, run_async: AsyncRunner) -> None:
+    item, lead = create_sellable_item(db, quantity=10, cost_price=1.0)
+    assert item.business
+    other_lead = create_random_lead(db, item.business)
+    for buyer in (lead, other_lead):
+        sale_in = SaleCreate(lead_id=buyer.id, item_id=item.id, quantity_of_items=2, price_per_item=5.0)
+        assert sale_crud.sell_item(db, sale_in, item)
+    today = datetime.utcnow().date()
+
+    async def totals() -> list[tuple[int, int, float]]:
+        async with AsyncSession(async_engine) as session:
+            rows = await sale_crud.aread_analytics(
+                session, business_id=item.business_id, granularity="month", group_by="total", start=today.replace(day=1), end=today
+            )
+        return [(row.sales, row.units, row.revenue) for row in rows]
+
+    assert run_async(totals()) == [(2, 4, 20.0)]
+    lead_crud.delete_lead(db, lead)
+    assert run_async(totals()) == [(1, 2, 10.0)]
+    item_crud.delete_item(db, item)
+    assert run_async(totals()) == []
@@ -0,0 +1,44 @@
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import async_engine
+from app.crud.crud_lead import lead_crud
+from app.crud.crud_product import product_crud
+from app.models.business_model import Business
+from app.tests.utils.business import create_business_item, create_random_business
+from app.tests.utils.lead import create_random_lead
+from app.tests.utils.product import create_random_product, create_random_product_group
+from app.tests.utils.utils import AsyncRunner, random_lower_string
+
+
+async def search(business: Business, q: str) -> tuple[list, list]:
+    async with AsyncSession(async_engine) as session:
+        products = await product_crud.asearch(session, business.id, q, limit=10)
+        leads = await lead_crud.asearch(session, business.id, q, limit=10)
+    return products, leads
+
+
+def test_search_products_and_leads(db: Session, run_async: AsyncRunner) -> None:
+    business, other = create_random_business(db), create_random_business(db)
+    group = create_random_product_group(db)
+    sku = random_lower_string()
+    held = create_random_product(db, group, title="Wireless headphones", description="Noise cancelling", sku=sku)
+    create_random_product(db, group, title="Wireless speaker")
+    create_random_lead(db, business, customer_name="Aleksandrova Marina", customer_phone="+7 701 555 1234")
+    create_random_lead(db, other, customer_name="Aleksandrova Irina", customer_phone="+7 702 000 0000")
+    create_business_item(db, business, held)
+
+    products, leads = run_async(search(business, "wirel head"))
+    assert [hit.id for hit in products] == [held.id]
+    assert leads == []
+
+    products, leads = run_async(search(business, "Aleksandrava"))
+    assert products == []
+    assert [hit.customer_name for hit in leads] == ["Aleksandrova Marina"]
+    assert leads[0].rank > 0
+
+    products, leads = run_async(search(business, "701 555"))
+    assert [hit.customer_phone for hit in leads] == ["+7 701 555 1234"]
+
+    products, _ = run_async(search(business, sku[:6]))
+    assert [hit.sku for hit in products] == [sku]
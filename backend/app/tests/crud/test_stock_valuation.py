@@ -0,0 +1,95 @@
+from datetime import date
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.crud.crud_product import product_crud
+from app.crud.crud_sale import sale_crud
+from app.crud.crud_stock_valuation import stock_valuation_crud
+from app.crud.crude_item import item_crud
+from app.models.business_model import Business
+from app.models.item_model import Item, ItemCreate, ItemUpdate
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import ProductUpdate
+from app.models.sale_model import SaleCreate
+from app.models.stock_valuation_model import StockValuation, StockValuationSnapshot
+from app.tests.utils.business import create_random_business
+from app.tests.utils.lead import create_random_lead
+from app.tests.utils.product import create_random_product, create_random_product_group
+
+
+def valuation(db: Session, business: Business, group: ProductGroup) -> tuple:
+    row = db.get(StockValuation, (business.id, group.id))
+    if row is None:
+        return (0, 0, 0.0, 0.0)
+    db.refresh(row)
+    return (row.items, row.units, pytest.approx(row.cost_value), pytest.approx(row.retail_value))
+
+
+def test_stock_valuation_follows_stock_changes(db: Session) -> None:
+    business = create_random_business(db)
+    groups = [create_random_product_group(db) for _ in range(2)]
+    products = [create_random_product(db, groups[0]) for _ in range(2)]
+    lead = create_random_lead(db, business)
+
+    item = item_crud.create_item(
+        db, ItemCreate(title="i", quantity=10, cost_price=2.0, price=5.0), business.id, products[0].id
+    )
+    assert valuation(db, business, groups[0]) == (1, 10, 20.0, 50.0)
+
+    item = item_crud.update_item(db, item, ItemUpdate(quantity=8, price=6.0))
+    assert valuation(db, business, groups[0]) == (1, 8, 16.0, 48.0)
+
+    sale_in = SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=3)
+    assert sale_crud.sell_item(db, sale_in, item)
+    assert valuation(db, business, groups[0]) == (1, 5, 10.0, 30.0)
+
+    item_crud.import_items(db, business.id, [(1, {"sku": products[1].sku, "title": "n", "quantity": "4", "price": "1"})])
+    assert valuation(db, business, groups[0]) == (2, 9, 10.0, 34.0)
+
+    product_crud.update_product(db, products[0], ProductUpdate(product_group_id=groups[1].id))
+    assert valuation(db, business, groups[0]) == (1, 4, 0.0, 4.0)
+    assert valuation(db, business, groups[1]) == (1, 5, 10.0, 30.0)
+
+    db.refresh(item)
+    item_crud.delete_item(db, item)
+    assert valuation(db, business, groups[1]) == (0, 0, 0.0, 0.0)
+
+    taken_on = date(2000, 1, 1)
+    assert stock_valuation_crud.take_snapshot(db, taken_on)
+    # taking it again the same day replaces the day's rows
+    stock_valuation_crud.take_snapshot(db, taken_on)
+    snapshots = db.exec(
+        select(StockValuationSnapshot).where(
+            StockValuationSnapshot.business_id == business.id,
+            StockValuationSnapshot.taken_on == taken_on,
+        )
+    ).all()
+    assert {(row.product_group_id, row.units) for row in snapshots} == {(groups[0].id, 4), (groups[1].id, 0)}
+
+
+def test_stock_valuation_keeps_sales_between_read_and_write(db: Session) -> None:
+    business = create_random_business(db)
+    group = create_random_product_group(db)
+    product = create_random_product(db, group)
+    lead = create_random_lead(db, business)
+    item = item_crud.create_item(
+        db, ItemCreate(title="i", quantity=10, cost_price=2.0, price=5.0), business.id, product.id
+    )
+
+    # another request reads the item, a sale commits, then that request writes
+    with Session(engine) as other:
+        stale = other.get(Item, item.id)
+        assert stale
+        assert sale_crud.sell_item(db, SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=3), item)
+        updated = item_crud.update_item(other, stale, ItemUpdate(price=6.0))
+        assert (updated.quantity, updated.price) == (7, 6.0)
+    assert valuation(db, business, group) == (1, 7, 14.0, 42.0)
+
+    with Session(engine) as other:
+        stale = other.get(Item, item.id)
+        assert stale
+        assert sale_crud.sell_item(db, SaleCreate(lead_id=lead.id, item_id=item.id, quantity_of_items=2), item)
+        item_crud.delete_item(other, stale)
+    assert valuation(db, business, group) == (0, 0, 0.0, 0.0)
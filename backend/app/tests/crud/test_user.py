@@ -1,8 +1,9 @@
 from fastapi.encoders import jsonable_encoder
+from passlib.context import CryptContext
 from sqlmodel import Session
 
 from app.crud.crud_user import user_crud
-from app.core.security import verify_password
+from app.core.security import password_context, pwd_context, verify_password
 from app.models.user_model import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
@@ -26,6 +27,36 @@ def test_authenticate_user(db: Session) -> None:
     assert user.email == authenticated_user.email
 
 
+def test_authenticate_user_upgrades_outdated_hash(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = user_crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    user.hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash(password)
+    db.add(user)
+    db.commit()
+    assert pwd_context.needs_update(user.hashed_password)
+
+    authenticated_user = user_crud.authenticate(session=db, email=email, password=password)
+    assert authenticated_user
+    assert not pwd_context.needs_update(authenticated_user.hashed_password)
+    assert verify_password(password, authenticated_user.hashed_password)[0]
+
+
+def test_argon2_first_hashes_with_argon2_and_migrates_bcrypt() -> None:
+    context = password_context(["argon2", "bcrypt"])
+    password = random_lower_string()
+
+    hashed = context.hash(password)
+    assert context.identify(hashed) == "argon2"
+    assert context.verify_and_update(password, hashed) == (True, None)
+
+    legacy = password_context(["bcrypt"]).hash(password)
+    verified, new_hash = context.verify_and_update(password, legacy)
+    assert verified
+    assert new_hash is not None and context.identify(new_hash) == "argon2"
+    assert context.verify(password, new_hash)
+
+
 def test_not_authenticate_user(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
@@ -88,4 +119,4 @@ def test_update_user(db: Session) -> None:
     user_2 = db.get(User, user.id)
     assert user_2
     assert user.email == user_2.email
-    assert verify_password(new_password, user_2.hashed_password)
+    assert verify_password(new_password, user_2.hashed_password)[0]
@@ -0,0 +1,67 @@
+import asyncio
+import uuid
+
+import httpx
+from sqlmodel import Session, func, select
+
+from app.core.db import engine
+from app.marketplaces.adapters import JsonCatalogAdapter
+from app.marketplaces.client import MarketplaceClient
+from app.marketplaces.fake import create_fake_marketplace, fake_catalog
+from app.marketplaces.pipeline import ingest
+from app.models.business_model import Business
+from app.models.item_model import Item
+from app.models.marketplace_model import MarketplaceIngestReport
+from app.models.product_model import Product
+from app.tests.utils.utils import random_lower_string
+
+
+def run_ingest(catalog: list, business_id: uuid.UUID, **marketplace: object) -> tuple[MarketplaceIngestReport, int]:
+    fake = create_fake_marketplace(catalog, api_key="secret", **marketplace)  # type: ignore[arg-type]
+
+    async def run() -> MarketplaceIngestReport:
+        transport = httpx.ASGITransport(app=fake)  # type: ignore[arg-type]
+        async with MarketplaceClient(default_rate_limit=1_000, transport=transport) as client:
+            adapter = JsonCatalogAdapter("http://marketplace", "secret")
+            return await ingest(adapter, client, business_id, batch_size=120)
+
+    return asyncio.run(run()), fake.state.requests
+
+
+def test_ingest_is_idempotent(db: Session) -> None:
+    business = Business(name=random_lower_string())
+    db.add(business)
+    db.commit()
+    prefix = random_lower_string()
+    catalog = fake_catalog(450, prefix=prefix)
+    catalog.append({"sku": f"{prefix}-bad", "title": ""})
+
+    first, requests = run_ingest(catalog, business.id)
+    assert requests == 5
+    assert (first.fetched, first.invalid) == (451, 1)
+    assert (first.products_created, first.products_updated) == (450, 0)
+    assert (first.items_created, first.items_updated) == (450, 0)
+    assert first.stages["load"].rows == 450
+    assert first.stages["load"].rows_per_second > 0
+
+    catalog[0]["title"] = "Renamed"
+    catalog[1]["quantity"] = 1_000
+    second, _ = run_ingest(catalog, business.id)
+    assert (second.products_created, second.products_updated) == (0, 1)
+    assert (second.items_created, second.items_updated) == (0, 450)
+
+    products = db.exec(select(func.count()).select_from(Product).where(Product.sku.startswith(prefix))).one()
+    items = db.exec(select(func.count()).select_from(Item).where(Item.business_id == business.id)).one()
+    assert (products, items) == (450, 450)
+    renamed = db.exec(select(Item).join(Product).where(Product.sku == catalog[1]["sku"])).one()
+    assert renamed.quantity == 1_000
+
+
+def test_ingest_retries_throttled_requests(db: Session) -> None:
+    business = Business(name=random_lower_string())
+    db.add(business)
+    db.commit()
+
+    report, requests = run_ingest(fake_catalog(300, prefix=random_lower_string()), business.id, rate_limit=50)
+    assert report.items_created == 300
+    assert requests > 3
@@ -0,0 +1,18 @@
+from app.benchmarks.runner import RouteResult, compare, percentile, summarize
+
+
+def test_percentile() -> None:
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_compare_flags_regressions() -> None:
+    baseline = summarize([0.010] * 100, errors=0, seconds=1.0)
+    slower = summarize([0.020] * 100, errors=0, seconds=2.0)
+    same = RouteResult(**vars(baseline))
+
+    assert compare({"GET /items/": same}, {"GET /items/": baseline}, 0.2) == []
+    assert len(compare({"GET /items/": slower}, {"GET /items/": baseline}, 0.2)) == 2
+    assert compare({"GET /new/": slower}, {}, 0.2) == []
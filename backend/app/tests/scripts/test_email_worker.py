@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.message import EmailMessage
+from unittest.mock import MagicMock, patch
+
+from sqlmodel import Session, select
+
+from app.core.db import engine
+
+from app.email_worker import SMTPConnectionPool, deliver_batch
+from app.models.email_outbox_model import EmailOutbox
+from app.tests.utils.smtp import smtp_server
+from app.tests.utils.utils import random_email
+from app.utils import queue_email
+
+
+def test_deliver_batch(db: Session) -> None:
+    with (
+        smtp_server() as (port, mailbox),
+        patch("app.core.config.settings.SMTP_HOST", "127.0.0.1"),
+        patch("app.core.config.settings.SMTP_PORT", port),
+        patch("app.core.config.settings.SMTP_TLS", False),
+        patch("app.core.config.settings.SMTP_USER", None),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "noreply@example.com"),
+    ):
+        delivered = [random_email() for _ in range(3)]
+        refused = random_email()
+        mailbox.reject.add(refused)
+        emails = [
+            queue_email(db, email_to=email_to, subject="Hello", html_content="<p>Hi</p>")
+            for email_to in [*delivered, refused]
+        ]
+        db.commit()
+
+        pool = SMTPConnectionPool(size=2)
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            assert deliver_batch(db, pool, executor) >= 4
+            # connections stay open for the next batch
+            assert deliver_batch(db, pool, executor) == 0
+        pool.close()
+
+    recipients = b"".join(mailbox.messages).decode()
+    assert all(email_to in recipients for email_to in delivered)
+    assert refused not in recipients
+    assert mailbox.connections <= 2
+    for email in emails:
+        db.refresh(email)
+    assert [email.status for email in emails] == ["sent", "sent", "sent", "pending"]
+    assert emails[3].attempts == 1
+    assert emails[3].last_error
+    assert emails[3].next_attempt_at > datetime.utcnow()
+
+
+
+def test_deliver_batch_sends_outside_the_claim(db: Session) -> None:
+    email = queue_email(db, email_to=random_email(), subject="Hello", html_content="<p>Hi</p>")
+    db.commit()
+    seen = {}
+
+    def send(pool: SMTPConnectionPool, message: EmailMessage) -> str:
+        # another worker neither waits on the row nor claims it again
+        with Session(engine) as other:
+            statement = select(EmailOutbox).where(EmailOutbox.email_to == message["To"]).with_for_update(nowait=True)
+            row = other.exec(statement).one()
+            seen[row.id] = (row.attempts, row.next_attempt_at > datetime.utcnow())
+        return "SMTPRecipientsRefused: refused"
+
+    with (
+        patch("app.email_worker._send", send),
+        patch("app.core.config.settings.EMAILS_FROM_EMAIL", "noreply@example.com"),
+        patch("app.core.config.settings.EMAIL_OUTBOX_MAX_ATTEMPTS", 1),
+        ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        assert deliver_batch(db, MagicMock(), executor) >= 1
+
+    assert seen[email.id] == (1, True)
+    db.refresh(email)
+    assert email.status == "failed"
+    assert email.last_error
+    # failed bodies can hold a new account's password
+    assert email.html_content == ""
+
+def test_pool_replaces_connections_failing_noop() -> None:
+    pool = SMTPConnectionPool(size=2)
+    closing, healthy, fresh = MagicMock(), MagicMock(), MagicMock()
+    closing.noop.return_value = (421, b"Service closing transmission channel")
+    healthy.noop.return_value = (250, b"OK")
+    pool._idle.put(healthy)
+    pool._idle.put(closing)
+
+    with patch.object(pool, "_connect", return_value=fresh):
+        assert pool._take() is healthy
+        closing.quit.assert_called_once()
+        assert pool._take() is fresh
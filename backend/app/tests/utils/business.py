@@ -0,0 +1,59 @@
+from typing import Any
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.crud.crud_user import user_crud
+from app.crud.crude_item import item_crud
+from app.models.business_model import Business
+from app.models.employee_model import Employee
+from app.models.item_model import Item, ItemCreate
+from app.models.lead_model import Lead
+from app.models.product_model import Product
+from app.models.user_model import User, UserCreate
+from app.tests.utils.lead import create_random_lead
+from app.tests.utils.product import create_random_product
+from app.tests.utils.user import user_authentication_headers
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+def create_random_business(db: Session) -> Business:
+    business = Business(name=random_lower_string())
+    db.add(business)
+    db.commit()
+    return business
+
+
+def create_random_employee(db: Session, user: User, business: Business | None = None) -> Employee:
+    business = business or create_random_business(db)
+    employee = Employee(name=random_lower_string(), user_id=user.id, business_id=business.id)
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def employee_authentication_headers(
+    client: TestClient, db: Session, business: Business | None = None
+) -> tuple[Employee, dict[str, str]]:
+    """
+    A new user employed by `business`, or by a new business, and their headers.
+    """
+    email, password = random_email(), random_lower_string()
+    user = user_crud.create_user(session=db, user_create=UserCreate(email=email, password=password))
+    employee = create_random_employee(db, user, business)
+    return employee, user_authentication_headers(client=client, email=email, password=password)
+
+
+def create_business_item(
+    db: Session, business: Business, product: Product | None = None, **fields: Any
+) -> Item:
+    product = product or create_random_product(db)
+    return item_crud.create_item(db, ItemCreate(title="i", **fields), business.id, product.id)
+
+
+def create_sellable_item(db: Session, **fields: Any) -> tuple[Item, Lead]:
+    """
+    An item of a new business, and a lead of that business to sell it to.
+    """
+    business = create_random_business(db)
+    return create_business_item(db, business, **fields), create_random_lead(db, business)
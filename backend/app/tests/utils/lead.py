@@ -0,0 +1,14 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app.models.business_model import Business
+from app.models.lead_model import Lead
+
+
+def create_random_lead(db: Session, business: Business, **fields: Any) -> Lead:
+    fields = {"customer_name": "c", "customer_phone": "1", **fields}
+    lead = Lead(business_id=business.id, **fields)
+    db.add(lead)
+    db.commit()
+    return lead
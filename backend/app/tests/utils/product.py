@@ -0,0 +1,31 @@
+from typing import Any
+
+from sqlmodel import Session
+
+from app.models.product_group_model import ProductGroup
+from app.models.product_model import Product
+from app.models.product_tag_model import ProductTag
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_product_group(db: Session) -> ProductGroup:
+    group = ProductGroup(title=random_lower_string())
+    db.add(group)
+    db.commit()
+    return group
+
+
+def create_random_product(db: Session, group: ProductGroup | None = None, **fields: Any) -> Product:
+    group = group or create_random_product_group(db)
+    fields = {"title": "p", "description": "d", "sku": random_lower_string(), **fields}
+    product = Product(product_group_id=group.id, **fields)
+    db.add(product)
+    db.commit()
+    return product
+
+
+def create_random_product_tag(db: Session) -> ProductTag:
+    tag = ProductTag(title=random_lower_string())
+    db.add(tag)
+    db.commit()
+    return tag
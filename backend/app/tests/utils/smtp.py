@@ -0,0 +1,79 @@
+import socketserver
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Mailbox:
+    messages: list[bytes] = field(default_factory=list)
+    connections: int = 0
+    # RCPT TO addresses answered with a temporary failure
+    reject: set[str] = field(default_factory=set)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough of RFC 5321 for smtplib: EHLO, MAIL, RCPT, DATA, NOOP, RSET, QUIT.
+    """
+
+    server: "_SMTPServer"
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        mailbox = self.server.mailbox
+        mailbox.connections += 1
+        self.reply("220 localhost ESMTP stand-in")
+        rejected = False
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                rejected = False
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                address = command.partition(":")[2].strip().strip("<>")
+                rejected = address in mailbox.reject
+                self.reply("450 Mailbox busy" if rejected else "250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := self.rfile.readline()) not in (b".\r\n", b""):
+                    data += chunk
+                if not rejected:
+                    mailbox.messages.append(data)
+                self.reply("250 OK")
+            elif verb in ("NOOP", "RSET"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    mailbox: Mailbox
+
+
+@contextmanager
+def smtp_server() -> Generator[tuple[int, Mailbox], None, None]:
+    """
+    Run a local SMTP stand-in on a free port, yielding the port and its mailbox.
+    """
+    server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.mailbox = Mailbox()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1], server.mailbox
+    finally:
+        server.shutdown()
+        server.server_close()
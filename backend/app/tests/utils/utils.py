@@ -1,9 +1,16 @@
 import random
 import string
+from collections.abc import Coroutine, Generator
+from contextlib import contextmanager
+from typing import Any, Protocol, TypeVar
 
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 
 from app.core.config import settings
+from app.core.db import engine
+
+T = TypeVar("T")
 
 
 def random_lower_string() -> str:
@@ -24,3 +31,22 @@ def get_superuser_token_headers(client: TestClient) -> dict[str, str]:
     a_token = tokens["access_token"]
     headers = {"Authorization": f"Bearer {a_token}"}
     return headers
+
+
+@contextmanager
+def count_queries() -> Generator[list[str], None, None]:
+    """Collect the SQL statements run on the sync engine inside the block."""
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class AsyncRunner(Protocol):
+    def __call__(self, coroutine: Coroutine[Any, Any, T]) -> T: ...
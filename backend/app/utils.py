@@ -1,15 +1,16 @@
-import logging
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
-import emails  # type: ignore
 import jwt
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from jwt.exceptions import InvalidTokenError
+from sqlmodel import Session
 
 from app.core.config import settings
+from app.models.email_outbox_model import EmailOutbox
 import uuid
 
 
@@ -24,37 +25,47 @@ class Invite:
     business_id: uuid.UUID
 
 
+# Built templates only change on deploy: compile each once per process, and
+# reuse the compiled bytecode across processes through the temp directory
+email_templates = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "email-templates" / "build"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=False,
+    cache_size=-1,
+)
+for _template_name in email_templates.list_templates():
+    email_templates.get_template(_template_name)
+
+
 def render_email_template(*, template_name: str, context: dict[str, Any]) -> str:
-    template_str = (
-        Path(__file__).parent / "email-templates" / "build" / template_name
-    ).read_text()
-    html_content = Template(template_str).render(context)
+    html_content = email_templates.get_template(template_name).render(context)
     return html_content
 
 
-def send_email(
+def render_email_templates(
+    *, template_name: str, contexts: Iterable[dict[str, Any]]
+) -> Iterator[str]:
+    """
+    Render one template for many recipients, e.g. bulk invites or digests.
+    """
+    template = email_templates.get_template(template_name)
+    for context in contexts:
+        yield template.render(context)
+
+
+def queue_email(
+    session: Session,
     *,
     email_to: str,
     subject: str = "",
     html_content: str = "",
-) -> None:
-    assert settings.emails_enabled, "no provided configuration for email variables"
-    message = emails.Message(
-        subject=subject,
-        html=html_content,
-        mail_from=(settings.EMAILS_FROM_NAME, settings.EMAILS_FROM_EMAIL),
-    )
-    smtp_options = {"host": settings.SMTP_HOST, "port": settings.SMTP_PORT}
-    if settings.SMTP_TLS:
-        smtp_options["tls"] = True
-    elif settings.SMTP_SSL:
-        smtp_options["ssl"] = True
-    if settings.SMTP_USER:
-        smtp_options["user"] = settings.SMTP_USER
-    if settings.SMTP_PASSWORD:
-        smtp_options["password"] = settings.SMTP_PASSWORD
-    response = message.send(to=email_to, smtp=smtp_options)
-    logging.info(f"send email result: {response}")
+) -> EmailOutbox:
+    """
+    Add an email to the outbox; it is sent once the caller commits `session`.
+    """
+    email = EmailOutbox(email_to=email_to, subject=subject, html_content=html_content)
+    session.add(email)
+    return email
 
 
 def generate_test_email(email_to: str) -> EmailData:
@@ -144,19 +155,38 @@ def verify_invite_token(token: str) -> Invite | None:
         return None
 
 
+def _invite_to_business_context(email_to: str, email: str, business_name: str, token: str) -> dict[str, Any]:
+    return {
+        "project_name": settings.PROJECT_NAME,
+        "business_name": business_name,
+        "username": email,
+        "email": email_to,
+        "valid_hours": settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS,
+        "link": f"{settings.server_host}/employee/invite_register/?token={token}",
+    }
+
+
 def generate_invite_to_business_email(email_to: str, email: str, business_name: str, token: str) -> EmailData:
     project_name = settings.PROJECT_NAME
     subject = f"{project_name} - Invite from company {business_name} to user {email}"
-    link = f"{settings.server_host}/employee/invite_register/?token={token}"
     html_content = render_email_template(
         template_name="business_invite.html",
-        context={
-            "project_name": settings.PROJECT_NAME,
-            "business_name": business_name,
-            "username": email,
-            "email": email_to,
-            "valid_hours": settings.EMAIL_RESET_TOKEN_EXPIRE_HOURS,
-            "link": link,
-        },
+        context=_invite_to_business_context(email_to, email, business_name, token),
     )
     return EmailData(html_content=html_content, subject=subject)
+
+
+def generate_invite_to_business_emails(business_name: str, invites: Iterable[tuple[str, str]]) -> list[EmailData]:
+    """
+    Invite emails for many (email, token) pairs of one business.
+    """
+    invites = list(invites)
+    project_name = settings.PROJECT_NAME
+    html_contents = render_email_templates(
+        template_name="business_invite.html",
+        contexts=(_invite_to_business_context(email, email, business_name, token) for email, token in invites),
+    )
+    return [
+        EmailData(html_content=html_content, subject=f"{project_name} - Invite from company {business_name} to user {email}")
+        for (email, _), html_content in zip(invites, html_contents)
+    ]